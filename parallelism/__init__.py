@@ -1,8 +1,14 @@
 from parallelism.api_reference import *
-from parallelism.config import LOGGING_LEVEL, LOGGING_FORMAT
-from parallelism.logger import initialize_logger
 
-__all__ = ('scheduled_task', 'task_scheduler')
+__all__ = (
+    'scheduled_task',
+    'scheduled_tasks',
+    'task_scheduler',
+    'task_submitter',
+    'task_canceled',
+    'gather',
+    'runtime_history',
+    'Interpreter',
+    'Scheduler',
+)
 __version__ = (0, 1, 4)
-
-initialize_logger(formatter=LOGGING_FORMAT, level=LOGGING_LEVEL)
@@ -1,22 +1,60 @@
 from __future__ import annotations
 
-from multiprocessing import Process
+from array import array
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from itertools import accumulate, repeat
+from multiprocessing import Manager, Process, Queue
 from os import cpu_count
-from threading import Thread
+from threading import Condition, Thread
 from typing import TYPE_CHECKING
 
+from parallelism.config import LOGGING_FORMAT, LOGGING_LEVEL
 from parallelism.core.handlers.dependency_handler import DependencyHandler
+from parallelism.core.executors.interpreter_executor import (
+    Interpreter,
+    InterpreterExecutor,
+)
 from parallelism.core.executors.process_executor import ProcessExecutor
 from parallelism.core.executors.thread_executor import ThreadExecutor
+from parallelism.core.gather_value import GatherValue
+from parallelism.core.hooks.task_hook import TaskHook
+from parallelism.core.return_value import ReturnValue
+from parallelism.core.runtime_history import RuntimeHistory
 from parallelism.core.scheduled_task import ScheduledTask
+from parallelism.core.stream_value import StreamValue
+from parallelism.core.task_cancellation import CURRENT_CANCELLATION
 from parallelism.core.task_scheduler import TaskScheduler
+from parallelism.core.task_submitter import CURRENT_SUBMITTER, TaskSubmitter
+from parallelism.core.task_table import TaskTable
+from parallelism.logger import initialize_logger, start_listener, stop_listener
 
 if TYPE_CHECKING:
-    from typing import Any, Callable, Dict, Tuple, Type, Union
+    from concurrent.futures import Future
+    from typing import (
+        Any,
+        Callable,
+        Dict,
+        List,
+        Sequence,
+        Tuple,
+        Type,
+        Union,
+    )
 
     from parallelism.core.scheduler_result import SchedulerResult
 
-__all__ = ('scheduled_task', 'task_scheduler')
+__all__ = (
+    'scheduled_task',
+    'scheduled_tasks',
+    'task_scheduler',
+    'task_submitter',
+    'task_canceled',
+    'gather',
+    'runtime_history',
+    'Interpreter',
+    'Scheduler',
+)
 
 
 def scheduled_task(
@@ -30,11 +68,15 @@ def scheduled_task(
     priority: Union[int, float] = None,
     processes: int = 0,
     threads: int = 0,
+    cpus: int = 0,
     system_processor: Union[int, float] = 0,
     system_memory: Union[int, float] = 0,
     graphics_processor: Union[int, float] = 0,
     graphics_memory: Union[int, float] = 0,
+    resources: Dict[str, Union[int, float]] = None,
     continual: bool = False,
+    idempotent: bool = False,
+    condition: ReturnValue = None,
 ) -> ScheduledTask:
     """
     The `scheduled_task` function empowers developers to efficiently manage and
@@ -47,7 +89,9 @@ def scheduled_task(
     ----------
     executor : type of multiprocessing.Process or threading.Thread
         | Specifies the execution unit for the task, either as a
-        `multiprocessing.Process` or a `threading.Thread`.
+        `multiprocessing.Process` or a `threading.Thread`, or as an
+        `Interpreter`, which runs the target in a subinterpreter with its own
+        GIL and falls back to a `multiprocessing.Process` before Python 3.14.
     name : str
         | A unique identifier representing the task, aiding in differentiation
         and tracking.
@@ -56,7 +100,12 @@ def scheduled_task(
     args : tuple, optional
         | Positional arguments related to the `target` function.
     kwargs : dict, optional
-        | Keyword arguments related to the `target` function.
+        | Keyword arguments related to the `target` function. Besides plain
+        values, they may contain the `return_value` of other tasks, or the
+        `stream` of other tasks whose targets are generators. A stream is
+        received as an iterable of the items yielded by its producer, which
+        runs at the same time as its consumers and waits while their bounded
+        queue is full.
     dependencies : tuple of ScheduledTask, optional
         | Tasks that the current task depends on, ensuring proper execution
         order.
@@ -67,6 +116,10 @@ def scheduled_task(
         | The number of processes to be allocated by the `target` function.
     threads : int, default 0
         | The number of threads to be allocated by the `target` function.
+    cpus : int, default 0
+        | The number of processor cores the task is pinned to, taken from
+        the cores not pinned by other running tasks, according to
+        `task_scheduler(pinning=...)`. Only available for process tasks.
     system_processor : int or float, default 0
         | Estimate of the percentage of system processor usage.
     system_memory : int or float, default 0
@@ -75,10 +128,27 @@ def scheduled_task(
         | Estimate of the percentage of graphics processor usage.
     graphics_memory : int or float, default 0
         | Estimate of the percentage of graphics memory usage.
+    resources : dict, optional
+        | Amounts of the named resources given to `task_scheduler` (such as
+        database connections or licenses) held by the task while it runs.
     continual : bool, default False
         | A flag indicating whether the task scheduler should store the result
         of the task after completion. If `True`, the result is stored for later
         access.
+    idempotent : bool, default False
+        | A flag indicating whether the task may safely run more than once.
+        Only idempotent process tasks are re-executed speculatively by
+        `task_scheduler(speculation=...)` when they straggle.
+    condition : ReturnValue, optional
+        | The return value of an upstream task (or a transformation of it,
+        such as `task.return_value['enabled']`) deciding whether the task
+        runs. Once the upstream task completes, the task runs if the value
+        is truthy, otherwise it is skipped, and never executed. The tasks
+        depending on it are skipped along with it when all of their
+        dependencies are skipped. A task consuming the return value of a
+        skipped task is skipped once its other dependencies complete, or
+        canceled if one of them fails. Otherwise, skipped tasks only listed
+        in `dependencies` are treated as finished.
 
     Returns
     -------
@@ -94,6 +164,8 @@ def scheduled_task(
         dependencies = ()
     if priority is None:
         priority = float('inf')
+    if resources is None:
+        resources = {}
     if not issubclass(executor, (Process, Thread)):
         pattern = 'The {!r} parameter should be of type {!r} or {!r}'
         raise TypeError(pattern.format('executor', 'Process', 'Thread'))
@@ -130,6 +202,15 @@ def scheduled_task(
     if threads < 0:
         pattern = 'The {!r} parameter should be an integer >= {!r}'
         raise TypeError(pattern.format('threads', 0))
+    if not isinstance(cpus, int):
+        pattern = 'The {!r} parameter should be of type {!r}'
+        raise TypeError(pattern.format('cpus', 'int'))
+    if cpus < 0:
+        pattern = 'The {!r} parameter should be an integer >= {!r}'
+        raise TypeError(pattern.format('cpus', 0))
+    if cpus and not issubclass(executor, Process):
+        pattern = 'The {!r} parameter should only be used with {!r}'
+        raise TypeError(pattern.format('cpus', 'Process'))
     if not isinstance(system_processor, (int, float)):
         pattern = 'The {!r} parameter should be of type {!r}'
         raise TypeError(pattern.format('system_processor', 'int or float'))
@@ -154,13 +235,78 @@ def scheduled_task(
     if graphics_memory < 0 or graphics_memory > 100:
         pattern = 'The {!r} parameter should be between {!r} and {!r}'
         raise TypeError(pattern.format('graphics_memory', 0, 100))
+    validate_resources('resources', resources)
+    streams = {
+        value.task for value in (*args, *kwargs.values())
+        if not isinstance(value, ReturnValue) and
+        isinstance(value, StreamValue)
+    }
+    if streams.intersection(dependencies) or streams.intersection(
+        getattr(value, ':task') for value in (*args, *kwargs.values())
+        if isinstance(value, ReturnValue)
+    ) or streams.intersection(
+        task for value in (*args, *kwargs.values())
+        if (
+            not isinstance(value, ReturnValue) and
+            isinstance(value, GatherValue)
+        )
+        for task in value.tasks
+    ):
+        pattern = (
+            'The {!r}, {!r} and {!r} parameters should not wait for the '
+            'completion of a task whose {!r} they consume'
+        )
+        raise TypeError(pattern.format(
+            'args',
+            'kwargs',
+            'dependencies',
+            'stream',
+        ))
     if not isinstance(continual, bool):
         pattern = 'The {!r} parameter should be of type {!r}'
         raise TypeError(pattern.format('continual', 'bool'))
-    if issubclass(executor, Process):
+    if not isinstance(idempotent, bool):
+        pattern = 'The {!r} parameter should be of type {!r}'
+        raise TypeError(pattern.format('idempotent', 'bool'))
+    if condition is not None and not isinstance(condition, ReturnValue):
+        pattern = 'The {!r} parameter should be of type {!r}'
+        raise TypeError(pattern.format('condition', 'ReturnValue'))
+    if condition is not None and streams.intersection(
+        (getattr(condition, ':task'),),
+    ):
+        pattern = (
+            'The {!r} parameter should not wait for the completion of a '
+            'task whose {!r} is consumed'
+        )
+        raise TypeError(pattern.format('condition', 'stream'))
+    if issubclass(executor, Interpreter):
+        executor = interpreter_executor()
+    elif issubclass(executor, Process):
         executor = ProcessExecutor
-    if issubclass(executor, Thread):
+    elif issubclass(executor, Thread):
         executor = ThreadExecutor
+    if streams and InterpreterExecutor in (
+        executor,
+        *(task.executor for task in streams),
+    ):
+        pattern = 'The {!r} parameter should not be {!r} for a {!r}'
+        raise TypeError(pattern.format('executor', 'Interpreter', 'stream'))
+    if executor is InterpreterExecutor and any(
+        value.reduce is None for value in (*args, *kwargs.values())
+        if (
+            not isinstance(value, ReturnValue) and
+            isinstance(value, GatherValue)
+        )
+    ):
+        pattern = (
+            'The {!r} parameter should not be {!r} for a {!r} without {!r}'
+        )
+        raise TypeError(pattern.format(
+            'executor',
+            'Interpreter',
+            'gather',
+            'reduce',
+        ))
     return ScheduledTask(
         executor=executor,
         name=name,
@@ -171,17 +317,345 @@ def scheduled_task(
         priority=priority,
         processes=processes,
         threads=threads,
+        cpus=cpus,
         system_processor=system_processor,
         system_memory=system_memory,
         graphics_processor=graphics_processor,
         graphics_memory=graphics_memory,
+        resources=resources,
         continual=continual,
-        initialized=False,
+        idempotent=idempotent,
+        condition=condition,
     )
 
 
+def scheduled_tasks(
+    executor: Union[
+        Type[Union[Process, Thread]],
+        Sequence[Type[Union[Process, Thread]]],
+    ],
+    names: Sequence[str],
+    targets: Union[Callable[..., Any], Sequence[Callable[..., Any]]],
+    args: Sequence[Tuple[Any, ...]] = None,
+    kwargs: Sequence[Dict[str, Any]] = None,
+    *,
+    dependencies: Sequence[Tuple[Union[int, str], Union[int, str]]] = None,
+    priority: Union[int, float, Sequence[Union[int, float]]] = None,
+    processes: Union[int, Sequence[int]] = 0,
+    threads: Union[int, Sequence[int]] = 0,
+    cpus: Union[int, Sequence[int]] = 0,
+    system_processor: Union[int, float, Sequence[Union[int, float]]] = 0,
+    system_memory: Union[int, float, Sequence[Union[int, float]]] = 0,
+    graphics_processor: Union[int, float, Sequence[Union[int, float]]] = 0,
+    graphics_memory: Union[int, float, Sequence[Union[int, float]]] = 0,
+    resources: Union[
+        Dict[str, Union[int, float]],
+        Sequence[Dict[str, Union[int, float]]],
+    ] = None,
+    continual: Union[bool, Sequence[bool]] = False,
+    idempotent: Union[bool, Sequence[bool]] = False,
+) -> TaskTable:
+    """
+    The `scheduled_tasks` function builds many tasks at once from columns,
+    for task graphs too large to be built one `scheduled_task` at a time.
+    Each column is validated once as a whole, and the task scheduler does
+    not validate the tasks again. The task scheduler still builds a
+    `ScheduledTask` record per row once it starts, so the table saves the
+    time taken to build and validate the tasks, not the memory they take
+    while running.
+
+    Parameters
+    ----------
+    executor : type or sequence of type of multiprocessing.Process or
+    threading.Thread
+        | The execution unit of all the tasks, or of each task, which may
+        also be an `Interpreter`.
+    names : sequence of str
+        | Unique identifiers of the tasks, one per task.
+    targets : callable or sequence of callable
+        | The function invoked by all the tasks, or by each task.
+    args : sequence of tuple, optional
+        | Positional arguments of each task. Return values, streams and
+        gathers of other tasks are not supported, use `scheduled_task` for
+        tasks passing results.
+    kwargs : sequence of dict, optional
+        | Keyword arguments of each task.
+    dependencies : sequence of pairs of int or str, optional
+        | Edges `(task, dependency)` between tasks, given by position or by
+        name, ensuring `task` starts after `dependency` finished.
+    priority : int, float or sequence of int or float, optional
+        | Priority level of all the tasks, or of each task.
+    processes : int or sequence of int, default 0
+        | The number of processes allocated by the targets.
+    threads : int or sequence of int, default 0
+        | The number of threads allocated by the targets.
+    cpus : int or sequence of int, default 0
+        | The number of processor cores each process task is pinned to.
+    system_processor : int, float or sequence of int or float, default 0
+        | Estimate of the percentage of system processor usage.
+    system_memory : int, float or sequence of int or float, default 0
+        | Estimate of the percentage of system memory usage.
+    graphics_processor : int, float or sequence of int or float, default 0
+        | Estimate of the percentage of graphics processor usage.
+    graphics_memory : int, float or sequence of int or float, default 0
+        | Estimate of the percentage of graphics memory usage.
+    resources : dict or sequence of dict, optional
+        | Amounts of the named resources held by all the tasks, or by each
+        task.
+    continual : bool or sequence of bool, default False
+        | Whether the results of all the tasks, or of each task, are stored.
+    idempotent : bool or sequence of bool, default False
+        | Whether all the tasks, or each task, may safely run more than once.
+
+    Returns
+    -------
+    TaskTable
+        A validated table of tasks, accepted by `task_scheduler` in place of
+        a tuple of ScheduledTask.
+    """
+    if not isinstance(names, (tuple, list)):
+        pattern = 'The {!r} parameter should be of type {!r} or {!r}'
+        raise TypeError(pattern.format('names', 'tuple', 'list'))
+    if not set(map(type, names)) <= {str}:
+        pattern = 'The {!r} parameter should only contain {!r}'
+        raise TypeError(pattern.format('names', 'str'))
+    names = tuple(names)
+    size = len(names)
+    if not len(set(names)) == size:
+        pattern = 'Each {!r} in parameter {!r} should be unique'
+        raise TypeError(pattern.format('name', 'names'))
+    if isinstance(executor, type):
+        executor = (executor,) * size
+    executor = broadcast('executor', executor, size)
+    kinds = {}
+    for value in set(executor):
+        if isinstance(value, type) and issubclass(value, Interpreter):
+            kinds[value] = TaskTable.EXECUTORS.index(interpreter_executor())
+        elif isinstance(value, type) and issubclass(value, Process):
+            kinds[value] = TaskTable.EXECUTORS.index(ProcessExecutor)
+        elif isinstance(value, type) and issubclass(value, Thread):
+            kinds[value] = TaskTable.EXECUTORS.index(ThreadExecutor)
+        else:
+            pattern = 'The {!r} parameter should be of type {!r} or {!r}'
+            raise TypeError(pattern.format('executor', 'Process', 'Thread'))
+    executor = array('b', map(kinds.get, executor))
+    if callable(targets):
+        targets = [targets] * size
+    targets = broadcast('targets', targets, size)
+    if not all(map(callable, targets)):
+        pattern = 'The {!r} parameter should only contain callable objects'
+        raise TypeError(pattern.format('targets'))
+    if args is not None:
+        args = broadcast('args', args, size)
+        if not set(map(type, args)) <= {tuple}:
+            pattern = 'The {!r} parameter should only contain {!r}'
+            raise TypeError(pattern.format('args', 'tuple'))
+    if kwargs is not None:
+        kwargs = broadcast('kwargs', kwargs, size)
+        if not set(map(type, kwargs)) <= {dict}:
+            pattern = 'The {!r} parameter should only contain {!r}'
+            raise TypeError(pattern.format('kwargs', 'dict'))
+    # `isinstance` is tried on return values first, since it falls back to
+    # `__class__`, which a return value would record as a transformation.
+    if any(
+        isinstance(value, ReturnValue) or
+        isinstance(value, (StreamValue, GatherValue))
+        for values in (args or ()) for value in values
+    ) or any(
+        isinstance(value, ReturnValue) or
+        isinstance(value, (StreamValue, GatherValue))
+        for values in (kwargs or ()) for value in values.values()
+    ):
+        pattern = (
+            'The {!r} and {!r} parameters should not contain {!r}, {!r} '
+            'or {!r}'
+        )
+        raise TypeError(pattern.format(
+            'args',
+            'kwargs',
+            'ReturnValue',
+            'StreamValue',
+            'GatherValue',
+        ))
+    if priority is None:
+        priority = float('inf')
+    priority = numeric('priority', priority, size, 'd')
+    processes = numeric('processes', processes, size, 'L', integer=True)
+    threads = numeric('threads', threads, size, 'L', integer=True)
+    cpus = numeric('cpus', cpus, size, 'L', integer=True)
+    if any(
+        cores and kind != TaskTable.EXECUTORS.index(ProcessExecutor)
+        for cores, kind in zip(cpus, executor)
+    ):
+        pattern = 'The {!r} parameter should only be used with {!r}'
+        raise TypeError(pattern.format('cpus', 'Process'))
+    percentages = {}
+    for parameter, value in (
+        ('system_processor', system_processor),
+        ('system_memory', system_memory),
+        ('graphics_processor', graphics_processor),
+        ('graphics_memory', graphics_memory),
+    ):
+        percentages[parameter] = numeric(parameter, value, size, 'd')
+        if percentages[parameter] and (
+            min(percentages[parameter]) < 0 or
+            max(percentages[parameter]) > 100
+        ):
+            pattern = 'The {!r} parameter should be between {!r} and {!r}'
+            raise TypeError(pattern.format(parameter, 0, 100))
+    if isinstance(resources, dict):
+        validate_resources('resources', resources)
+        resources = [resources] * size
+    elif resources is not None:
+        resources = broadcast('resources', resources, size)
+        for value in {id(value): value for value in resources}.values():
+            validate_resources('resources', value)
+    if isinstance(continual, bool):
+        continual = (continual,) * size
+    continual = broadcast('continual', continual, size)
+    if not set(map(type, continual)) <= {bool}:
+        pattern = 'The {!r} parameter should only contain {!r}'
+        raise TypeError(pattern.format('continual', 'bool'))
+    continual = array('b', continual)
+    if isinstance(idempotent, bool):
+        idempotent = (idempotent,) * size
+    idempotent = broadcast('idempotent', idempotent, size)
+    if not set(map(type, idempotent)) <= {bool}:
+        pattern = 'The {!r} parameter should only contain {!r}'
+        raise TypeError(pattern.format('idempotent', 'bool'))
+    idempotent = array('b', idempotent)
+    offsets, edges = adjacency(dependencies or (), names)
+    order = TaskTable.topological_order(offsets, edges)
+    if order is None:
+        pattern = 'Dependencies of the tasks contains cycles'
+        raise TypeError(pattern)
+    return TaskTable(
+        names=names,
+        executors=executor,
+        targets=targets,
+        args=args,
+        kwargs=kwargs,
+        offsets=offsets,
+        edges=edges,
+        order=order,
+        priority=priority,
+        processes=processes,
+        threads=threads,
+        cpus=cpus,
+        resources=resources,
+        continual=continual,
+        idempotent=idempotent,
+        **percentages,
+    )
+
+
+def validate_resources(parameter: str, resources: Any) -> None:
+    if not isinstance(resources, dict):
+        pattern = 'The {!r} parameter should be of type {!r}'
+        raise TypeError(pattern.format(parameter, 'dict'))
+    if not set(map(type, resources)) <= {str}:
+        pattern = 'The keys of the {!r} parameter should be of type {!r}'
+        raise TypeError(pattern.format(parameter, 'str'))
+    if not set(map(type, resources.values())) <= {int, float}:
+        pattern = 'The values of the {!r} parameter should be {}'
+        raise TypeError(pattern.format(parameter, 'int or float'))
+    if resources and min(resources.values()) < 0:
+        pattern = 'The values of the {!r} parameter should be >= {!r}'
+        raise TypeError(pattern.format(parameter, 0))
+
+
+def broadcast(parameter: str, value: Any, size: int) -> List[Any]:
+    if not isinstance(value, (tuple, list)):
+        pattern = 'The {!r} parameter should be of type {!r} or {!r}'
+        raise TypeError(pattern.format(parameter, 'tuple', 'list'))
+    if not len(value) == size:
+        pattern = 'The {!r} parameter should contain {!r} items'
+        raise TypeError(pattern.format(parameter, size))
+    return list(value)
+
+
+def interpreter_executor() -> Type[
+    Union[InterpreterExecutor, ProcessExecutor]
+]:
+    # Without subinterpreters, their tasks still run in parallel in
+    # processes.
+    if InterpreterExecutor.available:
+        return InterpreterExecutor
+    return ProcessExecutor
+
+
+def numeric(
+    parameter: str,
+    value: Any,
+    size: int,
+    typecode: str,
+    integer: bool = False,
+) -> array:
+    types = {int} if integer else {int, float}
+    if type(value) in types:
+        value = (value,) * size
+    value = broadcast(parameter, value, size)
+    if not set(map(type, value)) <= types:
+        pattern = 'The {!r} parameter should only contain {}'
+        if integer:
+            raise TypeError(pattern.format(parameter, repr('int')))
+        raise TypeError(pattern.format(parameter, 'int or float'))
+    if integer and value and min(value) < 0:
+        pattern = 'The {!r} parameter should be an integer >= {!r}'
+        raise TypeError(pattern.format(parameter, 0))
+    return array(typecode, value)
+
+
+def adjacency(
+    dependencies: Sequence[Tuple[Union[int, str], Union[int, str]]],
+    names: Tuple[str, ...],
+) -> Tuple[array, array]:
+    size = len(names)
+    if not isinstance(dependencies, (tuple, list)):
+        pattern = 'The {!r} parameter should be of type {!r} or {!r}'
+        raise TypeError(pattern.format('dependencies', 'tuple', 'list'))
+    if not (
+        set(map(type, dependencies)) <= {tuple} and
+        set(map(len, dependencies)) <= {2}
+    ):
+        pattern = 'The {!r} parameter should only contain pairs'
+        raise TypeError(pattern.format('dependencies'))
+    indices = None
+    columns = []
+    for column in zip(*dependencies) if dependencies else ((), ()):
+        types = set(map(type, column))
+        if types == {str}:
+            if indices is None:
+                indices = dict(zip(names, range(size)))
+            column = list(map(indices.get, column))
+        elif types == {int, str}:
+            if indices is None:
+                indices = dict(zip(names, range(size)))
+            column = [
+                indices.get(value) if type(value) is str else value
+                for value in column
+            ]
+        elif not types <= {int}:
+            column = [None]
+        if None in column or column and (
+            min(column) < 0 or max(column) >= size
+        ):
+            pattern = 'The {!r} parameter should only contain known tasks'
+            raise TypeError(pattern.format('dependencies'))
+        columns.append(column)
+    tasks, dependencies = columns
+    counts = Counter(tasks)
+    offsets = array('L', accumulate(
+        map(counts.get, range(size), repeat(0, size)),
+        initial=0,
+    ))
+    order = sorted(range(len(tasks)), key=tasks.__getitem__)
+    edges = array('L', map(dependencies.__getitem__, order))
+    return offsets, edges
+
+
 def task_scheduler(
-    tasks: Tuple[ScheduledTask, ...],
+    tasks: Union[Tuple[ScheduledTask, ...], TaskTable],
     *,
     processes: int = None,
     threads: int = None,
@@ -189,6 +663,22 @@ def task_scheduler(
     system_memory: Union[int, float] = 100,
     graphics_processor: Union[int, float] = 100,
     graphics_memory: Union[int, float] = 100,
+    resources: Dict[str, Union[int, float]] = None,
+    memory_limit: bool = False,
+    memory_requeue: Union[int, float] = None,
+    admission: str = 'first_fit',
+    concurrency: str = 'fixed',
+    pinning: str = 'compact',
+    history: Union[str, RuntimeHistory] = None,
+    speculation: Union[int, float] = None,
+    fusion: bool = False,
+    deduplicate: bool = False,
+    resume: str = None,
+    fail_fast: Union[bool, str] = False,
+    trace: Union[bool, str] = False,
+    hooks: Tuple[TaskHook, ...] = None,
+    metrics: Union[int, Callable[[str], Any]] = None,
+    session: Scheduler = None,
 ) -> SchedulerResult:
     """
     The `task_scheduler` function orchestrates the simultaneous execution of
@@ -199,9 +689,10 @@ def task_scheduler(
 
     Parameters
     ----------
-    tasks : tuple of ScheduledTask
+    tasks : tuple of ScheduledTask or TaskTable
         | A tuple containing instances of ScheduledTask representing the
-        tasks to be executed concurrently.
+        tasks to be executed concurrently, or a table of tasks built by
+        `scheduled_tasks`, which has already been validated.
     processes : int, default os.cpu_count()
         | Specifies the total number of parallel processes available for
         executing all tasks collectively.
@@ -216,6 +707,110 @@ def task_scheduler(
         | Maximum allowed graphics processor usage (percentage).
     graphics_memory : int or float, default 100
         | Maximum allowed graphics memory usage (percentage).
+    resources : dict, optional
+        | Capacities of named resources (such as `{'database': 8}` for eight
+        concurrent database connections). Tasks only start while the amounts
+        they declare in `scheduled_task(resources=...)` are available, and
+        tasks declaring more than the capacity are canceled.
+    memory_limit : bool, default False
+        | A flag indicating whether the `system_memory` declared by process
+        tasks is enforced as a hard limit on the data segment of their
+        worker process (through `resource.setrlimit`), which also covers the
+        memory inherited from the task scheduler process. Allocations past
+        the limit fail, and the task fails with a `MemoryLimitError`.
+    memory_requeue : int or float, optional
+        | A factor by which the `system_memory` of a task exceeding its
+        memory limit is multiplied, before the task is executed again once
+        the larger reservation is available. Tasks are requeued until their
+        reservation reaches the `system_memory` of the task scheduler.
+    admission : str, default 'first_fit'
+        | The strategy admitting tasks against the resource limits.
+        `'first_fit'` starts the first task that fits, in priority order.
+        `'backfill'` reserves the resources of the first ready task that does
+        not fit, so smaller tasks only start on the remaining capacity and
+        the large task is guaranteed to start.
+        `'dominant_resource'` prefers, within the same priority, the tasks
+        with the smallest share of their most demanded resource. Tasks are
+        not grouped by user, so the smallest tasks are admitted first, which
+        runs the most tasks at once rather than equalizing shares.
+        `'best_fit'` prefers, within the same priority, the tasks leaving the
+        least capacity unused.
+    concurrency : str, default 'fixed'
+        | The policy of the worker limits. `'fixed'` keeps `processes` and
+        `threads` for the whole run. `'adaptive'` treats them as starting
+        points and tunes them during the run from the completion rate and
+        latency of the tasks, backing off under host processor and memory
+        pressure, up to four times their initial values. The chosen limits
+        are stored in the `concurrency` of the result.
+    pinning : str, default 'compact'
+        | The placement of tasks declaring `scheduled_task(cpus=...)` on the
+        processor cores available to the scheduler, which each running task
+        holds exclusively until it finishes. `'compact'` packs the cores of
+        a task into as few NUMA nodes as possible, keeping its memory
+        accesses local. `'spread'` distributes them evenly over the nodes,
+        giving memory-bandwidth-heavy tasks the bandwidth of every node.
+    history : str or RuntimeHistory, optional
+        | A path of a SQLite database (or a `RuntimeHistory` returned by
+        `runtime_history`) keeping the elapsed time, peak memory and outcome
+        of the latest runs of each task. Within the same priority, tasks
+        expected to run longest are started first, and the outcomes of this
+        run are appended once it finishes.
+    speculation : int or float, optional
+        | A percentile (between 0 and 100) of the elapsed times of sibling
+        tasks, those sharing the same target. An idempotent process task
+        running for longer than one and a half times this percentile, or
+        than its mean elapsed time in `history` while fewer than three
+        siblings have completed, is launched again on an idle worker. The
+        first attempt to complete is kept, the other one is terminated, and
+        both attempts are stored in the `attempts` of the result.
+    fusion : bool, default False
+        | A flag indicating whether linear chains of tasks, where each task
+        is the only dependent of the previous one and only consumes its
+        return value, should be executed one after another in the same
+        worker. Their return values are handed over in memory, without
+        going through the manager. Only tasks declaring the same executor
+        and resources are fused, and each of them keeps its own result.
+    deduplicate : bool, default False
+        | A flag indicating whether tasks sharing the same executor, target,
+        arguments and dependencies, after the tasks they depend on have
+        themselves been deduplicated, should be executed only once. The
+        other tasks are aliased to the executed one, whose results are
+        stored under their names as well, and the aliases are stored in the
+        `aliases` of the result. Tasks whose target or arguments can not be
+        pickled, and tasks exchanging streams, are never deduplicated.
+    resume : str, optional
+        | A path of a directory journaling the return value of each task as
+        soon as it completes. When the run is restarted with the same path,
+        journaled tasks are treated as complete, their return values are fed
+        to their dependents, and only the remaining tasks are executed.
+        Failed and canceled tasks are executed again, and so are tasks that
+        submitted new tasks, so that they submit them again.
+    fail_fast : bool or str, default False
+        | A flag indicating whether the first task raising an exception
+        should stop the run. Pending tasks are canceled, running process
+        tasks are terminated, and running thread tasks are asked to return
+        early through `task_canceled`. With `'subgraph'`, only the tasks
+        connected to the failed task through dependencies are stopped, and
+        unrelated tasks keep running.
+    trace : bool or str, default False
+        | A flag indicating whether the task scheduler should record the
+        lifecycle events of each task (submitted, ready, dispatched, started,
+        finished and collected). If a path is given, the events are also
+        written to it in the Chrome Trace Event format.
+    hooks : tuple of TaskHook, optional
+        | Hooks invoked around each task (`before_dispatch`, `before_call`,
+        `after_call` and `on_result_collected`), such as `CProfileHook` or
+        `TracemallocHook`. Their per-task profiles and merged report are
+        stored for later access.
+    metrics : int or callable, optional
+        | Live metrics of the run (task states, worker and resource usage,
+        dispatch latency and result bytes) in the Prometheus text format.
+        An integer is a local port on which the metrics are served over
+        HTTP, while a callable is periodically invoked with the metrics text.
+        Metrics are disabled, with a warning, if the port can not be bound.
+    session : Scheduler, optional
+        | A running `Scheduler` session whose manager and logging pipeline
+        are reused instead of being started and stopped for this call.
 
     Returns
     -------
@@ -229,16 +824,22 @@ def task_scheduler(
         processes = cpu_count() or 1
     if threads is None:
         threads = cpu_count() or 1
-    if not isinstance(tasks, tuple):
-        pattern = 'The {!r} parameter should be of type {!r}'
-        raise TypeError(pattern.format('tasks', 'tuple'))
-    if not all(isinstance(item, ScheduledTask) for item in tasks):
+    if hooks is None:
+        hooks = ()
+    if resources is None:
+        resources = {}
+    if isinstance(tasks, TaskTable):
+        tasks = tasks.materialize()
+    elif not isinstance(tasks, tuple):
+        pattern = 'The {!r} parameter should be of type {!r} or {!r}'
+        raise TypeError(pattern.format('tasks', 'tuple', 'TaskTable'))
+    elif not all(isinstance(item, ScheduledTask) for item in tasks):
         pattern = 'The {!r} parameter should only contain {!r}'
         raise TypeError(pattern.format('tasks', 'ScheduledTask'))
-    if not len({task.name for task in tasks}) == len(tasks):
+    elif not len({task.name for task in tasks}) == len(tasks):
         pattern = 'Each {!r} in parameter {!r} should be unique'
         raise TypeError(pattern.format('name', 'tasks'))
-    if not DependencyHandler.directed_acyclic_graph(tasks):
+    elif not DependencyHandler.directed_acyclic_graph(tasks):
         pattern = 'Dependencies of the tasks contains cycles'
         raise TypeError(pattern)
     if not isinstance(processes, int):
@@ -277,6 +878,99 @@ def task_scheduler(
     if graphics_memory < 0 or graphics_memory > 100:
         pattern = 'The {!r} parameter should be between {!r} and {!r}'
         raise TypeError(pattern.format('graphics_memory', 0, 100))
+    validate_resources('resources', resources)
+    unknown = {
+        resource for task in tasks for resource in task.resources
+    }.difference(resources)
+    if unknown:
+        pattern = 'The {!r} parameter should contain {}'
+        raise TypeError(pattern.format(
+            'resources',
+            ', '.join(map(repr, sorted(unknown))),
+        ))
+    if not isinstance(memory_limit, bool):
+        pattern = 'The {!r} parameter should be of type {!r}'
+        raise TypeError(pattern.format('memory_limit', 'bool'))
+    if memory_requeue is not None and (
+        not isinstance(memory_requeue, (int, float)) or
+        isinstance(memory_requeue, bool)
+    ):
+        pattern = 'The {!r} parameter should be of type {!r}'
+        raise TypeError(pattern.format('memory_requeue', 'int or float'))
+    if memory_requeue is not None and memory_requeue <= 1:
+        pattern = 'The {!r} parameter should be greater than {!r}'
+        raise TypeError(pattern.format('memory_requeue', 1))
+    if memory_requeue is not None and not memory_limit:
+        pattern = 'The {!r} parameter should only be used with {!r}'
+        raise TypeError(pattern.format('memory_requeue', 'memory_limit'))
+    if admission not in (
+        'first_fit',
+        'backfill',
+        'dominant_resource',
+        'best_fit',
+    ):
+        pattern = 'The {!r} parameter should be {!r}, {!r}, {!r} or {!r}'
+        raise TypeError(pattern.format(
+            'admission',
+            'first_fit',
+            'backfill',
+            'dominant_resource',
+            'best_fit',
+        ))
+    if concurrency not in ('fixed', 'adaptive'):
+        pattern = 'The {!r} parameter should be {!r} or {!r}'
+        raise TypeError(pattern.format('concurrency', 'fixed', 'adaptive'))
+    if pinning not in ('compact', 'spread'):
+        pattern = 'The {!r} parameter should be {!r} or {!r}'
+        raise TypeError(pattern.format('pinning', 'compact', 'spread'))
+    if history is not None and not isinstance(history, (str, RuntimeHistory)):
+        pattern = 'The {!r} parameter should be of type {!r} or {!r}'
+        raise TypeError(pattern.format('history', 'str', 'RuntimeHistory'))
+    if isinstance(history, str):
+        history = RuntimeHistory(history)
+    if speculation is not None and (
+        not isinstance(speculation, (int, float)) or
+        isinstance(speculation, bool)
+    ):
+        pattern = 'The {!r} parameter should be of type {!r}'
+        raise TypeError(pattern.format('speculation', 'int or float'))
+    if speculation is not None and (speculation <= 0 or speculation > 100):
+        pattern = 'The {!r} parameter should be between {!r} and {!r}'
+        raise TypeError(pattern.format('speculation', 0, 100))
+    if not isinstance(fusion, bool):
+        pattern = 'The {!r} parameter should be of type {!r}'
+        raise TypeError(pattern.format('fusion', 'bool'))
+    if not isinstance(deduplicate, bool):
+        pattern = 'The {!r} parameter should be of type {!r}'
+        raise TypeError(pattern.format('deduplicate', 'bool'))
+    if not isinstance(fail_fast, bool) and fail_fast != 'subgraph':
+        pattern = 'The {!r} parameter should be of type {!r} or {!r}'
+        raise TypeError(pattern.format('fail_fast', 'bool', 'subgraph'))
+    if resume is not None and not isinstance(resume, str):
+        pattern = 'The {!r} parameter should be of type {!r}'
+        raise TypeError(pattern.format('resume', 'str'))
+    if not isinstance(trace, (bool, str)):
+        pattern = 'The {!r} parameter should be of type {!r} or {!r}'
+        raise TypeError(pattern.format('trace', 'bool', 'str'))
+    if not isinstance(hooks, tuple):
+        pattern = 'The {!r} parameter should be of type {!r}'
+        raise TypeError(pattern.format('hooks', 'tuple'))
+    if not all(isinstance(hook, TaskHook) for hook in hooks):
+        pattern = 'The {!r} parameter should only contain {!r}'
+        raise TypeError(pattern.format('hooks', 'TaskHook'))
+    if metrics is not None and not callable(metrics):
+        if not isinstance(metrics, int) or isinstance(metrics, bool):
+            pattern = 'The {!r} parameter should be of type {!r} or {!r}'
+            raise TypeError(pattern.format('metrics', 'int', 'callable'))
+        if metrics < 0 or metrics > 65535:
+            pattern = 'The {!r} parameter should be between {!r} and {!r}'
+            raise TypeError(pattern.format('metrics', 0, 65535))
+    if session is not None and not isinstance(session, Scheduler):
+        pattern = 'The {!r} parameter should be of type {!r}'
+        raise TypeError(pattern.format('session', 'Scheduler'))
+    if session is not None and not session.active:
+        pattern = 'The {!r} parameter should be a running {!r}'
+        raise TypeError(pattern.format('session', 'Scheduler'))
     scheduler = TaskScheduler(
         tasks=tasks,
         processes=processes,
@@ -285,5 +979,391 @@ def task_scheduler(
         system_memory=system_memory,
         graphics_processor=graphics_processor,
         graphics_memory=graphics_memory,
+        resources=resources,
+        memory_limit=memory_limit,
+        memory_requeue=memory_requeue,
+        admission=admission,
+        concurrency=concurrency,
+        pinning=pinning,
+        history=history,
+        speculation=speculation,
+        fusion=fusion,
+        deduplicate=deduplicate,
+        resume=resume,
+        fail_fast=fail_fast,
+        trace=trace,
+        hooks=hooks,
+        metrics=metrics,
+        session=session,
     )
     return scheduler.execute()
+
+
+def task_submitter() -> TaskSubmitter:
+    """
+    The `task_submitter` function returns a handle for submitting new tasks
+    into the running task scheduler, from inside the target of a running
+    task. It allows task graphs to grow while they are being executed, for
+    example when the amount of work is only known after a task has run.
+
+    Returns
+    -------
+    TaskSubmitter
+        A handle whose `submit` method appends instances of ScheduledTask to
+        the running task graph. Submitted tasks may depend on each other, on
+        the submitting task and on any other task of the graph. Submissions
+        reusing a task name, depending on unknown tasks, or depending on the
+        return value of a task that has already been collected are ignored
+        and logged as errors.
+
+    Examples
+    --------
+    >>> def crawl(url):
+    ...     urls = fetch_links(url)
+    ...     task_submitter().submit(*(
+    ...         scheduled_task(Thread, url, fetch, args=(url,))
+    ...         for url in urls
+    ...     ))
+    ...     return urls
+    """
+    submitter = CURRENT_SUBMITTER.get()
+    if submitter is None:
+        pattern = 'The {!r} function should be called from a running task'
+        raise RuntimeError(pattern.format('task_submitter'))
+    return submitter
+
+
+def task_canceled() -> bool:
+    """
+    The `task_canceled` function tells a running task whether the task
+    scheduler has asked it to stop, for example because another task failed
+    with `task_scheduler(fail_fast=...)`. Thread tasks cannot be stopped from
+    the outside, so long-running targets should check it periodically and
+    return early.
+
+    Returns
+    -------
+    bool
+        `True` if the running task has been asked to stop.
+
+    Examples
+    --------
+    >>> def crawl(urls):
+    ...     for url in urls:
+    ...         if task_canceled():
+    ...             return
+    ...         fetch(url)
+    """
+    cancellation = CURRENT_CANCELLATION.get()
+    if cancellation is None:
+        pattern = 'The {!r} function should be called from a running task'
+        raise RuntimeError(pattern.format('task_canceled'))
+    return cancellation.requested
+
+
+def gather(
+    tasks: Tuple[ScheduledTask, ...],
+    reduce: Callable[[Any, Any], Any] = None,
+    initial: Any = None,
+) -> GatherValue:
+    """
+    The `gather` function refers to the return values of many tasks at once,
+    to be passed as a single argument of another task.
+    The task scheduler pulls each return value as soon as its task
+    completes, so the gathering task receives all of them in a single
+    argument instead of fetching one argument per task, and the return
+    values are released as soon as they are pulled.
+
+    Parameters
+    ----------
+    tasks : tuple of ScheduledTask
+        | The tasks whose return values are gathered, in order.
+    reduce : callable, optional
+        | An associative function combining two return values into one. The
+        return values are combined in the order of `tasks` while the other
+        tasks are still running, outside of the loop dispatching the tasks,
+        and only the combined value is kept and passed to the gathering task.
+        If omitted, the return values are streamed instead: the gathering
+        task starts once any of the gathered tasks has been dispatched, runs
+        alongside them, and receives an iterable yielding the return values
+        in the order of `tasks`. The gathered tasks are held back while the
+        gathering task lags behind, so only a bounded number of return
+        values is kept, and iterating raises a `DependencyError` once it
+        reaches a task that did not complete.
+    initial : optional
+        | The value the reduction starts from. If omitted, the reduction
+        starts from the return value of the first task.
+
+    Returns
+    -------
+    GatherValue
+        A reference to be passed in the `args` or `kwargs` of
+        `scheduled_task`. With `reduce`, the gathering task waits for all the
+        gathered tasks, and is canceled if any of them (or the reduction)
+        fails.
+
+    Examples
+    --------
+    >>> shards = tuple(
+    ...     scheduled_task(Process, f'shard{i}', count_words, args=(i,))
+    ...     for i in range(10000)
+    ... )
+    >>> words = gather(shards, reduce=operator.add)
+    >>> total = scheduled_task(Thread, 'total', print, args=(words,))
+    >>> task_scheduler(tasks=(*shards, total))
+    """
+    if not isinstance(tasks, tuple):
+        pattern = 'The {!r} parameter should be of type {!r}'
+        raise TypeError(pattern.format('tasks', 'tuple'))
+    if not tasks:
+        pattern = 'The {!r} parameter should not be empty'
+        raise TypeError(pattern.format('tasks'))
+    if not all(isinstance(task, ScheduledTask) for task in tasks):
+        pattern = 'The {!r} parameter should only contain {!r}'
+        raise TypeError(pattern.format('tasks', 'ScheduledTask'))
+    if reduce is not None and not callable(reduce):
+        pattern = 'The {!r} parameter should be of type {!r}'
+        raise TypeError(pattern.format('reduce', 'callable'))
+    if initial is not None and reduce is None:
+        pattern = 'The {!r} parameter should only be used with {!r}'
+        raise TypeError(pattern.format('initial', 'reduce'))
+    return GatherValue(
+        tasks=tasks,
+        reduce=reduce,
+        initial=() if initial is None else (initial,),
+    )
+
+
+def runtime_history(path: str) -> RuntimeHistory:
+    """
+    The `runtime_history` function opens (or creates) the SQLite database
+    in which `task_scheduler(history=...)` records the elapsed time, peak
+    memory and outcome of the latest runs of each task, keyed by the task
+    name and a fingerprint of its target.
+    It allows the expected durations of tasks to be known before a run
+    starts, for capacity planning and for choosing timeouts.
+
+    Parameters
+    ----------
+    path : str
+        | The path of the SQLite database.
+
+    Returns
+    -------
+    RuntimeHistory
+        A handle whose `estimates` method returns a `RuntimeEstimate` per
+        recorded task (the number of samples, the mean and standard
+        deviation of the elapsed time, the peak memory, the failure rate and
+        a suggested timeout), and whose `makespan` method predicts the
+        duration of a run on the given workers.
+
+    Examples
+    --------
+    >>> history = runtime_history('runs.sqlite')
+    >>> task_scheduler(tasks=(task1, task2), history=history)
+    >>> history.estimates((task1, task2))
+    {'task1': RuntimeEstimate(samples=1, elapsed_time=1.0, ...), ...}
+    >>> history.makespan((task1, task2), processes=2, threads=2)
+    1.0
+    """
+    if not isinstance(path, str):
+        pattern = 'The {!r} parameter should be of type {!r}'
+        raise TypeError(pattern.format('path', 'str'))
+    return RuntimeHistory(path)
+
+
+class Scheduler:
+    """
+    The `Scheduler` class is a long-lived scheduling session for services
+    that submit task graphs repeatedly.
+    It keeps the shared memory manager and the logging pipeline running
+    between submissions, and runs each submitted graph in the background,
+    so several graphs may be in flight at the same time. Workers are not
+    pooled, each task still starts its own process or thread. Process
+    workers are forked from the thread running their graph, and forking
+    while other threads run may deadlock the child, so a graph with
+    `Process` tasks waits for the running graphs and runs alone. Tasks
+    submitted while a graph runs do not change how it is classified.
+
+    Parameters
+    ----------
+    max_workers : int, optional
+        | The maximum number of submitted task graphs running at the same
+        time. Further submissions wait for a running graph to finish.
+    **options
+        | Default keyword arguments of `task_scheduler` (such as `processes`,
+        `threads` or `system_memory`) applied to every submission. Worker and
+        resource limits apply to each submitted graph separately.
+
+    Examples
+    --------
+    >>> with Scheduler(processes=2, threads=4) as scheduler:
+    ...     first = scheduler.submit(tasks=(task1, task2))
+    ...     second = scheduler.submit(tasks=(task3,), threads=2)
+    ...     first.result().return_value
+    ...     second.result().return_value
+    """
+
+    __slots__ = (
+        'options',
+        'max_workers',
+        'manager',
+        'queue',
+        'listener',
+        'handlers',
+        'executor',
+        'futures',
+        'condition',
+        'running',
+        'exclusive',
+        'waiting',
+    )
+
+    def __init__(self, *, max_workers: int = None, **options: Any) -> None:
+        if max_workers is not None and not isinstance(max_workers, int):
+            pattern = 'The {!r} parameter should be of type {!r}'
+            raise TypeError(pattern.format('max_workers', 'int'))
+        if max_workers is not None and max_workers < 1:
+            pattern = 'The {!r} parameter should be an integer >= {!r}'
+            raise TypeError(pattern.format('max_workers', 1))
+        self.validate_options(options)
+        self.options = options
+        self.max_workers = max_workers
+        self.manager = None
+        self.queue = None
+        self.listener = None
+        self.handlers = None
+        self.executor = None
+        self.futures = set()
+        self.condition = Condition()
+        self.running = 0
+        self.exclusive = False
+        self.waiting = 0
+
+    def __enter__(self) -> Scheduler:
+        self.start()
+        return self
+
+    def __exit__(self, *exception: Any) -> None:
+        self.shutdown()
+
+    @property
+    def active(self) -> bool:
+        return self.executor is not None
+
+    def start(self) -> None:
+        """
+        Starts the shared memory manager, the logging pipeline and the pool
+        running the submitted task graphs.
+        """
+        if self.active:
+            return
+        initialize_logger(formatter=LOGGING_FORMAT, level=LOGGING_LEVEL)
+        self.queue = Queue()
+        self.listener, self.handlers = start_listener(self.queue)
+        self.manager = Manager()
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix='parallelism',
+        )
+
+    def submit(
+        self,
+        tasks: Tuple[ScheduledTask, ...],
+        **options: Any,
+    ) -> Future[SchedulerResult]:
+        """
+        Submits a task graph to the running session.
+
+        Parameters
+        ----------
+        tasks : tuple of ScheduledTask
+            | A tuple containing instances of ScheduledTask representing the
+            tasks to be executed concurrently.
+        **options
+            | Keyword arguments of `task_scheduler` overriding the defaults
+            of the session for this submission.
+
+        Returns
+        -------
+        concurrent.futures.Future
+            A future resolved with the `SchedulerResult` of the task graph,
+            or with the exception raised while validating or executing it.
+        """
+        if not self.active:
+            pattern = 'The {!r} session is not running'
+            raise RuntimeError(pattern.format('Scheduler'))
+        self.validate_options(options)
+        options = {**self.options, **options}
+        future = self.executor.submit(self.run, tasks, options)
+        self.futures.add(future)
+        future.add_done_callback(self.futures.discard)
+        return future
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Waits for the submitted task graphs and stops the session. With
+        `wait=False`, the task graphs not started yet are canceled, while the
+        running ones are still waited for, since they use the shared memory
+        manager and the logging pipeline of the session.
+        """
+        if not self.active:
+            return
+        if not wait:
+            for future in tuple(self.futures):
+                future.cancel()
+        self.executor.shutdown(wait=True)
+        self.manager.shutdown()
+        stop_listener(self.listener, self.handlers)
+        self.manager = None
+        self.queue = None
+        self.listener = None
+        self.handlers = None
+        self.executor = None
+
+    def run(
+        self,
+        tasks: Tuple[ScheduledTask, ...],
+        options: Dict[str, Any],
+    ) -> SchedulerResult:
+        # Graphs forking processes run alone, and the ones waiting to do so
+        # hold back the others, so that they are not starved.
+        exclusive = self.forks(tasks)
+        with self.condition:
+            if exclusive:
+                self.waiting += 1
+                self.condition.wait_for(lambda: not self.running)
+                self.waiting -= 1
+            else:
+                self.condition.wait_for(
+                    lambda: not (self.exclusive or self.waiting),
+                )
+            self.running += 1
+            self.exclusive = exclusive
+        try:
+            return task_scheduler(tasks, session=self, **options)
+        finally:
+            with self.condition:
+                self.running -= 1
+                self.exclusive = False
+                self.condition.notify_all()
+
+    @staticmethod
+    def forks(tasks: Tuple[ScheduledTask, ...]) -> bool:
+        if isinstance(tasks, TaskTable):
+            index = TaskTable.EXECUTORS.index(ProcessExecutor)
+            return index in tasks.executors
+        return isinstance(tasks, tuple) and any(
+            isinstance(task, ScheduledTask) and
+            issubclass(task.executor, Process)
+            for task in tasks
+        )
+
+    @staticmethod
+    def validate_options(options: Dict[str, Any]) -> None:
+        for option in options:
+            if option == 'session' or option not in (
+                task_scheduler.__kwdefaults__
+            ):
+                pattern = 'The {!r} parameter is not supported'
+                raise TypeError(pattern.format(option))
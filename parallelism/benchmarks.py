@@ -0,0 +1,396 @@
+from __future__ import annotations
+
+from argparse import ArgumentParser
+from functools import partial
+from json import dump, load
+from logging import WARNING
+from math import ceil, sqrt
+from multiprocessing import Manager, Pipe, Process
+from os import cpu_count
+from platform import platform, python_version
+from random import Random
+from sys import stdout
+from threading import Thread
+from time import perf_counter
+from typing import TYPE_CHECKING
+
+from parallelism import __version__
+from parallelism.api_reference import scheduled_task, task_scheduler
+from parallelism.logger import get_logger
+
+try:
+    from resource import RUSAGE_CHILDREN, RUSAGE_SELF, getrusage
+except ImportError:
+    getrusage = None
+
+if TYPE_CHECKING:
+    from multiprocessing.connection import Connection
+    from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+    from parallelism.core.scheduled_task import ScheduledTask
+    from parallelism.core.scheduler_result import SchedulerResult
+
+__all__ = ('run_benchmarks', 'compare_benchmarks', 'main')
+
+EXECUTORS = {'process': Process, 'thread': Thread}
+SHAPES = ('chain', 'fan_out', 'fan_in', 'diamond_lattice', 'random')
+SUITES = ('overhead', 'shapes', 'payloads', 'proxy')
+PERCENTILES = (50, 90, 99)
+
+
+def noop(*args: Any, **kwargs: Any) -> None:
+    return None
+
+
+def produce(size: int) -> bytes:
+    return bytes(size)
+
+
+def consume(value: bytes) -> int:
+    return len(value)
+
+
+def percentiles(values: Sequence[float]) -> Dict[str, Optional[float]]:
+    values = sorted(values)
+    summary = {}
+    for percentile in PERCENTILES:
+        if values:
+            index = ceil(percentile / 100 * len(values)) - 1
+            summary[f'p{percentile}'] = values[max(0, index)]
+        else:
+            summary[f'p{percentile}'] = None
+    summary['max'] = values[-1] if values else None
+    return summary
+
+
+def peak_memory() -> Dict[str, Optional[int]]:
+    # Measured in the fresh process of a single measurement, whose own peak
+    # starts from the memory it inherited, the same for every measurement.
+    if getrusage is None:
+        return {'self': None, 'children': None}
+    return {
+        'self': getrusage(RUSAGE_SELF).ru_maxrss,
+        'children': getrusage(RUSAGE_CHILDREN).ru_maxrss,
+    }
+
+
+def intervals(
+    result: SchedulerResult,
+    begin: str,
+    end: str,
+) -> List[float]:
+    values = []
+    for events in result.trace.values():
+        timeline = {}
+        for event in events:
+            timeline.setdefault(event.event, event.timestamp)
+        if begin in timeline and end in timeline:
+            values.append(timeline.get(end) - timeline.get(begin))
+    return values
+
+
+def measure(
+    tasks: Tuple[ScheduledTask, ...],
+    **options: Any,
+) -> Dict[str, Any]:
+    start = perf_counter()
+    result = task_scheduler(tasks, trace=True, **options)
+    wall_time = perf_counter() - start
+    run_time = intervals(result, 'started', 'finished')
+    return {
+        'tasks': len(tasks),
+        'failures': len(result.raise_exception),
+        'wall_time': wall_time,
+        'throughput': len(tasks) / wall_time,
+        'overhead': (wall_time - sum(run_time)) / len(tasks),
+        'dispatch_latency': percentiles(
+            intervals(result, 'ready', 'dispatched'),
+        ),
+        'turnaround': percentiles(intervals(result, 'submitted', 'collected')),
+        'run_time': percentiles(run_time),
+        'peak_memory': peak_memory(),
+    }
+
+
+def isolate(
+    connection: Connection,
+    benchmark: Callable[[], Dict[str, Any]],
+) -> None:
+    try:
+        connection.send(benchmark())
+    except BaseException as exception:
+        connection.send(exception)
+        raise
+    finally:
+        connection.close()
+
+
+def isolated(benchmark: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+    # Peak memory is a high-water mark over the lifetime of a process and
+    # of its children, so each measurement runs in a fresh process for its
+    # peak not to include the ones measured before.
+    receiver, sender = Pipe(duplex=False)
+    process = Process(target=isolate, args=(sender, benchmark))
+    process.start()
+    sender.close()
+    try:
+        result = receiver.recv()
+    finally:
+        receiver.close()
+        process.join()
+    if isinstance(result, BaseException):
+        raise result
+    return result
+
+
+def best(
+    benchmark: Callable[[], Dict[str, Any]],
+    repeat: int,
+) -> Dict[str, Any]:
+    results = [isolated(benchmark) for _ in range(repeat)]
+    return min(results, key=lambda result: result.get('wall_time'))
+
+
+def dag(
+    executor: Callable[..., Any],
+    shape: str,
+    size: int,
+    seed: int = 0,
+) -> Tuple[ScheduledTask, ...]:
+    tasks = []
+    for index in range(size):
+        dependencies = ()
+        if shape == 'chain' and index:
+            dependencies = (tasks[index - 1],)
+        if shape == 'fan_out' and index:
+            dependencies = (tasks[0],)
+        if shape == 'fan_in' and index == size - 1:
+            dependencies = tuple(tasks)
+        if shape == 'diamond_lattice':
+            width = max(1, int(sqrt(size)))
+            layer, column = divmod(index, width)
+            if layer:
+                previous = (layer - 1) * width
+                dependencies = tuple({
+                    tasks[previous + column],
+                    tasks[previous + (column + 1) % width],
+                })
+        if shape == 'random' and index:
+            generator = Random(seed + index)
+            amount = generator.randint(0, min(index, 3))
+            dependencies = tuple(
+                tasks[position]
+                for position in generator.sample(range(index), amount)
+            )
+        tasks.append(
+            scheduled_task(
+                executor,
+                f'{shape}-{index}',
+                noop,
+                dependencies=dependencies,
+            ),
+        )
+    return tuple(tasks)
+
+
+def overhead_suite(
+    sizes: Sequence[int],
+    repeat: int,
+    workers: int,
+) -> Dict[str, Any]:
+    results = {}
+    for name, executor in EXECUTORS.items():
+        for size in sizes:
+            tasks = tuple(
+                scheduled_task(executor, f'noop-{index}', noop)
+                for index in range(size)
+            )
+            results[f'{name}/{size}'] = best(
+                partial(measure, tasks, processes=workers, threads=workers),
+                repeat,
+            )
+    return results
+
+
+def shapes_suite(
+    sizes: Sequence[int],
+    repeat: int,
+    workers: int,
+    executor: str,
+) -> Dict[str, Any]:
+    results = {}
+    for shape in SHAPES:
+        for size in sizes:
+            tasks = dag(EXECUTORS.get(executor), shape, size)
+            results[f'{shape}/{size}'] = best(
+                partial(measure, tasks, processes=workers, threads=workers),
+                repeat,
+            )
+    return results
+
+
+def payloads_suite(
+    payloads: Sequence[int],
+    repeat: int,
+    executor: str,
+) -> Dict[str, Any]:
+    results = {}
+    for size in payloads:
+        producer = scheduled_task(
+            EXECUTORS.get(executor),
+            'producer',
+            produce,
+            args=(size,),
+        )
+        consumer = scheduled_task(
+            EXECUTORS.get(executor),
+            'consumer',
+            consume,
+            args=(producer.return_value,),
+        )
+        result = best(partial(measure, (producer, consumer)), repeat)
+        result['bytes_per_second'] = size / result.get('wall_time')
+        results[f'{size}'] = result
+    return results
+
+
+def proxy_suite(operations: int, repeat: int) -> Dict[str, Any]:
+    results = {}
+    manager = Manager()
+    try:
+        full_proxy = manager.dict()
+        full_proxy['task'] = manager.dict()
+        partial_proxy = full_proxy.get('task')
+        cases = {
+            'manager.dict': lambda: manager.dict(),
+            'proxy.set': lambda: partial_proxy.__setitem__('finish', True),
+            'proxy.get': lambda: partial_proxy.get('finish'),
+            'proxy.nested_get': lambda: full_proxy.get('task').get('finish'),
+        }
+        for name, operation in cases.items():
+            latencies = []
+            start = perf_counter()
+            for _ in range(operations * repeat):
+                begin = perf_counter()
+                operation()
+                latencies.append(perf_counter() - begin)
+            wall_time = perf_counter() - start
+            results[name] = {
+                'operations': operations * repeat,
+                'wall_time': wall_time,
+                'throughput': operations * repeat / wall_time,
+                'latency': percentiles(latencies),
+            }
+    finally:
+        manager.shutdown()
+    return results
+
+
+def run_benchmarks(
+    suites: Sequence[str] = SUITES,
+    sizes: Sequence[int] = (10, 100),
+    payloads: Sequence[int] = (1, 1024, 1048576),
+    operations: int = 1000,
+    repeat: int = 3,
+    workers: int = None,
+    executor: str = 'thread',
+) -> Dict[str, Any]:
+    if workers is None:
+        workers = cpu_count() or 1
+    logger = get_logger()
+    level = logger.level
+    logger.setLevel(WARNING)
+    try:
+        report = {
+            'metadata': {
+                'version': '.'.join(map(str, __version__)),
+                'python': python_version(),
+                'platform': platform(),
+                'cpu_count': cpu_count(),
+                'workers': workers,
+                'executor': executor,
+                'repeat': repeat,
+            },
+        }
+        if 'overhead' in suites:
+            report['overhead'] = overhead_suite(sizes, repeat, workers)
+        if 'shapes' in suites:
+            report['shapes'] = shapes_suite(sizes, repeat, workers, executor)
+        if 'payloads' in suites:
+            report['payloads'] = payloads_suite(payloads, repeat, executor)
+        if 'proxy' in suites:
+            report['proxy'] = proxy_suite(operations, repeat)
+    finally:
+        logger.setLevel(level)
+    return report
+
+
+def compare_benchmarks(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    path: str = '',
+) -> Dict[str, Dict[str, float]]:
+    comparison = {}
+    for key, value in current.items():
+        if key == 'metadata' or key not in baseline:
+            continue
+        reference = baseline.get(key)
+        name = f'{path}/{key}' if path else key
+        if isinstance(value, dict) and isinstance(reference, dict):
+            comparison.update(compare_benchmarks(reference, value, name))
+        elif (
+            isinstance(value, (int, float)) and
+            isinstance(reference, (int, float)) and
+            not isinstance(value, bool) and
+            reference
+        ):
+            comparison[name] = {
+                'baseline': reference,
+                'current': value,
+                'ratio': value / reference,
+            }
+    return comparison
+
+
+def main(arguments: Sequence[str] = None) -> None:
+    parser = ArgumentParser(
+        prog='python -m parallelism.benchmarks',
+        description='Measure scheduler overhead and scaling.',
+    )
+    parser.add_argument('--suites', nargs='+', choices=SUITES, default=SUITES)
+    parser.add_argument('--sizes', nargs='+', type=int, default=(10, 100))
+    parser.add_argument(
+        '--payloads',
+        nargs='+',
+        type=int,
+        default=(1, 1024, 1048576),
+    )
+    parser.add_argument('--operations', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--executor', choices=EXECUTORS, default='thread')
+    parser.add_argument('--output', default=None)
+    parser.add_argument('--compare', default=None)
+    namespace = parser.parse_args(arguments)
+    report = run_benchmarks(
+        suites=namespace.suites,
+        sizes=namespace.sizes,
+        payloads=namespace.payloads,
+        operations=namespace.operations,
+        repeat=namespace.repeat,
+        workers=namespace.workers,
+        executor=namespace.executor,
+    )
+    if namespace.compare:
+        with open(namespace.compare, 'r') as file:
+            report['comparison'] = compare_benchmarks(load(file), report)
+    if namespace.output:
+        with open(namespace.output, 'w') as file:
+            dump(report, file, indent=4)
+    else:
+        dump(report, stdout, indent=4)
+        stdout.write('\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -13,3 +13,29 @@ LOGGING_FORMAT = '{timestamp} {level} {logger} - {message}'.format(
     logger='[%(name)s:%(process)d:%(thread)d]',
     message='%(message)s',
 )
+
+# metrics configuration
+METRICS_HOST = '127.0.0.1'
+METRICS_INTERVAL = 1.0
+METRICS_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 60.0)
+
+# concurrency configuration
+CONCURRENCY_INTERVAL = 0.5
+CONCURRENCY_SCALE = 4
+CONCURRENCY_TOLERANCE = 0.05
+CONCURRENCY_LOAD = 1.0
+CONCURRENCY_MEMORY = 0.1
+
+# history configuration
+HISTORY_WINDOW = 20
+HISTORY_DEVIATIONS = 3
+HISTORY_LOCK_TIMEOUT = 5.0
+HISTORY_BATCH = 500
+
+# stream configuration
+STREAM_BUFFER = 64
+STREAM_TIMEOUT = 0.1
+
+# speculation configuration
+SPECULATION_MULTIPLIER = 1.5
+SPECULATION_SAMPLES = 3
@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+from typing import NamedTuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing import Tuple
+
+__all__ = ('ConcurrencyReport',)
+
+
+class ConcurrencyReport(NamedTuple):
+    processes: int
+    threads: int
+    history: Tuple[Tuple[float, int, int], ...]
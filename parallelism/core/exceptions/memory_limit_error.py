@@ -0,0 +1,12 @@
+from __future__ import annotations
+
+from parallelism.core.exceptions.resource_error import ResourceError
+
+__all__ = ('MemoryLimitError',)
+
+
+class MemoryLimitError(ResourceError):
+    def __init__(self, message: str, limit: int) -> None:
+        super().__init__(message, 0, 0, 0, 0)
+        self.args = (message, limit)
+        self.limit = limit
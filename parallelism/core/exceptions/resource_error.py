@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Union
+from typing import Dict, Optional, Union
 
 __all__ = ('ResourceError',)
 
@@ -13,16 +13,21 @@ class ResourceError(Exception):
         system_memory: Union[int, float],
         graphics_processor: Union[int, float],
         graphics_memory: Union[int, float],
+        resources: Optional[Dict[str, Union[int, float]]] = None,
     ) -> None:
-        super().__init__(
+        arguments = (
             message,
             system_processor,
             system_memory,
             graphics_processor,
             graphics_memory,
         )
+        if resources:
+            arguments += (resources,)
+        super().__init__(*arguments)
         self.message = message
         self.system_processor = system_processor
         self.system_memory = system_memory
         self.graphics_processor = graphics_processor
         self.graphics_memory = graphics_memory
+        self.resources = resources or {}
@@ -0,0 +1,12 @@
+from __future__ import annotations
+
+from parallelism.core.exceptions.worker_error import WorkerError
+
+__all__ = ('WorkerExitError',)
+
+
+class WorkerExitError(WorkerError):
+    def __init__(self, message: str, exitcode: int) -> None:
+        super().__init__(message, 0, 0)
+        self.args = (message, exitcode)
+        self.exitcode = exitcode
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from threading import Thread
+
+from parallelism.core.executors.thread_executor import ThreadExecutor
+
+try:
+    from concurrent import interpreters
+except ImportError:
+    interpreters = None
+
+__all__ = ('Interpreter', 'InterpreterExecutor')
+
+
+class Interpreter(Thread):
+    # Only used to select the executor of a task, its target runs in a
+    # subinterpreter with its own GIL, driven from a thread of the task
+    # scheduler process.
+    pass
+
+
+class InterpreterExecutor(Interpreter, ThreadExecutor):
+    # Subinterpreters with their own GIL are only exposed publicly by
+    # `concurrent.interpreters` (Python 3.14 and later), tasks fall back to
+    # processes elsewhere. The thread is driven like a `ThreadExecutor`, only
+    # its target is replaced by the `InterpreterHandler`, which hands the
+    # call over to an idle subinterpreter.
+    available = interpreters is not None
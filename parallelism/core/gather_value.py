@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing import Any, Callable, Optional, Tuple
+
+    from parallelism.core.scheduled_task import ScheduledTask
+
+__all__ = ('GatherValue',)
+
+
+class GatherValue:
+    __slots__ = ('tasks', 'reduce', 'initial')
+
+    def __init__(
+        self,
+        tasks: Tuple[ScheduledTask, ...],
+        reduce: Optional[Callable[[Any, Any], Any]] = None,
+        initial: Tuple[Any, ...] = (),
+    ) -> None:
+        self.tasks = tasks
+        self.reduce = reduce
+        self.initial = initial
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(tasks={len(self.tasks)!r})'
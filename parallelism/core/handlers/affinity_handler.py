@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import os
+from glob import glob
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing import Dict, List, Literal, Optional, Set, Tuple
+
+    from parallelism.core.scheduled_task import ScheduledTask
+    from parallelism.core.task_state import TaskState
+
+__all__ = ('AffinityHandler',)
+
+
+class AffinityHandler:
+    NODES = '/sys/devices/system/node/node[0-9]*/cpulist'
+
+    __slots__ = ('states', 'strategy', 'enabled', 'cores', 'nodes', 'assigned')
+
+    def __init__(
+        self,
+        states: Dict[str, TaskState],
+        strategy: Literal['compact', 'spread'],
+    ) -> None:
+        self.states = states
+        self.strategy = strategy
+        # Placement is only controllable where the scheduler affinity is
+        # exposed (Linux), elsewhere `cpus` is ignored.
+        self.enabled = hasattr(os, 'sched_getaffinity')
+        self.cores = (
+            frozenset(os.sched_getaffinity(0)) if self.enabled else frozenset()
+        )
+        self.nodes = self.topology(self.cores)
+        self.assigned = {}
+
+    @classmethod
+    def topology(cls, cores: Set[int]) -> Dict[int, int]:
+        nodes = {}
+        for path in glob(cls.NODES):
+            node = int(os.path.basename(os.path.dirname(path))[4:])
+            try:
+                with open(path) as file:
+                    cpulist = file.read().strip()
+            except OSError:
+                continue
+            for interval in filter(None, cpulist.split(',')):
+                first, _, last = interval.partition('-')
+                for core in range(int(first), int(last or first) + 1):
+                    nodes[core] = node
+        return {core: nodes.get(core, 0) for core in cores}
+
+    @property
+    def free(self) -> Set[int]:
+        for name in tuple(self.assigned):
+            if self.states[name].finished:
+                del self.assigned[name]
+        return set(self.cores).difference(*self.assigned.values())
+
+    def within_limits(self, task: ScheduledTask) -> bool:
+        return not self.enabled or task.cpus <= len(self.cores)
+
+    def lacking_cores(self, task: ScheduledTask) -> Dict[str, int]:
+        if self.within_limits(task):
+            return {}
+        return {'cpus': task.cpus - len(self.cores)}
+
+    def enough_cores(self, task: ScheduledTask) -> bool:
+        return not (self.enabled and task.cpus) or task.cpus <= len(self.free)
+
+    def assign(self, task: ScheduledTask) -> Optional[Tuple[int, ...]]:
+        if not (self.enabled and task.cpus):
+            return None
+        free: Dict[int, List[int]] = {}
+        for core in sorted(self.free):
+            free.setdefault(self.nodes[core], []).append(core)
+        if self.strategy == 'spread':
+            cores = self.spread(free, task.cpus)
+        else:
+            cores = self.compact(free, task.cpus)
+        self.assigned[task.name] = cores
+        return cores
+
+    def share(
+        self,
+        task: ScheduledTask,
+        cores: Optional[Tuple[int, ...]],
+    ) -> None:
+        # Fused tasks keep the cores of the head of their chain.
+        if cores is not None:
+            self.assigned[task.name] = cores
+
+    @staticmethod
+    def compact(free: Dict[int, List[int]], amount: int) -> Tuple[int, ...]:
+        # The fullest node that still fits the task is used, leaving larger
+        # nodes for larger tasks, otherwise the task spans the least nodes.
+        fitting = [node for node in free if len(free[node]) >= amount]
+        if fitting:
+            node = min(fitting, key=lambda node: (len(free[node]), node))
+            return tuple(free[node][:amount])
+        cores = []
+        for node in sorted(free, key=lambda node: (-len(free[node]), node)):
+            cores.extend(free[node][:amount - len(cores)])
+        return tuple(sorted(cores))
+
+    @staticmethod
+    def spread(free: Dict[int, List[int]], amount: int) -> Tuple[int, ...]:
+        # Cores are taken one node at a time in turn, so the task gets the
+        # memory bandwidth of every node.
+        free = {node: list(cores) for node, cores in free.items() if cores}
+        taken = dict.fromkeys(free, 0)
+        cores = []
+        while len(cores) < amount:
+            node = min(free, key=lambda node: (taken[node], -len(free[node])))
+            cores.append(free[node].pop(0))
+            taken[node] += 1
+            if not free[node]:
+                del free[node]
+        return tuple(sorted(cores))
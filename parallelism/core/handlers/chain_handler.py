@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from parallelism.core.handlers.parameters_handler import ParametersHandler
+
+if TYPE_CHECKING:
+    from typing import Any, Dict, Tuple
+
+    from parallelism.core.handlers.function_handler import FunctionHandler
+
+__all__ = ('ChainHandler',)
+
+
+class ChainHandler:
+    __slots__ = ('handler', 'members')
+
+    def __init__(
+        self,
+        handler: FunctionHandler,
+        members: Tuple[Tuple[FunctionHandler, Tuple, Dict[str, Any]], ...],
+    ) -> None:
+        self.handler = handler
+        self.members = members
+
+    def __call__(self, *args: Any, **kwargs: Any) -> None:
+        # Each member only consumes the return value of the previous one,
+        # which is handed over in memory instead of through the manager.
+        previous = self.handler
+        complete, return_value = previous(*args, **kwargs)
+        for handler, args, kwargs in self.members:
+            if complete:
+                parameters_handler = ParametersHandler(
+                    proxy={previous.name: {'return_value': return_value}},
+                )
+                complete, return_value = handler(
+                    *parameters_handler.args(*args),
+                    **parameters_handler.kwargs(**kwargs),
+                )
+            else:
+                handler.log_current_state(blocker={
+                    'reason': 'dependency',
+                    'tasks': (previous.name,),
+                })
+            previous = handler
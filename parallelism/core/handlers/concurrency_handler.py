@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import os
+from multiprocessing import Process
+from time import monotonic
+from typing import TYPE_CHECKING
+
+from parallelism.config import (
+    CONCURRENCY_INTERVAL,
+    CONCURRENCY_LOAD,
+    CONCURRENCY_MEMORY,
+    CONCURRENCY_SCALE,
+    CONCURRENCY_TOLERANCE,
+)
+from parallelism.core.concurrency_report import ConcurrencyReport
+
+if TYPE_CHECKING:
+    from typing import Tuple
+
+    from parallelism.core.handlers.worker_handler import WorkerHandler
+    from parallelism.core.scheduled_task import ScheduledTask
+
+__all__ = ('ConcurrencyHandler',)
+
+
+class ConcurrencyHandler:
+    LIMITS = ('processes', 'threads')
+
+    __slots__ = (
+        'worker_handler',
+        'enabled',
+        'origin',
+        'updated',
+        'completed',
+        'elapsed',
+        'saturated',
+        'direction',
+        'previous',
+        'history',
+    )
+
+    def __init__(self, worker_handler: WorkerHandler, enabled: bool) -> None:
+        self.worker_handler = worker_handler
+        self.enabled = enabled
+        self.origin = monotonic()
+        self.updated = self.origin
+        self.completed = dict.fromkeys(self.LIMITS, 0)
+        self.elapsed = dict.fromkeys(self.LIMITS, 0.0)
+        self.saturated = set()
+        self.direction = dict.fromkeys(self.LIMITS, 1)
+        self.previous = dict.fromkeys(self.LIMITS)
+        self.history = [(0.0, *self.limits)]
+        if enabled:
+            worker_handler.maximum_processes *= CONCURRENCY_SCALE
+            worker_handler.maximum_threads *= CONCURRENCY_SCALE
+
+    @property
+    def limits(self) -> Tuple[int, int]:
+        return self.worker_handler.processes, self.worker_handler.threads
+
+    @staticmethod
+    def limit(task: ScheduledTask) -> str:
+        return 'processes' if issubclass(task.executor, Process) else 'threads'
+
+    @staticmethod
+    def processor_pressure() -> bool:
+        try:
+            load = os.getloadavg()[0]
+        except (AttributeError, OSError):
+            return False
+        return load / (os.cpu_count() or 1) > CONCURRENCY_LOAD
+
+    @staticmethod
+    def memory_pressure() -> bool:
+        information = {}
+        try:
+            with open('/proc/meminfo') as file:
+                for line in file:
+                    key, value = line.split(':', 1)
+                    information[key] = int(value.split()[0])
+        except (OSError, ValueError):
+            return False
+        total = information.get('MemTotal')
+        available = information.get('MemAvailable')
+        if not total or available is None:
+            return False
+        return available / total < CONCURRENCY_MEMORY
+
+    def waiting(self, task: ScheduledTask) -> None:
+        if self.enabled:
+            self.saturated.add(self.limit(task))
+
+    def collected(self, task: ScheduledTask, elapsed_time: float) -> None:
+        if self.enabled:
+            limit = self.limit(task)
+            self.completed[limit] += 1
+            self.elapsed[limit] += elapsed_time or 0.0
+
+    def update(self) -> None:
+        if not self.enabled:
+            return
+        now = monotonic()
+        if now - self.updated < CONCURRENCY_INTERVAL:
+            return
+        span = now - self.updated
+        self.updated = now
+        memory_pressure = self.memory_pressure()
+        # Threads share the processor of the scheduler, so only the process
+        # limit backs off under processor pressure.
+        pressure = {
+            'processes': memory_pressure or self.processor_pressure(),
+            'threads': memory_pressure,
+        }
+        before = self.limits
+        for name in self.LIMITS:
+            current = getattr(self.worker_handler, name)
+            maximum = getattr(self.worker_handler, f'maximum_{name}')
+            completed = self.completed[name]
+            throughput = completed / span
+            latency = self.elapsed[name] / completed if completed else 0.0
+            self.completed[name] = 0
+            self.elapsed[name] = 0.0
+            if not maximum:
+                continue
+            if pressure[name]:
+                # Multiplicative decrease, then additive increase once the
+                # host has recovered.
+                current = max(1, current // 2)
+                self.direction[name] = 1
+                self.previous[name] = None
+            elif name in self.saturated:
+                # Hill-climbing: keep stepping while the completion rate
+                # improves, and turn around when it drops, or when it stalls
+                # while the latency of the tasks grows.
+                if self.previous[name] is not None:
+                    previous_throughput, previous_latency = self.previous[name]
+                    if throughput < previous_throughput * (
+                        1 - CONCURRENCY_TOLERANCE
+                    ) or (
+                        throughput <= previous_throughput * (
+                            1 + CONCURRENCY_TOLERANCE
+                        ) and
+                        latency > previous_latency * (
+                            1 + CONCURRENCY_TOLERANCE
+                        )
+                    ):
+                        self.direction[name] = -self.direction[name]
+                current = min(maximum, max(1, current + self.direction[name]))
+                self.previous[name] = (throughput, latency)
+            setattr(self.worker_handler, name, current)
+        self.saturated.clear()
+        if self.limits != before:
+            self.history.append((now - self.origin, *self.limits))
+
+    def result(self) -> ConcurrencyReport:
+        return ConcurrencyReport(*self.limits, tuple(self.history))
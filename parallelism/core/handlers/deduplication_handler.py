@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+from pickle import PicklingError, dumps
+from typing import TYPE_CHECKING
+
+from parallelism.core.gather_value import GatherValue
+from parallelism.core.handlers.dependency_handler import DependencyHandler
+from parallelism.core.return_value import ReturnValue
+from parallelism.core.stream_value import StreamValue
+
+if TYPE_CHECKING:
+    from typing import (
+        Any,
+        Container,
+        Dict,
+        Iterable,
+        List,
+        Optional,
+        Set,
+        Tuple,
+    )
+
+    from parallelism.core.scheduled_task import ScheduledTask
+
+__all__ = ('DeduplicationHandler',)
+
+
+class DeduplicationHandler:
+    __slots__ = ('enabled', 'fingerprints', 'aliases', 'producers')
+
+    def __init__(self, enabled: bool) -> None:
+        self.enabled = enabled
+        self.fingerprints = {}
+        self.aliases = {}
+        self.producers = set()
+
+    def deduplicate(
+        self,
+        tasks: Iterable[ScheduledTask],
+        released: Container[str] = (),
+    ) -> Tuple[ScheduledTask, ...]:
+        # Tasks are visited after their dependencies, so that the inputs of
+        # a task are already rewritten to the tasks actually executed. Tasks
+        # whose return value has already been released are executed again.
+        tasks = tuple(tasks)
+        if not self.enabled:
+            return tasks
+        for task in tasks:
+            self.producers.update(
+                producer.name for producer in task.depends_on_streams
+            )
+        kept = {}
+        for task in self.topological_order(tasks):
+            task = self.rewrite(task)
+            fingerprint = self.fingerprint(task)
+            if fingerprint is None:
+                kept[task.name] = task
+                continue
+            original = self.fingerprints.get(fingerprint)
+            if original is None or original.name in released:
+                self.fingerprints[fingerprint] = task
+                kept[task.name] = task
+            else:
+                self.aliases[task.name] = original
+        return tuple(kept[task.name] for task in tasks if task.name in kept)
+
+    @staticmethod
+    def topological_order(
+        tasks: Tuple[ScheduledTask, ...],
+    ) -> List[ScheduledTask]:
+        names = {task.name for task in tasks}
+        visited: Set[str] = set()
+        order = []
+        for task in tasks:
+            if task.name in visited:
+                continue
+            visited.add(task.name)
+            stack = [(task, iter(DependencyHandler.depends_on(task)))]
+            while stack:
+                node, dependencies = stack[-1]
+                for dependency in dependencies:
+                    if dependency.name in names and (
+                        dependency.name not in visited
+                    ):
+                        visited.add(dependency.name)
+                        stack.append((
+                            dependency,
+                            iter(DependencyHandler.depends_on(dependency)),
+                        ))
+                        break
+                else:
+                    stack.pop()
+                    order.append(node)
+        return order
+
+    def rewrite(self, task: ScheduledTask) -> ScheduledTask:
+        if not any(
+            dependency.name in self.aliases
+            for dependency in DependencyHandler.depends_on(task)
+        ):
+            return task
+        return task._replace(
+            args=tuple(self.replace(value) for value in task.args),
+            kwargs={
+                key: self.replace(value)
+                for key, value in task.kwargs.items()
+            },
+            dependencies=tuple(dict.fromkeys(
+                self.aliases.get(dependency.name, dependency)
+                for dependency in task.dependencies
+            )),
+            condition=self.replace(task.condition),
+        )
+
+    def replace(self, value: Any) -> Any:
+        if not isinstance(value, ReturnValue):
+            if isinstance(value, GatherValue):
+                return GatherValue(
+                    tasks=tuple(
+                        self.aliases.get(task.name, task)
+                        for task in value.tasks
+                    ),
+                    reduce=value.reduce,
+                    initial=value.initial,
+                )
+            return value
+        task = getattr(value, ':task')
+        if task.name not in self.aliases:
+            return value
+        return ReturnValue.restore(
+            task=self.aliases[task.name],
+            transformations=list(getattr(value, ':transformations')),
+        )
+
+    def fingerprint(self, task: ScheduledTask) -> Optional[bytes]:
+        # Tasks exchanging streams are never merged, and neither are tasks
+        # whose target or arguments can not be pickled, since their equality
+        # can not be told apart from their identity.
+        if task.depends_on_streams or task.name in self.producers:
+            return None
+        try:
+            return dumps((
+                task.executor,
+                task.target,
+                task.continual,
+                tuple(self.reference(value) for value in task.args),
+                tuple(sorted(
+                    (key, self.reference(value))
+                    for key, value in task.kwargs.items()
+                )),
+                tuple(sorted(
+                    dependency.name for dependency in task.dependencies
+                )),
+                self.reference(task.condition),
+            ))
+        except (PicklingError, TypeError, AttributeError):
+            return None
+
+    @staticmethod
+    def reference(value: Any) -> Any:
+        # Return values are compared by the task they refer to, which is
+        # already rewritten, and by their transformations. Streams are
+        # checked only afterwards, since `isinstance` falls back to
+        # `__class__`, which a return value would record as another
+        # transformation.
+        if isinstance(value, ReturnValue):
+            return (
+                ReturnValue.__name__,
+                getattr(value, ':task').name,
+                tuple(getattr(value, ':transformations')),
+            )
+        if isinstance(value, GatherValue):
+            return (
+                GatherValue.__name__,
+                tuple(task.name for task in value.tasks),
+                value.reduce,
+                value.initial,
+            )
+        if isinstance(value, StreamValue):
+            raise TypeError(value)
+        return value
+
+    def result(self, *results: Dict[str, Any]) -> Dict[str, str]:
+        aliases = {name: task.name for name, task in self.aliases.items()}
+        for result in results:
+            for name, original in aliases.items():
+                if original in result:
+                    result[name] = result[original]
+        return aliases
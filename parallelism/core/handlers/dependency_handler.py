@@ -1,58 +1,267 @@
 from __future__ import annotations
 
+from itertools import chain
 from typing import TYPE_CHECKING
 
+from parallelism.core.handlers.parameters_handler import ParametersHandler
+from parallelism.logger import get_logger
+
 if TYPE_CHECKING:
-    from multiprocessing.managers import DictProxy
-    from typing import Dict, List, Literal, Set, Tuple
+    from typing import (
+        Container,
+        Dict,
+        Iterable,
+        List,
+        Literal,
+        Optional,
+        Set,
+        Tuple,
+    )
 
     from parallelism.core.scheduled_task import ScheduledTask
+    from parallelism.core.task_state import TaskState
 
 __all__ = ('DependencyHandler',)
 
 
 class DependencyHandler:
-    __slots__ = ('tasks', 'proxy', 'prerequisites')
+    __slots__ = (
+        'tasks',
+        'states',
+        'prerequisites',
+        'dependents',
+        'conditions',
+        'skipped',
+    )
 
-    def __init__(self, tasks: List[ScheduledTask], proxy: DictProxy) -> None:
+    def __init__(
+        self,
+        tasks: List[ScheduledTask],
+        states: Dict[str, TaskState],
+    ) -> None:
         self.tasks = tasks
-        self.proxy = proxy
+        self.states = states
         self.prerequisites = self.tasks_prerequisites()
+        self.dependents = {}
+        self.add_dependents(self.tasks)
+        self.conditions = {}
+        self.skipped = {}
 
     def tasks_prerequisites(self) -> Dict[str, Tuple[ScheduledTask, ...]]:
         prerequisite = dict.fromkeys((task.name for task in self.tasks), ())
         for task in self.tasks:
-            for dependent_task in task.depends_on_parameters:
+            for dependent_task in self.consumes(task):
                 prerequisite[dependent_task.name] += (task,)
         return prerequisite
 
+    def add_dependents(self, tasks: Iterable[ScheduledTask]) -> None:
+        # Dependents are kept by name, since requeued tasks are replaced by
+        # copies with larger reservations.
+        for task in tasks:
+            self.dependents.setdefault(task.name, [])
+            for dependency in self.depends_on(task):
+                self.dependents.setdefault(dependency.name, []).append(
+                    task.name,
+                )
+
+    def extend(self, tasks: Tuple[ScheduledTask, ...]) -> None:
+        for task in tasks:
+            self.prerequisites[task.name] = ()
+        for task in tasks:
+            for dependent_task in self.consumes(task):
+                self.prerequisites[dependent_task.name] += (task,)
+        self.add_dependents(tasks)
+
     def is_blocked(
         self,
         task: ScheduledTask,
         status: Literal['finish', 'complete'],
     ) -> bool:
-        tasks = tuple(task for task in self.depends_on(task))
-        return len(tasks) != sum(
-            task.initialized and
-            self.proxy.get(task.name).get(status)
-            for task in self.tasks
-            if task in tasks
+        streams = task.depends_on_streams
+        if streams:
+            streams = set(streams).difference(
+                task.depends_on_dependencies + task.depends_on_parameters,
+            )
+        gathered = set(task.depends_on_gathered_streams)
+        ordering = self.ordering(task)
+        dependencies = self.depends_on(task)
+        for dependency in dependencies:
+            state = self.states[dependency.name]
+            # Skipped tasks satisfy the dependencies that only order tasks.
+            # A task consuming the return value of a skipped task is held
+            # until its other dependencies finish, then either skipped by
+            # `skipping_task` or canceled along with a failed dependency.
+            if state.skipped:
+                if dependency in ordering:
+                    continue
+                if status == 'complete' or not all(
+                    self.states[other.name].finished
+                    for other in dependencies
+                ):
+                    return True
+                continue
+            if dependency in gathered:
+                continue
+            if dependency not in streams:
+                if not state.finished_with(status):
+                    return True
+            # Consumers of a stream only wait for their producer to start,
+            # and are only canceled if it finished without completing.
+            elif status == 'finish':
+                if not (
+                    state.finished_with('start') or
+                    state.finished_with('finish')
+                ):
+                    return True
+            elif (
+                state.finished_with('finish') and not
+                state.finished_with('complete')
+            ):
+                return True
+        # Tasks gathering a stream start once any of the gathered tasks has
+        # been dispatched, and learn about their failures from the stream.
+        return bool(
+            status == 'finish' and
+            gathered and not
+            any(
+                self.states[dependency.name].initialized
+                for dependency in gathered
+            )
         )
 
     def blocking_tasks(self, task: ScheduledTask) -> Tuple[str, ...]:
-        tasks = tuple(task for task in self.depends_on(task))
         return tuple(
-            task.name for task in self.tasks
+            dependency.name for dependency in self.depends_on(task)
+            if (
+                self.states[dependency.name].initialized and not
+                self.states[dependency.name].skipped and not
+                self.states[dependency.name].finished_with('complete')
+            )
+        )
+
+    def skipping_task(self, task: ScheduledTask) -> Optional[str]:
+        # A task consuming the return value of a skipped task can not run,
+        # but it is only skipped once its other dependencies have completed,
+        # so that it is canceled instead if one of them fails.
+        ordering = self.ordering(task)
+        dependencies = self.depends_on(task)
+        skipped = next((
+            dependency.name for dependency in dependencies
             if (
-                task in tasks and
-                task.initialized and not
-                self.proxy.get(task.name).get('complete')
+                dependency not in ordering and
+                self.states[dependency.name].skipped
             )
+        ), None)
+        if skipped is not None:
+            if all(
+                self.states[dependency.name].skipped or
+                self.states[dependency.name].finished_with('complete')
+                for dependency in dependencies
+            ):
+                return skipped
+            return None
+        if task.condition is None:
+            return None
+        dependency = task.depends_on_condition[0]
+        if not self.states[dependency.name].finished_with('complete'):
+            return None
+        if task.name not in self.conditions:
+            self.conditions[task.name] = self.condition(task)
+        return None if self.conditions[task.name] else dependency.name
+
+    def condition(self, task: ScheduledTask) -> bool:
+        dependency = task.depends_on_condition[0]
+        parameters_handler = ParametersHandler(
+            proxy={dependency.name: self.states[dependency.name].proxy},
         )
+        try:
+            return bool(parameters_handler.args(task.condition)[0])
+        except Exception as exception:
+            pattern = (
+                'The condition of {!r} on task {!r} raised {!r}, it is '
+                'treated as false'
+            )
+            get_logger().error(msg=pattern.format(
+                task.name,
+                dependency.name,
+                exception,
+            ))
+            return False
+
+    def skip(
+        self,
+        task: ScheduledTask,
+        reason: str,
+    ) -> Tuple[ScheduledTask, ...]:
+        # The tasks below a skipped task whose dependencies have all been
+        # skipped are marked at once, without executors or proxies, since
+        # none of them can run. The others are left to `skipping_task`.
+        skipped = [task]
+        self.skipped[task.name] = reason
+        index = 0
+        while index < len(skipped):
+            for name in self.dependents[skipped[index].name]:
+                state = self.states[name]
+                if state.initialized or name in self.skipped:
+                    continue
+                if not all(
+                    dependency.name in self.skipped
+                    for dependency in self.depends_on(state.task)
+                ):
+                    continue
+                self.skipped[name] = task.name
+                skipped.append(state.task)
+            index += 1
+        for skipped_task in skipped:
+            state = self.states[skipped_task.name]
+            state.initialized = True
+            state.released = True
+            state.skipped = True
+        return tuple(skipped)
+
+    def connected_tasks(self, task: ScheduledTask) -> Set[str]:
+        connected = {task.name}
+        stack = [task.name]
+        while stack:
+            name = stack.pop()
+            for neighbor in chain(
+                (
+                    dependency.name
+                    for dependency in self.depends_on(self.states[name].task)
+                ),
+                self.dependents[name],
+            ):
+                if neighbor not in connected:
+                    connected.add(neighbor)
+                    stack.append(neighbor)
+        return connected
 
     @staticmethod
-    def depends_on(task: ScheduledTask) -> Set[ScheduledTask]:
-        return set(task.depends_on_dependencies + task.depends_on_parameters)
+    def depends_on(task: ScheduledTask) -> Tuple[ScheduledTask, ...]:
+        return tuple(dict.fromkeys(
+            task.depends_on_dependencies +
+            task.depends_on_parameters +
+            task.depends_on_condition +
+            task.depends_on_gathers +
+            task.depends_on_streams,
+        ))
+
+    @staticmethod
+    def ordering(task: ScheduledTask) -> Set[ScheduledTask]:
+        # Tasks listed in `dependencies` whose return value is not consumed.
+        return set(task.depends_on_dependencies).difference(
+            task.depends_on_parameters +
+            task.depends_on_condition +
+            task.depends_on_gathers +
+            task.depends_on_streams,
+        )
+
+    @staticmethod
+    def consumes(task: ScheduledTask) -> Tuple[ScheduledTask, ...]:
+        return tuple(dict.fromkeys(
+            task.depends_on_parameters +
+            task.depends_on_condition,
+        ))
 
     @classmethod
     def depth_first_search(
@@ -74,13 +283,19 @@ class DependencyHandler:
         return False
 
     @classmethod
-    def directed_acyclic_graph(cls, tasks: Tuple[ScheduledTask, ...]) -> bool:
+    def directed_acyclic_graph(
+        cls,
+        tasks: Tuple[ScheduledTask, ...],
+        known: Container[str] = (),
+    ) -> bool:
         graph = {}
         for task in tasks:
             graph[task] = set()
         for task in tasks:
             dependencies = DependencyHandler.depends_on(task)
             for dependency in dependencies:
+                if dependency not in graph and dependency.name in known:
+                    continue
                 if dependency not in graph:
                     return False
                 graph[task].add(dependency)
@@ -1,27 +1,89 @@
 from __future__ import annotations
 
+import os
+import pickle
 from datetime import datetime
 from decimal import Decimal
-from time import time
+from logging import ERROR, INFO, WARNING
+from multiprocessing.reduction import ForkingPickler
+from os import getpid
+from queue import Full
+from sys import platform
+from threading import get_ident
+from time import monotonic, time
 from traceback import format_exc
 from typing import TYPE_CHECKING
 
-from parallelism.config import DECIMAL_PRECISION, DECIMAL_ROUNDING_MODE
+from parallelism.config import (
+    DECIMAL_PRECISION,
+    DECIMAL_ROUNDING_MODE,
+    STREAM_TIMEOUT,
+)
 from parallelism.core.exceptions.dependency_error import DependencyError
+from parallelism.core.exceptions.memory_limit_error import MemoryLimitError
 from parallelism.core.exceptions.resource_error import ResourceError
 from parallelism.core.exceptions.worker_error import WorkerError
+from parallelism.core.pickled_value import PickledValue
 from parallelism.core.raise_exception import RaiseException
-from parallelism.logger import get_logger
+from parallelism.core.task_cancellation import (
+    CURRENT_CANCELLATION,
+    TaskCancellation,
+)
+from parallelism.core.task_submitter import CURRENT_SUBMITTER, TaskSubmitter
+from parallelism.logger import get_logger, initialize_worker_logger
+
+try:
+    from resource import (
+        RLIM_INFINITY,
+        RLIMIT_DATA,
+        RUSAGE_SELF,
+        getrlimit,
+        getrusage,
+        setrlimit,
+    )
+except ImportError:
+    getrusage = None
+    setrlimit = None
 
 if TYPE_CHECKING:
-    from multiprocessing.managers import DictProxy
-    from typing import Any, Callable, Dict, Optional
+    from multiprocessing.managers import DictProxy, ListProxy
+    from multiprocessing.queues import Queue
+    from queue import Queue as StreamQueue
+    from typing import (
+        Any,
+        Callable,
+        Dict,
+        Literal,
+        Optional,
+        Tuple,
+    )
+
+    from parallelism.core.hooks.task_hook import TaskHook
 
 __all__ = ('FunctionHandler',)
 
 
 class FunctionHandler:
-    __slots__ = ('name', 'target', 'proxy')
+    __slots__ = (
+        'name',
+        'target',
+        'proxy',
+        'trace',
+        'hooks',
+        'metrics',
+        'queue',
+        'level',
+        'submissions',
+        'memory',
+        'journal',
+        'streams',
+        'closed',
+        'failures',
+        'affinity',
+        'memory_limit',
+        'requeues',
+        'successor',
+    )
 
     def __init__(
         self,
@@ -29,10 +91,40 @@ class FunctionHandler:
         target: Callable[..., Any],
         proxy: DictProxy,
         blocker: Optional[Dict[str, Any]],
+        trace: bool = False,
+        hooks: Tuple[TaskHook, ...] = (),
+        metrics: bool = False,
+        queue: Optional[Queue] = None,
+        level: Optional[int] = None,
+        submissions: Optional[ListProxy] = None,
+        memory: bool = False,
+        journal: Optional[str] = None,
+        streams: Optional[Tuple[Tuple[str, StreamQueue], ...]] = None,
+        closed: Optional[DictProxy] = None,
+        failures: Optional[ListProxy] = None,
+        affinity: Optional[Tuple[int, ...]] = None,
+        memory_limit: Optional[int] = None,
+        requeues: Optional[ListProxy] = None,
+        successor: Optional[DictProxy] = None,
     ) -> None:
         self.name = name
         self.target = target
         self.proxy = proxy
+        self.trace = trace
+        self.hooks = hooks
+        self.metrics = metrics
+        self.queue = queue
+        self.level = level
+        self.submissions = submissions
+        self.memory = memory
+        self.journal = journal
+        self.streams = streams
+        self.closed = closed
+        self.failures = failures
+        self.affinity = affinity
+        self.memory_limit = memory_limit
+        self.requeues = requeues
+        self.successor = successor
         self.proxy['execution_time'] = datetime.now()
         self.proxy['elapsed_time'] = None
         self.proxy['raise_exception'] = None
@@ -40,34 +132,184 @@ class FunctionHandler:
         self.proxy['finish'] = False
         self.proxy['complete'] = False
         if blocker:
-            self.log_current_state(blocker)
+            self.log_current_state(blocker=blocker)
 
-    def __call__(self, *args: Any, **kwargs: Any) -> None:
+    def __call__(self, *args: Any, **kwargs: Any) -> Tuple[bool, Any]:
+        if self.queue is not None:
+            initialize_worker_logger(queue=self.queue, level=self.level)
+        if self.affinity is not None:
+            self.pin()
+        limits = None
+        if self.memory_limit is not None:
+            limits = self.limit()
+        raise_exception = None
+        return_value = None
+        submitter = None
+        requeued = False
+        if self.submissions is not None:
+            submitter = TaskSubmitter(self.name, self.submissions)
+            token = CURRENT_SUBMITTER.set(submitter)
+        cancellation = CURRENT_CANCELLATION.set(
+            TaskCancellation(self.name, self.proxy),
+        )
+        if self.hooks:
+            states = self.call_hooks('before_call')
+        if self.memory:
+            baseline = self.peak_memory()
         start = time()
+        if self.trace:
+            begin = monotonic()
         try:
-            self.proxy['return_value'] = self.target(*args, **kwargs)
+            if self.streams is None:
+                return_value = self.target(*args, **kwargs)
+            else:
+                return_value = self.stream(*args, **kwargs)
+            if self.metrics:
+                payload = bytes(ForkingPickler.dumps(return_value))
+                self.proxy['return_value'] = PickledValue(payload)
+                self.proxy['result_bytes'] = len(payload)
+            else:
+                self.proxy['return_value'] = return_value
             self.proxy['complete'] = True
         except Exception as exception:
-            self.proxy['raise_exception'] = RaiseException(
+            if limits is not None:
+                setrlimit(RLIMIT_DATA, limits)
+                limits = None
+                if isinstance(exception, MemoryError):
+                    exception = MemoryLimitError(
+                        message='{!r} has exceeded its memory limit'.format(
+                            self.name,
+                        ),
+                        limit=self.memory_limit,
+                    )
+            raise_exception = RaiseException(
                 exception=exception,
                 traceback=format_exc(),
             )
+            self.proxy['raise_exception'] = raise_exception
+            requeued = bool(
+                self.requeues is not None and
+                isinstance(exception, MemoryLimitError)
+            )
+            # Tasks to be requeued are reported by the task scheduler once
+            # they can no longer be requeued.
+            if self.failures is not None and not requeued:
+                self.failures.append(self.name)
         finally:
             end = time()
+            if limits is not None:
+                setrlimit(RLIMIT_DATA, limits)
+            CURRENT_CANCELLATION.reset(cancellation)
+            if self.submissions is not None:
+                CURRENT_SUBMITTER.reset(token)
+            if self.trace:
+                finish = monotonic()
+                self.proxy['trace'] = (getpid(), get_ident(), begin, finish)
+            if self.hooks:
+                self.proxy['profile'] = self.call_hooks('after_call', states)
+            if self.memory:
+                # A forked worker starts with the resident memory of the task
+                # scheduler, so only the growth of the peak is attributed to
+                # the task.
+                peak_memory = self.peak_memory()
+                if peak_memory is not None:
+                    peak_memory -= baseline
+                self.proxy['peak_memory'] = peak_memory
+            # Tasks submitting new tasks or streaming to consumers are not
+            # journaled, so that they do it again when the run is resumed.
+            if (
+                self.journal and
+                self.streams is None and
+                raise_exception is None and not
+                (submitter and submitter.submitted)
+            ):
+                self.proxy['journaled'] = self.write_journal(return_value)
             self.proxy['elapsed_time'] = end - start
-            self.proxy['finish'] = True
-            self.log_current_state()
+            # Tasks to be requeued are left unfinished, so that their
+            # dependents keep waiting for the next execution.
+            if requeued:
+                self.requeues.append(self.name)
+            else:
+                # A fused successor takes over the worker before this task
+                # is seen as finished, so that it is never handed out twice.
+                if self.successor is not None:
+                    self.successor['start'] = True
+                self.proxy['finish'] = True
+            self.log_current_state(
+                elapsed_time=end - start,
+                raise_exception=raise_exception,
+            )
+        return raise_exception is None, return_value
+
+    def pin(self) -> None:
+        try:
+            os.sched_setaffinity(0, self.affinity)
+        except OSError as exception:
+            pattern = '{!r} could not be pinned to cores {} - {!r}'
+            cores = ', '.join(map(str, self.affinity))
+            message = pattern.format(self.name, cores, exception)
+            get_logger().warning(msg=message)
+
+    def limit(self) -> Optional[Tuple[int, int]]:
+        # The data segment covers the heap and private mappings, but not
+        # shared libraries, so the limit is close to the memory the task
+        # may actually consume.
+        if setrlimit is None:
+            return None
+        limits = getrlimit(RLIMIT_DATA)
+        hard = limits[1]
+        limit = self.memory_limit
+        if hard != RLIM_INFINITY:
+            limit = min(limit, hard)
+        try:
+            setrlimit(RLIMIT_DATA, (limit, hard))
+        except (OSError, ValueError) as exception:
+            pattern = '{!r} could not be limited to {!r} bytes - {!r}'
+            message = pattern.format(self.name, limit, exception)
+            get_logger().warning(msg=message)
+            return None
+        return limits
+
+    def call_hooks(
+        self,
+        stage: Literal['before_call', 'after_call'],
+        states: Tuple[Any, ...] = None,
+    ) -> Tuple[Any, ...]:
+        name = self.name
+        results = []
+        for index, hook in enumerate(self.hooks):
+            if states is None:
+                arguments = (name,)
+            else:
+                arguments = (name, states[index])
+            try:
+                results.append(getattr(hook, stage)(*arguments))
+            except Exception as exception:
+                pattern = '{!r} hook {!r} failed at {!r} - {!r}'
+                message = pattern.format(name, hook.label, stage, exception)
+                get_logger().warning(msg=message)
+                results.append(None)
+        return tuple(results)
 
     def log_current_state(
         self,
         blocker: Optional[Dict[str, Any]] = None,
+        elapsed_time: Optional[float] = None,
+        raise_exception: Optional[RaiseException] = None,
     ) -> None:
         logger = get_logger()
         name = self.name
-        elapsed_time = self.proxy.get('elapsed_time')
-        elapsed_time = self.beautify_time(seconds=elapsed_time)
-        raise_exception = self.proxy.get('raise_exception')
-        if blocker and blocker.get('reason') == 'dependency':
+        reason = blocker.get('reason') if blocker else None
+        extra = {'task': name, 'reason': reason, 'elapsed_time': elapsed_time}
+        if reason == 'dependency':
+            exception = DependencyError(
+                message='{!r} has been canceled'.format(name),
+                tasks=blocker.get('tasks'),
+            )
+            self.proxy['raise_exception'] = RaiseException(exception)
+            self.proxy['finish'] = True
+            if not logger.isEnabledFor(WARNING):
+                return
             *left, right = blocker.get('tasks')
             pattern = '{!r} is being canceled, due to '
             if len(left) == 0:
@@ -81,18 +323,25 @@ class FunctionHandler:
                 pattern += 'tasks {}, and {!r}'
                 left = ', '.join(map(repr, left))
                 message = pattern.format(name, left, right)
-            exception = DependencyError(
-                message='{!r} has been canceled'.format(name),
-                tasks=blocker.get('tasks'),
-            )
-            self.proxy['raise_exception'] = RaiseException(exception)
-            self.proxy['finish'] = True
-            logger.warning(msg=message)
-        elif blocker and blocker.get('reason') == 'resource':
+            logger.warning(msg=message, extra=extra)
+        elif reason == 'resource':
             sp = blocker.get('system_processor')
             sm = blocker.get('system_memory')
             gp = blocker.get('graphics_processor')
             gm = blocker.get('graphics_memory')
+            resources = blocker.get('resources')
+            exception = ResourceError(
+                message='{!r} has been canceled'.format(name),
+                system_processor=sp,
+                system_memory=sm,
+                graphics_processor=gp,
+                graphics_memory=gm,
+                resources=resources,
+            )
+            self.proxy['raise_exception'] = RaiseException(exception)
+            self.proxy['finish'] = True
+            if not logger.isEnabledFor(WARNING):
+                return
             pattern = '{!r} is being canceled, due to lack of '
             if sp and sm and gp and gm:
                 pattern += '{!r}% CPU, {!r}% RAM, {!r}% GPU, and {!r}% VRAM'
@@ -142,19 +391,29 @@ class FunctionHandler:
             else:
                 pattern += 'resources (CPU / RAM / GPU / VRAM)'
                 message = pattern.format(name)
-            exception = ResourceError(
+            if resources:
+                amounts = ', '.join(
+                    '{!r} {!r}'.format(amount, resource)
+                    for resource, amount in resources.items()
+                )
+                if sp or sm or gp or gm:
+                    message += ', and also {}'.format(amounts)
+                else:
+                    pattern = '{!r} is being canceled, due to lack of {}'
+                    message = pattern.format(name, amounts)
+            logger.warning(msg=message, extra=extra)
+        elif reason == 'worker':
+            processes = blocker.get('processes')
+            threads = blocker.get('threads')
+            exception = WorkerError(
                 message='{!r} has been canceled'.format(name),
-                system_processor=sp,
-                system_memory=sm,
-                graphics_processor=gp,
-                graphics_memory=gm,
+                processes=processes,
+                threads=threads,
             )
             self.proxy['raise_exception'] = RaiseException(exception)
             self.proxy['finish'] = True
-            logger.warning(msg=message)
-        elif blocker and blocker.get('reason') == 'worker':
-            processes = blocker.get('processes')
-            threads = blocker.get('threads')
+            if not logger.isEnabledFor(WARNING):
+                return
             pattern = '{!r} is being canceled, due to '
             if processes > 1 and threads > 1:
                 pattern += 'lack of {!r} processes and also {!r} threads'
@@ -183,22 +442,82 @@ class FunctionHandler:
             else:
                 pattern += 'lack of workers'
                 message = pattern.format(name)
-            exception = WorkerError(
-                message='{!r} has been canceled'.format(name),
-                processes=processes,
-                threads=threads,
-            )
-            self.proxy['raise_exception'] = RaiseException(exception)
-            self.proxy['finish'] = True
-            logger.warning(msg=message)
+            logger.warning(msg=message, extra=extra)
         elif isinstance(raise_exception, RaiseException):
+            if not logger.isEnabledFor(ERROR):
+                return
+            elapsed_time = self.beautify_time(seconds=elapsed_time)
             pattern = '{!r} ran approximately {} - {!r}'
             message = pattern.format(name, elapsed_time, raise_exception)
-            logger.error(msg=message)
-        else:
+            logger.error(msg=message, extra=extra)
+        elif logger.isEnabledFor(INFO):
+            elapsed_time = self.beautify_time(seconds=elapsed_time)
             pattern = '{!r} ran approximately {}'
             message = pattern.format(name, elapsed_time)
-            logger.info(msg=message)
+            logger.info(msg=message, extra=extra)
+
+    def stream(self, *args: Any, **kwargs: Any) -> Any:
+        writers = list(self.streams)
+        message = ('end', None)
+        try:
+            iterator = iter(self.target(*args, **kwargs))
+            while writers:
+                try:
+                    item = next(iterator)
+                except StopIteration as stop:
+                    return stop.value
+                writers = [
+                    writer for writer in writers
+                    if self.write(writer, ('item', item))
+                ]
+            # Every consumer has finished or has been canceled.
+            close = getattr(iterator, 'close', None)
+            if close is not None:
+                close()
+            return None
+        except BaseException:
+            message = ('error', None)
+            raise
+        finally:
+            for writer in writers:
+                self.write(writer, message)
+
+    def write(
+        self,
+        writer: Tuple[str, StreamQueue],
+        message: Tuple[str, Any],
+    ) -> bool:
+        consumer, queue = writer
+        while True:
+            try:
+                queue.put(message, timeout=STREAM_TIMEOUT)
+                return True
+            except Full:
+                if self.closed.get((self.name, consumer)):
+                    return False
+
+    def write_journal(self, return_value: Any) -> bool:
+        temporary = f'{self.journal}.tmp'
+        try:
+            with open(temporary, 'wb') as file:
+                pickle.dump(return_value, file, pickle.HIGHEST_PROTOCOL)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temporary, self.journal)
+        except Exception as exception:
+            pattern = '{!r} could not be journaled - {!r}'
+            get_logger().warning(msg=pattern.format(self.name, exception))
+            return False
+        return True
+
+    @staticmethod
+    def peak_memory() -> Optional[int]:
+        if getrusage is None:
+            return None
+        peak_memory = getrusage(RUSAGE_SELF).ru_maxrss
+        # The peak resident set size is reported in bytes on macOS and in
+        # kilobytes elsewhere.
+        return peak_memory if platform == 'darwin' else peak_memory * 1024
 
     @staticmethod
     def beautify_time(
@@ -214,11 +533,11 @@ class FunctionHandler:
         if seconds < 1e-6:
             value *= Decimal(value=1e+9)
             unit = 'nanosecond'
-        elif seconds < 1e-4:
+        elif seconds < 1e-3:
             value *= Decimal(value=1e+6)
             unit = 'microsecond'
         elif seconds < 1:
-            value *= Decimal(value=1e+4)
+            value *= Decimal(value=1e+3)
             unit = 'millisecond'
         elif seconds < 60:
             unit = 'second'
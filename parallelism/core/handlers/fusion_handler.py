@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from parallelism.core.handlers.dependency_handler import DependencyHandler
+
+if TYPE_CHECKING:
+    from typing import Dict, Iterable, List, Set, Tuple
+
+    from parallelism.core.scheduled_task import ScheduledTask
+    from parallelism.core.task_state import TaskState
+
+__all__ = ('FusionHandler',)
+
+
+class FusionHandler:
+    DEMANDS = (
+        'executor',
+        'processes',
+        'threads',
+        'cpus',
+        'system_processor',
+        'system_memory',
+        'graphics_processor',
+        'graphics_memory',
+        'resources',
+    )
+
+    __slots__ = ('enabled', 'chains', 'heads')
+
+    def __init__(
+        self,
+        tasks: Iterable[ScheduledTask],
+        states: Dict[str, TaskState],
+        enabled: bool,
+    ) -> None:
+        self.enabled = enabled
+        self.chains = {}
+        self.heads = {}
+        if enabled:
+            self.fuse(tuple(tasks), states)
+
+    def fuse(
+        self,
+        tasks: Tuple[ScheduledTask, ...],
+        states: Dict[str, TaskState],
+    ) -> None:
+        dependents: Dict[str, List[ScheduledTask]] = {
+            task.name: [] for task in tasks
+        }
+        producers: Set[str] = set()
+        for task in tasks:
+            for dependency in DependencyHandler.depends_on(task):
+                dependents[dependency.name].append(task)
+            producers.update(
+                producer.name for producer in task.depends_on_streams
+            )
+        successors = {}
+        for task in tasks:
+            following = dependents[task.name]
+            if len(following) != 1:
+                continue
+            successor = following[0]
+            if (
+                DependencyHandler.depends_on(successor) == (task,) and
+                successor.depends_on_parameters == (task,) and
+                successor.condition is None and not
+                successor.depends_on_gathers and not
+                states[task.name].initialized and not
+                states[successor.name].initialized and not
+                {task.name, successor.name} & producers and
+                self.compatible(task, successor)
+            ):
+                successors[task.name] = successor
+        members = {successor.name for successor in successors.values()}
+        for task in tasks:
+            if task.name in members or task.name not in successors:
+                continue
+            chain = [task]
+            while chain[-1].name in successors:
+                chain.append(successors[chain[-1].name])
+            self.chains[task.name] = tuple(chain)
+            for member in chain[1:]:
+                self.heads[member.name] = task.name
+
+    @classmethod
+    def compatible(cls, task: ScheduledTask, successor: ScheduledTask) -> bool:
+        # Fused tasks hold the same worker and resources one after another,
+        # so only tasks declaring the same demands are fused, and tasks that
+        # may be raced by speculative copies are left alone.
+        return not (task.idempotent or successor.idempotent) and all(
+            getattr(task, demand) == getattr(successor, demand)
+            for demand in cls.DEMANDS
+        )
+
+    def members(self, task: ScheduledTask) -> Tuple[ScheduledTask, ...]:
+        return self.chains.get(task.name, (task,))[1:]
@@ -0,0 +1,287 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from queue import Full
+from typing import TYPE_CHECKING
+
+from parallelism.config import STREAM_BUFFER
+from parallelism.core.gather_value import GatherValue
+from parallelism.core.return_value import ReturnValue
+from parallelism.core.stream_reader import StreamReader
+from parallelism.logger import get_logger
+
+if TYPE_CHECKING:
+    from multiprocessing.managers import SyncManager
+    from typing import Any, Dict, Iterable, Optional, Tuple
+
+    from parallelism.core.scheduled_task import ScheduledTask
+    from parallelism.core.task_state import TaskState
+
+__all__ = ('GatherHandler',)
+
+
+class GatherHandler:
+    __slots__ = (
+        'states',
+        'manager',
+        'gathers',
+        'indices',
+        'buffers',
+        'positions',
+        'values',
+        'pulled',
+        'futures',
+        'queues',
+        'errors',
+        'retained',
+        'reducer',
+        'closed',
+    )
+
+    def __init__(
+        self,
+        tasks: Iterable[ScheduledTask],
+        states: Dict[str, TaskState],
+        manager: SyncManager,
+    ) -> None:
+        self.states = states
+        self.manager = manager
+        self.gathers = {}
+        self.indices = {}
+        self.buffers = {}
+        self.positions = {}
+        self.values = {}
+        self.pulled = {}
+        self.futures = {}
+        self.queues = {}
+        self.errors = {}
+        self.retained = set()
+        self.reducer = None
+        self.closed = False
+        self.extend(tasks)
+
+    @staticmethod
+    def references(task: ScheduledTask) -> Tuple[GatherValue, ...]:
+        # `isinstance` falls back to `__class__`, which a return value would
+        # record as another transformation. A gather passed more than once
+        # to the same task is gathered once.
+        return tuple(dict.fromkeys(
+            value for value in (*task.args, *task.kwargs.values())
+            if (
+                not isinstance(value, ReturnValue) and
+                isinstance(value, GatherValue)
+            )
+        ))
+
+    def extend(self, tasks: Iterable[ScheduledTask]) -> None:
+        # Gathers are tracked per gathering task, so that the same gather
+        # may be passed to several tasks.
+        for task in tasks:
+            for gather in self.references(task):
+                key = (task.name, gather)
+                indices = {}
+                for index, gathered in enumerate(gather.tasks):
+                    indices.setdefault(gathered.name, []).append(index)
+                for name in indices:
+                    self.gathers.setdefault(name, []).append(key)
+                    self.retained.add(name)
+                self.indices[key] = indices
+                self.buffers[key] = {}
+                self.positions[key] = 0
+                self.pulled[key] = set()
+                if gather.reduce is None:
+                    self.queues[key] = self.manager.Queue(STREAM_BUFFER)
+                else:
+                    self.values[key] = gather.initial
+
+    def collect(self, state: TaskState) -> None:
+        # Return values are pulled as soon as their task finishes, so the
+        # gathering task never fetches them one by one, and reductions
+        # advance while the other tasks are running. The gathered tasks are
+        # retained until then, since they could finish after this check and
+        # be released before the next one.
+        name = state.task.name
+        if name not in self.retained or not state.finished:
+            return
+        self.retained.discard(name)
+        complete = not state.released and state.finished_with('complete')
+        keys = [
+            key for key in self.gathers[name]
+            if key in self.indices and name not in self.pulled[key]
+        ]
+        if not keys:
+            return
+        return_value = state.proxy.get('return_value') if complete else None
+        for key in keys:
+            _, gather = key
+            self.pulled[key].add(name)
+            # Reductions are canceled along with their gathering task when
+            # a gathered task does not complete, streams carry the failure.
+            if not complete and gather.reduce is not None:
+                continue
+            message = ('item', return_value) if complete else ('error', name)
+            for index in self.indices[key][name]:
+                self.buffers[key][index] = message
+            self.advance(key)
+
+    def advance(self, key: Tuple[str, GatherValue]) -> bool:
+        # Return values are passed on in the order of the gathered tasks, so
+        # the combiner only has to be associative, and the ones completing
+        # early are buffered until the values before them are passed on.
+        # Returns whether a full stream is holding values back.
+        _, gather = key
+        buffer = self.buffers[key]
+        position = self.positions[key]
+        stalled = False
+        if gather.reduce is None:
+            queue = self.queues[key]
+            while position in buffer:
+                try:
+                    queue.put_nowait(buffer[position])
+                except Full:
+                    stalled = True
+                    break
+                kind, _ = buffer.pop(position)
+                position += 1
+                if kind == 'error':
+                    self.finish(key)
+                    return False
+            if position == len(gather.tasks) and not stalled:
+                try:
+                    queue.put_nowait(('end', None))
+                except Full:
+                    stalled = True
+                else:
+                    self.finish(key)
+                    return False
+        else:
+            if self.reducer is None:
+                self.reducer = ThreadPoolExecutor(max_workers=1)
+            # A single worker combines the values in the order they are
+            # submitted, away from the loop dispatching the tasks.
+            while position in buffer:
+                _, return_value = buffer.pop(position)
+                self.futures[key] = self.reducer.submit(
+                    self.combine,
+                    key,
+                    position,
+                    return_value,
+                )
+                position += 1
+        self.positions[key] = position
+        return stalled
+
+    def combine(
+        self,
+        key: Tuple[str, GatherValue],
+        position: int,
+        return_value: Any,
+    ) -> None:
+        consumer, gather = key
+        if self.closed or consumer in self.errors or key not in self.values:
+            return
+        if not self.values[key]:
+            self.values[key] = (return_value,)
+            return
+        try:
+            self.values[key] = (
+                gather.reduce(self.values[key][0], return_value),
+            )
+        except Exception as exception:
+            name = gather.tasks[position].name
+            self.errors[consumer] = name
+            pattern = 'Reducing the return value of {!r} for {!r} raised {!r}'
+            get_logger().error(msg=pattern.format(name, consumer, exception))
+
+    def update(self) -> None:
+        # Streams are fed as their gathering task reads them. A gathering
+        # task that finished without reading its whole stream is only looked
+        # for once the stream is full.
+        for key in tuple(self.queues):
+            consumer, gather = key
+            if key not in self.positions or not (
+                self.buffers[key] or
+                self.positions[key] == len(gather.tasks)
+            ):
+                continue
+            if self.advance(key) and self.states[consumer].finished:
+                self.release(key)
+
+    def throttled(self, task: ScheduledTask) -> bool:
+        # Gathered tasks only run within a window past the last value read
+        # from the stream, so that it never holds more than a few buffers of
+        # return values, and the next value to be read is never held back.
+        for key in self.gathers.get(task.name, ()):
+            if key not in self.queues or key not in self.positions:
+                continue
+            if (
+                self.indices[key][task.name][0] >=
+                self.positions[key] + STREAM_BUFFER
+            ):
+                return True
+        return False
+
+    def awaited(self, task: ScheduledTask) -> bool:
+        # A gathering task reading its stream holds a worker while it waits
+        # for the next value, so the task producing that value may run
+        # without one, or neither of them would ever finish.
+        for key in self.gathers.get(task.name, ()):
+            if key not in self.queues or key not in self.positions:
+                continue
+            consumer, _ = key
+            if (
+                self.positions[key] in self.indices[key][task.name] and
+                self.states[consumer].active
+            ):
+                return True
+        return False
+
+    def reducing(self, task: ScheduledTask) -> bool:
+        for gather in self.references(task):
+            for gathered in gather.tasks:
+                self.collect(self.states[gathered.name])
+            future = self.futures.get((task.name, gather))
+            if future is not None and not future.done():
+                return True
+        return False
+
+    def failed(self, task: ScheduledTask) -> Optional[str]:
+        return self.errors.get(task.name)
+
+    def resolve(self, task: ScheduledTask) -> Dict[GatherValue, Any]:
+        gathers = {}
+        for gather in self.references(task):
+            key = (task.name, gather)
+            if gather.reduce is None:
+                gathers[gather] = StreamReader(
+                    name=gather.tasks[0].name,
+                    queue=self.queues[key],
+                )
+                continue
+            gathers[gather] = self.values[key][0]
+            self.release(key)
+        return gathers
+
+    def finish(self, key: Tuple[str, GatherValue]) -> None:
+        # The stream of a gather is kept until its gathering task finishes,
+        # which may start after the last value has been written.
+        self.indices.pop(key, None)
+        self.buffers.pop(key, None)
+        self.positions.pop(key, None)
+        self.pulled.pop(key, None)
+
+    def release(self, key: Tuple[str, GatherValue]) -> None:
+        self.finish(key)
+        self.values.pop(key, None)
+        self.futures.pop(key, None)
+        self.queues.pop(key, None)
+
+    def close(self, task: ScheduledTask) -> None:
+        for gather in self.references(task):
+            self.release((task.name, gather))
+
+    def shutdown(self) -> None:
+        # Reductions of gathering tasks that will not run are not finished.
+        self.closed = True
+        if self.reducer is not None:
+            self.reducer.shutdown(wait=True)
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from multiprocessing.managers import DictProxy
+    from typing import Iterable, List, Optional, Tuple, Union
+
+    from parallelism.core.runtime_history import RuntimeHistory
+    from parallelism.core.scheduled_task import ScheduledTask
+
+__all__ = ('HistoryHandler',)
+
+
+class HistoryHandler:
+    __slots__ = ('proxy', 'history', 'enabled', 'estimates', 'records')
+
+    def __init__(
+        self,
+        tasks: Iterable[ScheduledTask],
+        proxy: DictProxy,
+        history: Optional[RuntimeHistory],
+    ) -> None:
+        self.proxy = proxy
+        self.history = history
+        self.enabled = history is not None
+        self.estimates = history.estimates(tasks) if self.enabled else {}
+        self.records = []
+
+    def expected_time(self, task: ScheduledTask) -> float:
+        estimate = self.estimates.get(task.name)
+        if estimate is None or estimate.elapsed_time is None:
+            return 0.0
+        return estimate.elapsed_time
+
+    def key(self, task: ScheduledTask) -> Tuple[Union[int, float], ...]:
+        # Within the same priority, the longest expected tasks start first,
+        # so they do not end up alone at the tail of the run.
+        if not self.enabled:
+            return (task.priority,)
+        return task.priority, -self.expected_time(task)
+
+    def order(self, tasks: List[ScheduledTask]) -> None:
+        if self.enabled:
+            tasks.sort(key=self.key)
+
+    def submitted(self, tasks: Iterable[ScheduledTask]) -> None:
+        if self.enabled:
+            self.estimates.update(self.history.estimates(tasks))
+
+    def collected(
+        self,
+        task: ScheduledTask,
+        elapsed_time: Optional[float],
+        failed: bool,
+    ) -> None:
+        if not self.enabled:
+            return
+        if elapsed_time is None:
+            outcome = 'canceled'
+        elif failed:
+            outcome = 'failed'
+        else:
+            outcome = 'completed'
+        self.records.append((
+            task.name,
+            self.history.fingerprint(task),
+            outcome,
+            elapsed_time,
+            self.proxy.get(task.name).get('peak_memory'),
+        ))
+
+    def result(self) -> None:
+        if self.enabled:
+            self.history.record(self.records)
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from parallelism.core.profile_report import ProfileReport
+
+if TYPE_CHECKING:
+    from multiprocessing.managers import DictProxy
+    from typing import Any, Dict, Tuple
+
+    from parallelism.core.hooks.task_hook import TaskHook
+    from parallelism.core.scheduled_task import ScheduledTask
+
+__all__ = ('HookHandler',)
+
+
+class HookHandler:
+    __slots__ = (
+        'hooks',
+        'proxy',
+        'dispatch_hooks',
+        'call_hooks',
+        'collect_hooks',
+        'profiles',
+    )
+
+    def __init__(self, hooks: Tuple[TaskHook, ...], proxy: DictProxy) -> None:
+        self.hooks = hooks
+        self.proxy = proxy
+        self.dispatch_hooks = tuple(
+            hook for hook in hooks
+            if hook.overrides('before_dispatch')
+        )
+        self.call_hooks = tuple(
+            hook for hook in hooks
+            if hook.overrides('before_call') or hook.overrides('after_call')
+        )
+        self.collect_hooks = tuple(
+            hook for hook in hooks
+            if hook in self.call_hooks or hook.overrides('on_result_collected')
+        )
+        self.profiles = {hook: {} for hook in hooks}
+
+    def before_dispatch(self, task: ScheduledTask) -> None:
+        for hook in self.dispatch_hooks:
+            hook.before_dispatch(task.name)
+
+    def collected(self, task: ScheduledTask) -> None:
+        if not self.collect_hooks:
+            return
+        proxy = self.proxy.get(task.name)
+        profiles = {}
+        if 'profile' in proxy:
+            profiles = dict(zip(self.call_hooks, proxy.get('profile')))
+            del self.proxy[task.name]['profile']
+        for hook in self.collect_hooks:
+            profile = hook.on_result_collected(task.name, profiles.get(hook))
+            if profile is not None:
+                self.profiles[hook][task.name] = profile
+
+    def result(self, order: Dict[str, Any]) -> Dict[str, ProfileReport]:
+        report = {}
+        for hook, profiles in self.profiles.items():
+            profiles = dict(
+                sorted(
+                    profiles.items(),
+                    key=lambda item: order.get(item[0]),
+                ),
+            )
+            report[hook.label] = ProfileReport(
+                tasks=profiles,
+                merged=hook.report(profiles),
+            )
+        return report
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import pickle
+from functools import partial
+from threading import Lock
+from traceback import format_exc
+from typing import TYPE_CHECKING
+
+from parallelism.core.executors.interpreter_executor import (
+    InterpreterExecutor,
+    interpreters,
+)
+
+if TYPE_CHECKING:
+    from typing import Any, Callable
+
+    from parallelism.core.scheduled_task import ScheduledTask
+
+__all__ = ('InterpreterHandler',)
+
+
+def execute(payload: bytes) -> bytes:
+    # Runs inside the subinterpreter. Only bytes cross the interpreter
+    # boundary, as they are shareable without copying through a manager.
+    target, args, kwargs = pickle.loads(payload)
+    try:
+        result = ('complete', target(*args, **kwargs))
+    except Exception as exception:
+        exception.add_note(format_exc())
+        result = ('error', exception)
+    return pickle.dumps(result, pickle.HIGHEST_PROTOCOL)
+
+
+class InterpreterHandler:
+    __slots__ = ('idle', 'lock')
+
+    def __init__(self) -> None:
+        self.idle = []
+        self.lock = Lock()
+
+    def target(self, task: ScheduledTask) -> Callable[..., Any]:
+        if task.executor is not InterpreterExecutor:
+            return task.target
+        return partial(self.call, task.target)
+
+    def call(
+        self,
+        target: Callable[..., Any],
+        *args: Any,
+        **kwargs: Any,
+    ) -> Any:
+        payload = pickle.dumps((target, args, kwargs), pickle.HIGHEST_PROTOCOL)
+        with self.lock:
+            interpreter = self.idle.pop() if self.idle else None
+        if interpreter is None:
+            interpreter = interpreters.create()
+        try:
+            status, value = pickle.loads(interpreter.call(execute, payload))
+        except BaseException:
+            # An interpreter failing outside of the target is not reused.
+            interpreter.close()
+            raise
+        with self.lock:
+            self.idle.append(interpreter)
+        if status == 'error':
+            raise value
+        return value
+
+    def close(self) -> None:
+        with self.lock:
+            idle, self.idle = self.idle, []
+        for interpreter in idle:
+            interpreter.close()
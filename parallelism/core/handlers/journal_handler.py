@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import json
+import os
+import pickle
+from datetime import datetime
+from hashlib import sha1
+from typing import TYPE_CHECKING
+
+from parallelism.core.handlers.deduplication_handler import (
+    DeduplicationHandler,
+)
+from parallelism.core.handlers.dependency_handler import DependencyHandler
+from parallelism.core.runtime_history import RuntimeHistory
+from parallelism.logger import get_logger
+
+if TYPE_CHECKING:
+    from multiprocessing.managers import DictProxy
+    from typing import Any, Dict, Optional
+
+    from parallelism.core.scheduled_task import ScheduledTask
+    from parallelism.core.task_state import TaskState
+
+__all__ = ('JournalHandler',)
+
+
+class JournalHandler:
+    INDEX = 'index.jsonl'
+
+    __slots__ = (
+        'path',
+        'proxy',
+        'enabled',
+        'entries',
+        'restored',
+        'recorded',
+        'fingerprints',
+        'index',
+    )
+
+    def __init__(self, path: Optional[str], proxy: DictProxy) -> None:
+        self.path = path
+        self.proxy = proxy
+        self.enabled = path is not None
+        self.entries = {}
+        self.restored = set()
+        self.recorded = set()
+        self.fingerprints = {}
+        self.index = None
+        if self.enabled:
+            os.makedirs(path, exist_ok=True)
+            self.entries = self.read()
+            self.index = open(
+                os.path.join(path, self.INDEX),
+                mode='a',
+                encoding='utf-8',
+            )
+
+    def read(self) -> Dict[str, Dict[str, Any]]:
+        entries = {}
+        try:
+            with open(
+                os.path.join(self.path, self.INDEX),
+                encoding='utf-8',
+            ) as file:
+                for line in file:
+                    # The last line may be incomplete if the scheduler died
+                    # while appending it.
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    if os.path.isfile(os.path.join(self.path, entry['file'])):
+                        entries[entry['name']] = entry
+        except FileNotFoundError:
+            pass
+        return entries
+
+    def filename(self, task: ScheduledTask) -> Optional[str]:
+        if not self.enabled:
+            return None
+        name = sha1(task.name.encode()).hexdigest()
+        return os.path.join(self.path, f'{name}.pickle')
+
+    def fingerprint(self, task: ScheduledTask) -> str:
+        # Tasks are fingerprinted after their dependencies, whose
+        # fingerprints are part of theirs, so that a changed task also
+        # executes again everything depending on it.
+        stack = [task]
+        while stack:
+            node = stack[-1]
+            if node.name in self.fingerprints:
+                stack.pop()
+                continue
+            pending = [
+                dependency
+                for dependency in DependencyHandler.depends_on(node)
+                if dependency.name not in self.fingerprints
+            ]
+            if pending:
+                stack.extend(pending)
+                continue
+            stack.pop()
+            self.fingerprints[node.name] = self.digest(node)
+        return self.fingerprints[task.name]
+
+    def digest(self, task: ScheduledTask) -> str:
+        # Return values are only restored for the same executor, target and
+        # arguments, so that a changed task graph does not silently reuse
+        # stale results. Arguments that can not be pickled are compared by
+        # their representation, which at worst executes the task again.
+        digest = sha1(RuntimeHistory.fingerprint(task).encode())
+        digest.update(task.reformat_executor.encode())
+        for dependency in DependencyHandler.depends_on(task):
+            digest.update(self.fingerprints[dependency.name].encode())
+        try:
+            arguments = (
+                tuple(map(DeduplicationHandler.reference, task.args)),
+                tuple(sorted(
+                    (key, DeduplicationHandler.reference(value))
+                    for key, value in task.kwargs.items()
+                )),
+            )
+            digest.update(pickle.dumps(arguments, pickle.HIGHEST_PROTOCOL))
+        except Exception:
+            digest.update(repr((task.args, task.kwargs)).encode())
+        return digest.hexdigest()
+
+    def restore(self, task: ScheduledTask) -> Optional[Dict[str, Any]]:
+        entry = self.entries.get(task.name)
+        if entry is None or entry.get('fingerprint') != self.fingerprint(task):
+            return None
+        try:
+            with open(os.path.join(self.path, entry['file']), 'rb') as file:
+                return_value = pickle.load(file)
+        except Exception as exception:
+            pattern = '{!r} could not be restored from the journal - {!r}'
+            get_logger().warning(msg=pattern.format(task.name, exception))
+            return None
+        self.restored.add(task.name)
+        return {
+            'execution_time': datetime.fromisoformat(entry['execution_time']),
+            'elapsed_time': entry['elapsed_time'],
+            'raise_exception': None,
+            'return_value': return_value,
+            'start': True,
+            'finish': True,
+            'complete': True,
+        }
+
+    def finished(self, state: TaskState) -> None:
+        # Entries are appended as soon as their task finishes, rather than
+        # once its return value is released, which waits for all of its
+        # consumers to be initialized.
+        task = state.task
+        if (
+            not self.enabled or
+            state.released or
+            task.name in self.recorded or
+            task.name in self.restored
+        ):
+            return
+        proxy = state.proxy
+        if not proxy.get('finish'):
+            return
+        self.collected(
+            task,
+            execution_time=proxy.get('execution_time'),
+            elapsed_time=proxy.get('elapsed_time'),
+            failed=proxy.get('raise_exception') is not None,
+        )
+
+    def collected(
+        self,
+        task: ScheduledTask,
+        execution_time: Optional[datetime],
+        elapsed_time: Optional[float],
+        failed: bool,
+    ) -> None:
+        if (
+            not self.enabled or
+            task.name in self.recorded or
+            task.name in self.restored
+        ):
+            return
+        self.recorded.add(task.name)
+        if failed or not self.proxy.get(task.name).get('journaled'):
+            return
+        entry = {
+            'name': task.name,
+            'file': os.path.basename(self.filename(task)),
+            'fingerprint': self.fingerprint(task),
+            'execution_time': execution_time.isoformat(),
+            'elapsed_time': elapsed_time,
+        }
+        self.index.write(json.dumps(entry) + '\n')
+        self.index.flush()
+        os.fsync(self.index.fileno())
+
+    def close(self) -> None:
+        if self.index is not None:
+            self.index.close()
+            self.index = None
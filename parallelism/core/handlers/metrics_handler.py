@@ -0,0 +1,330 @@
+from __future__ import annotations
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from multiprocessing import Process
+from threading import Thread
+from time import monotonic
+from typing import TYPE_CHECKING
+
+from parallelism.config import METRICS_BUCKETS, METRICS_HOST, METRICS_INTERVAL
+from parallelism.core.handlers.dependency_handler import DependencyHandler
+from parallelism.core.metrics_registry import MetricsRegistry
+from parallelism.logger import get_logger
+
+if TYPE_CHECKING:
+    from multiprocessing.managers import DictProxy
+    from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+    from parallelism.core.scheduled_task import ScheduledTask
+
+__all__ = ('MetricsHandler',)
+
+
+class MetricsRequestHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        body = self.server.registry.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+class MetricsHandler:
+    __slots__ = (
+        'tasks',
+        'proxy',
+        'metrics',
+        'processes',
+        'threads',
+        'resources',
+        'pools',
+        'enabled',
+        'registry',
+        'server',
+        'submissions',
+        'updated',
+        'dependencies',
+        'dispatching',
+        'running',
+        'finished',
+        'failed',
+        'skipped_tasks',
+    )
+
+    def __init__(
+        self,
+        tasks: List[ScheduledTask],
+        proxy: DictProxy,
+        metrics: Optional[Union[int, Callable[[str], Any]]],
+        processes: int,
+        threads: int,
+        resources: Dict[str, Union[int, float]],
+        pools: Dict[str, Union[int, float]] = None,
+    ) -> None:
+        self.tasks = tasks
+        self.proxy = proxy
+        self.metrics = metrics
+        self.processes = processes
+        self.threads = threads
+        self.resources = resources
+        self.pools = pools or {}
+        self.enabled = metrics is not None
+        self.registry = MetricsRegistry()
+        self.server = None
+        self.submissions = {}
+        self.updated = None
+        self.dependencies = {}
+        self.dispatching = {}
+        self.running = {}
+        self.finished = set()
+        self.failed = set()
+        self.skipped_tasks = set()
+
+    def start(self) -> None:
+        if not self.enabled:
+            return
+        registry = self.registry
+        registry.describe(
+            'parallelism_tasks',
+            'gauge',
+            'Number of tasks by state.',
+        )
+        registry.describe(
+            'parallelism_workers_active',
+            'gauge',
+            'Number of processes and threads held by running tasks.',
+        )
+        registry.describe(
+            'parallelism_workers_limit',
+            'gauge',
+            'Number of processes and threads available to the scheduler.',
+        )
+        registry.describe(
+            'parallelism_resource_usage_percent',
+            'gauge',
+            'Declared resource usage of running tasks.',
+        )
+        registry.describe(
+            'parallelism_resource_limit_percent',
+            'gauge',
+            'Resource limits of the scheduler.',
+        )
+        registry.describe(
+            'parallelism_resource_pool_usage',
+            'gauge',
+            'Declared usage of named resources by running tasks.',
+        )
+        registry.describe(
+            'parallelism_resource_pool_limit',
+            'gauge',
+            'Capacities of named resources.',
+        )
+        registry.describe(
+            'parallelism_dispatch_latency_seconds',
+            'histogram',
+            'Time spent starting the executor of a task.',
+            METRICS_BUCKETS,
+        )
+        registry.describe(
+            'parallelism_queue_wait_seconds',
+            'histogram',
+            'Time from submission until a task was dispatched.',
+            METRICS_BUCKETS,
+        )
+        registry.describe(
+            'parallelism_result_bytes_total',
+            'counter',
+            'Pickled size of the return values sent by tasks.',
+        )
+        registry.set('parallelism_result_bytes_total', 0)
+        registry.set(
+            'parallelism_workers_limit',
+            self.processes,
+            kind='process',
+        )
+        registry.set('parallelism_workers_limit', self.threads, kind='thread')
+        for resource, limit in self.resources.items():
+            registry.set(
+                'parallelism_resource_limit_percent',
+                limit,
+                resource=resource,
+            )
+        for pool, limit in self.pools.items():
+            registry.set('parallelism_resource_pool_limit', limit, pool=pool)
+        self.submitted(self.tasks)
+        if not callable(self.metrics):
+            try:
+                self.server = ThreadingHTTPServer(
+                    (METRICS_HOST, self.metrics),
+                    MetricsRequestHandler,
+                )
+            except OSError as exception:
+                pattern = (
+                    'Metrics could not be served on port {!r}, they are '
+                    'disabled - {!r}'
+                )
+                get_logger().warning(msg=pattern.format(
+                    self.metrics,
+                    exception,
+                ))
+                self.enabled = False
+                return
+            self.server.daemon_threads = True
+            self.server.registry = registry
+            Thread(target=self.server.serve_forever, daemon=True).start()
+            host, port = self.server.server_address[:2]
+            message = 'Serving metrics on http://{}:{}/metrics'
+            get_logger().info(msg=message.format(host, port))
+        self.update(force=True)
+
+    def submitted(self, tasks: Iterable[ScheduledTask]) -> None:
+        if not self.enabled:
+            return
+        submitted = monotonic()
+        for task in tasks:
+            self.submissions[task.name] = submitted
+            self.dependencies[task.name] = tuple(
+                dependency.name
+                for dependency in DependencyHandler.depends_on(task)
+            )
+
+    def dispatched(self, task: ScheduledTask) -> None:
+        if not self.enabled:
+            return
+        self.dispatching[task.name] = monotonic()
+
+    def started(self, task: ScheduledTask) -> None:
+        if not self.enabled:
+            return
+        dispatched = self.dispatching.pop(task.name)
+        self.running[task.name] = task
+        self.registry.observe(
+            'parallelism_dispatch_latency_seconds',
+            monotonic() - dispatched,
+        )
+        self.registry.observe(
+            'parallelism_queue_wait_seconds',
+            dispatched - self.submissions.pop(task.name, dispatched),
+        )
+
+    def restored(self, task: ScheduledTask) -> None:
+        if not self.enabled:
+            return
+        self.finished.add(task.name)
+
+    def canceled(self, task: ScheduledTask) -> None:
+        if not self.enabled:
+            return
+        self.failed.add(task.name)
+
+    def skipped(self, task: ScheduledTask) -> None:
+        if not self.enabled:
+            return
+        self.skipped_tasks.add(task.name)
+
+    def collected(self, task: ScheduledTask, failed: bool) -> None:
+        if not self.enabled or task.name not in self.running:
+            return
+        self.resolve(task.name, failed)
+
+    def fused(self, task: ScheduledTask, failed: bool) -> None:
+        # Fused tasks run in the worker of the head of their chain, so they
+        # are only seen once they are collected.
+        if not self.enabled:
+            return
+        self.resolve(task.name, failed)
+
+    def resolve(self, name: str, failed: bool) -> None:
+        self.running.pop(name, None)
+        if failed:
+            self.failed.add(name)
+        else:
+            self.finished.add(name)
+        result_bytes = self.proxy.get(name).get('result_bytes')
+        if result_bytes:
+            self.registry.increment(
+                'parallelism_result_bytes_total',
+                result_bytes,
+            )
+
+    def update(self, force: bool = False) -> None:
+        if not self.enabled:
+            return
+        now = monotonic()
+        if not force and now - self.updated < METRICS_INTERVAL:
+            return
+        self.updated = now
+        for name in tuple(self.running):
+            proxy = self.proxy.get(name)
+            if proxy.get('finish'):
+                failed = proxy.get('raise_exception') is not None
+                self.resolve(name, failed)
+        pending = 0
+        ready = 0
+        for task in self.tasks:
+            name = task.name
+            if (
+                name in self.running or
+                name in self.finished or
+                name in self.failed or
+                name in self.skipped_tasks
+            ):
+                continue
+            if all(
+                dependency in self.finished
+                for dependency in self.dependencies.get(name)
+            ):
+                ready += 1
+            else:
+                pending += 1
+        states = {
+            'pending': pending,
+            'ready': ready,
+            'running': len(self.running),
+            'finished': len(self.finished),
+            'failed': len(self.failed),
+            'skipped': len(self.skipped_tasks),
+        }
+        for state, value in states.items():
+            self.registry.set('parallelism_tasks', value, state=state)
+        running = tuple(self.running.values())
+        processes = sum(
+            task.processes + (1 if issubclass(task.executor, Process) else 0)
+            for task in running
+        )
+        threads = sum(
+            task.threads + (1 if issubclass(task.executor, Thread) else 0)
+            for task in running
+        )
+        for kind, value in (('process', processes), ('thread', threads)):
+            self.registry.set('parallelism_workers_active', value, kind=kind)
+        for resource in self.resources:
+            self.registry.set(
+                'parallelism_resource_usage_percent',
+                sum(getattr(task, resource) for task in running),
+                resource=resource,
+            )
+        for pool in self.pools:
+            self.registry.set(
+                'parallelism_resource_pool_usage',
+                sum(task.resources.get(pool, 0) for task in running),
+                pool=pool,
+            )
+        if callable(self.metrics):
+            self.metrics(self.registry.render())
+
+    def stop(self) -> None:
+        if not self.enabled:
+            return
+        self.update(force=True)
+        self.close()
+
+    def close(self) -> None:
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
@@ -2,53 +2,78 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+from parallelism.core.gather_value import GatherValue
 from parallelism.core.return_value import ReturnValue
+from parallelism.core.stream_value import StreamValue
 
 if TYPE_CHECKING:
     from multiprocessing.managers import DictProxy
-    from typing import Any, Dict, Tuple
+    from typing import Any, Dict, List, Optional, Tuple
+
+    from parallelism.core.handlers.projection_handler import (
+        ProjectionHandler,
+    )
+    from parallelism.core.stream_reader import StreamReader
 
 __all__ = ('ParametersHandler',)
 
 
 class ParametersHandler:
-    __slots__ = ('proxy',)
+    __slots__ = ('proxy', 'streams', 'gathers', 'projections', 'shared')
 
-    def __init__(self, proxy: DictProxy) -> None:
+    def __init__(
+        self,
+        proxy: DictProxy,
+        streams: Optional[Dict[str, StreamReader]] = None,
+        gathers: Optional[Dict[GatherValue, Any]] = None,
+        projections: Optional[ProjectionHandler] = None,
+        shared: bool = False,
+    ) -> None:
         self.proxy = proxy
+        self.streams = streams
+        self.gathers = gathers
+        self.projections = projections
+        self.shared = shared
+
+    def return_value(self, value: ReturnValue) -> Any:
+        if self.projections is not None:
+            return self.projections.resolve(value, copy=self.shared)
+        task = getattr(value, ':task')
+        return self.transform(
+            self.proxy.get(task.name).get('return_value'),
+            getattr(value, ':transformations'),
+        )
+
+    @staticmethod
+    def transform(value: Any, transformations: List[Tuple[str, Any]]) -> Any:
+        for method, data in transformations:
+            if method == '__call__':
+                positionals, keywords = data
+                value = value(*positionals, **keywords)
+            if method == '__getattribute__':
+                value = getattr(value, data)
+            if method == '__getitem__':
+                value = value[data]
+        return value
 
     def args(self, *args: Any) -> Tuple[Any, ...]:
         args = list(args)
         for index, value in enumerate(args):
             if isinstance(value, ReturnValue):
-                task = getattr(value, ':task')
-                transformations = getattr(value, ':transformations')
-                value = self.proxy.get(task.name).get('return_value')
-                for method, data in transformations:
-                    if method == '__call__':
-                        positionals, keywords = data
-                        value = value(*positionals, **keywords)
-                    if method == '__getattribute__':
-                        value = getattr(value, data)
-                    if method == '__getitem__':
-                        value = value[data]
-                args[index] = value
+                args[index] = self.return_value(value)
+            elif isinstance(value, StreamValue):
+                args[index] = self.streams[value.task.name]
+            elif isinstance(value, GatherValue):
+                args[index] = self.gathers[value]
         return tuple(args)
 
     def kwargs(self, **kwargs: Any) -> Dict[str, Any]:
         kwargs = dict(kwargs)
         for key, value in kwargs.items():
             if isinstance(value, ReturnValue):
-                task = getattr(value, ':task')
-                transformations = getattr(value, ':transformations')
-                value = self.proxy.get(task.name).get('return_value')
-                for method, data in transformations:
-                    if method == '__call__':
-                        positionals, keywords = data
-                        value = value(*positionals, **keywords)
-                    if method == '__getattribute__':
-                        value = getattr(value, data)
-                    if method == '__getitem__':
-                        value = value[data]
-                kwargs[key] = value
+                kwargs[key] = self.return_value(value)
+            elif isinstance(value, StreamValue):
+                kwargs[key] = self.streams[value.task.name]
+            elif isinstance(value, GatherValue):
+                kwargs[key] = self.gathers[value]
         return dict(kwargs)
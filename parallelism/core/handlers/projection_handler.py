@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from pickle import HIGHEST_PROTOCOL, PicklingError, dumps, loads
+from typing import TYPE_CHECKING
+
+from parallelism.core.handlers.parameters_handler import ParametersHandler
+from parallelism.core.return_value import ReturnValue
+
+if TYPE_CHECKING:
+    from multiprocessing.managers import DictProxy
+    from typing import Any, Iterable, Optional, Tuple
+
+    from parallelism.core.scheduled_task import ScheduledTask
+
+__all__ = ('ProjectionHandler',)
+
+
+class ProjectionHandler:
+    __slots__ = ('proxy', 'consumers', 'values')
+
+    def __init__(
+        self,
+        tasks: Iterable[ScheduledTask],
+        proxy: DictProxy,
+    ) -> None:
+        self.proxy = proxy
+        self.consumers = {}
+        self.values = {}
+        self.extend(tasks)
+
+    @staticmethod
+    def key(value: ReturnValue) -> Optional[Tuple[str, bytes]]:
+        # Transformations are compared by their pickle, since the arguments
+        # of the calls they record may not be hashable. The ones that can not
+        # be pickled are not memoized.
+        try:
+            return (
+                getattr(value, ':task').name,
+                dumps(getattr(value, ':transformations')),
+            )
+        except (PicklingError, TypeError, AttributeError):
+            return None
+
+    @classmethod
+    def keys(cls, task: ScheduledTask) -> Tuple[Tuple[str, bytes], ...]:
+        # The untransformed return value is counted along with every
+        # projection of it, so it is fetched only once as well.
+        keys = {}
+        for value in (*task.args, *task.kwargs.values()):
+            if not isinstance(value, ReturnValue):
+                continue
+            key = cls.key(value)
+            if key is not None:
+                keys[key] = None
+                keys[(key[0], dumps([]))] = None
+        return tuple(keys)
+
+    def extend(self, tasks: Iterable[ScheduledTask]) -> None:
+        for task in tasks:
+            for key in self.keys(task):
+                self.consumers.setdefault(key, set()).add(task.name)
+
+    def resolve(self, value: ReturnValue, copy: bool = False) -> Any:
+        # Every distinct projection is computed once and shared by all the
+        # tasks consuming it, for as long as any of them is not initialized.
+        # Thread consumers share the memory of the task scheduler, so each
+        # of them is given its own copy, as a fetch from the manager would.
+        key = self.key(value)
+        transformations = getattr(value, ':transformations')
+        if key is None or key not in self.consumers:
+            name = getattr(value, ':task').name
+            return ParametersHandler.transform(
+                self.proxy.get(name).get('return_value'),
+                transformations,
+            )
+        name, _ = key
+        origin = (name, dumps([]))
+        if origin not in self.values:
+            self.values[origin] = self.proxy.get(name).get('return_value')
+        if key not in self.values:
+            self.values[key] = ParametersHandler.transform(
+                self.values[origin],
+                transformations,
+            )
+        if not copy:
+            return self.values[key]
+        try:
+            return loads(dumps(self.values[key], HIGHEST_PROTOCOL))
+        except (PicklingError, TypeError, AttributeError):
+            # Projections that can not be pickled are computed again, from a
+            # copy of the return value, which came through the manager.
+            return ParametersHandler.transform(
+                loads(dumps(self.values[origin], HIGHEST_PROTOCOL)),
+                transformations,
+            )
+
+    def release(self, task: ScheduledTask) -> None:
+        for key in self.keys(task):
+            consumers = self.consumers.get(key)
+            if consumers is None:
+                continue
+            consumers.discard(task.name)
+            if not consumers:
+                del self.consumers[key]
+                self.values.pop(key, None)
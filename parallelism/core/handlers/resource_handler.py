@@ -1,77 +1,210 @@
 from __future__ import annotations
 
+from operator import add, le, sub
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
-    from multiprocessing.managers import DictProxy
-    from typing import List, Tuple
+    from typing import Dict, Iterable, List, Literal, Tuple, Union
 
     from parallelism.core.scheduled_task import ScheduledTask
+    from parallelism.core.task_state import TaskState
 
 __all__ = ('ResourceHandler',)
 
 
 class ResourceHandler:
+    RESOURCES = (
+        'system_processor',
+        'system_memory',
+        'graphics_processor',
+        'graphics_memory',
+    )
+
     __slots__ = (
-        'tasks',
-        'proxy',
+        'states',
+        'copies',
         'system_processor',
         'system_memory',
         'graphics_processor',
         'graphics_memory',
+        'pools',
+        'capacity',
+        'strategy',
+        'reserved',
+        'held',
+        'usage',
+        'ordered',
     )
 
     def __init__(
         self,
-        tasks: List[ScheduledTask],
-        proxy: DictProxy,
+        states: Dict[str, TaskState],
         system_processor: float,
         system_memory: float,
         graphics_processor: float,
         graphics_memory: float,
+        pools: Dict[str, Union[int, float]] = None,
+        strategy: Literal[
+            'first_fit',
+            'backfill',
+            'dominant_resource',
+            'best_fit',
+        ] = 'first_fit',
+        copies: Dict[str, TaskState] = None,
     ) -> None:
-        self.tasks = tasks
-        self.proxy = proxy
+        self.states = states
+        self.copies = copies if copies is not None else {}
         self.system_processor = system_processor
         self.system_memory = system_memory
         self.graphics_processor = graphics_processor
         self.graphics_memory = graphics_memory
+        self.pools = pools or {}
+        self.capacity = tuple(
+            getattr(self, resource) for resource in self.RESOURCES
+        ) + tuple(self.pools.values())
+        self.strategy = strategy
+        self.reserved = None
+        self.held = {}
+        self.usage = (0,) * len(self.capacity)
+        self.ordered = None
 
     @property
-    def active_tasks(self) -> Tuple[ScheduledTask, ...]:
+    def available(self) -> Tuple[float, ...]:
+        available = tuple(map(sub, self.capacity, self.usage))
+        if self.reserved is not None:
+            available = tuple(map(sub, available, self.demand(self.reserved)))
+        return available
+
+    def demand(self, task: ScheduledTask) -> Tuple[float, ...]:
         return tuple(
-            task for task in self.tasks
-            if (
-                task.initialized and
-                self.proxy.get(task.name).get('start') and not
-                self.proxy.get(task.name).get('finish')
-            )
+            getattr(task, resource) for resource in self.RESOURCES
+        ) + tuple(task.resources.get(pool, 0) for pool in self.pools)
+
+    def within_limits(self, task: ScheduledTask) -> bool:
+        return self.pools.keys() >= task.resources.keys() and all(
+            map(le, self.demand(task), self.capacity),
         )
 
-    @property
-    def system_processor_usage(self) -> float:
-        return sum(task.system_processor for task in self.active_tasks)
+    def lacking_pools(self, task: ScheduledTask) -> Dict[str, float]:
+        return {
+            pool: amount - self.pools.get(pool, 0)
+            for pool, amount in task.resources.items()
+            if amount > self.pools.get(pool, 0)
+        }
 
-    @property
-    def system_memory_usage(self) -> float:
-        return sum(task.system_memory for task in self.active_tasks)
+    def enough_resources(self, task: ScheduledTask) -> bool:
+        available = tuple(map(sub, self.capacity, self.usage))
+        if self.reserved is not None and self.reserved != task:
+            available = tuple(map(sub, available, self.demand(self.reserved)))
+        return all(map(le, self.demand(task), available))
 
-    @property
-    def graphics_processor_usage(self) -> float:
-        return sum(task.graphics_processor for task in self.active_tasks)
+    def reserve(self, task: ScheduledTask) -> None:
+        if self.strategy == 'backfill' and self.reserved is None:
+            self.reserved = task
 
-    @property
-    def graphics_memory_usage(self) -> float:
-        return sum(task.graphics_memory for task in self.active_tasks)
+    def release(self, task: ScheduledTask) -> None:
+        if self.reserved == task:
+            self.reserved = None
 
-    def enough_resources(self, task: ScheduledTask) -> bool:
-        sp = self.system_processor - self.system_processor_usage
-        sm = self.system_memory - self.system_memory_usage
-        gp = self.graphics_processor - self.graphics_processor_usage
-        gm = self.graphics_memory - self.graphics_memory_usage
-        return bool(
-            task.system_processor <= sp and
-            task.system_memory <= sm and
-            task.graphics_processor <= gp and
-            task.graphics_memory <= gm
+    def dominant_share(self, task: ScheduledTask) -> float:
+        return max((
+            demand / capacity
+            for demand, capacity in zip(self.demand(task), self.capacity)
+            if capacity
+        ), default=0)
+
+    def invalidate(self) -> None:
+        self.ordered = None
+
+    def dispatched(
+        self,
+        task: ScheduledTask,
+        members: Iterable[ScheduledTask] = (),
+        speculative: bool = False,
+    ) -> None:
+        # The demands of the dispatched tasks are added to a running total,
+        # so that admitting a task does not add up the demands of every
+        # running task. Fused members run one after another in the worker of
+        # their head, which holds its demand until the last of them.
+        # Speculative copies occupy resources like their originals.
+        demand = self.demand(task)
+        names = (task.name, *(member.name for member in members))
+        self.held[task.name, speculative] = (demand, names)
+        self.usage = tuple(map(add, self.usage, demand))
+        self.invalidate()
+
+    def holding(self, names: Tuple[str, ...], speculative: bool) -> bool:
+        if speculative:
+            copy = self.copies.get(names[0])
+            return copy is not None and not copy.finished
+        states = (self.states.get(name) for name in names)
+        return any(
+            state is not None and
+            state.initialized and not
+            state.finished
+            for state in states
+        )
+
+    def update(self) -> None:
+        # Only the dispatched tasks are polled, rather than every state, and
+        # the best fit order is refreshed once their demands are released.
+        # The total is added up again from the held demands, rather than
+        # subtracted from, so that it does not drift with rounding errors.
+        completed = False
+        for key, (_, names) in tuple(self.held.items()):
+            _, speculative = key
+            if not self.holding(names, speculative):
+                del self.held[key]
+                completed = True
+        if not completed:
+            return
+        self.usage = (0,) * len(self.capacity)
+        for demand, _ in self.held.values():
+            self.usage = tuple(map(add, self.usage, demand))
+        if self.strategy == 'best_fit':
+            self.invalidate()
+
+    def order(self, tasks: List[ScheduledTask]) -> List[ScheduledTask]:
+        # The order is kept until tasks are submitted, requeued, dispatched
+        # or completed. The admission still checks the resources of every
+        # task, so an order computed before a completion is only a
+        # preference.
+        if self.strategy not in ('dominant_resource', 'best_fit'):
+            return tasks
+        if self.ordered is not None:
+            return self.ordered
+        if self.strategy == 'dominant_resource':
+            # Tasks are not grouped by user, so this is the progressive
+            # filling of DRF applied to the tasks themselves: the smallest
+            # dominant share is admitted first, which packs the most tasks
+            # on the bottleneck resource rather than balancing shares.
+            self.ordered = sorted(
+                tasks,
+                key=lambda task: (task.priority, self.dominant_share(task)),
+            )
+        else:
+            available = self.available
+            capacity = self.capacity
+            self.ordered = sorted(
+                tasks,
+                key=lambda task: (
+                    task.priority,
+                    self.residual_capacity(task, available, capacity),
+                ),
+            )
+        return self.ordered
+
+    def residual_capacity(
+        self,
+        task: ScheduledTask,
+        available: Tuple[float, ...],
+        capacity: Tuple[float, ...],
+    ) -> float:
+        residuals = tuple(map(sub, available, self.demand(task)))
+        if any(residual < 0 for residual in residuals):
+            return float('inf')
+        return sum(
+            residual / limit
+            for residual, limit in zip(residuals, capacity)
+            if limit
         )
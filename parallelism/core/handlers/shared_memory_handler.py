@@ -1,45 +1,52 @@
 from __future__ import annotations
 
+from multiprocessing import Process
 from typing import TYPE_CHECKING
-from parallelism.core.scheduled_task import ScheduledTask
 
 if TYPE_CHECKING:
-    from multiprocessing.managers import DictProxy
-    from typing import Dict, List, Tuple
+    from typing import Container, Dict, Tuple
+
+    from parallelism.core.scheduled_task import ScheduledTask
+    from parallelism.core.task_state import TaskState
 
 __all__ = ('SharedMemoryHandler',)
 
 
 class SharedMemoryHandler:
     __slots__ = (
-        'tasks',
-        'proxy',
+        'states',
         'execution_time',
         'elapsed_time',
         'raise_exception',
         'return_value',
         'prerequisites',
+        'retained',
+        'exiting',
     )
 
     def __init__(
         self,
-        tasks: List[ScheduledTask],
-        proxy: DictProxy,
+        states: Dict[str, TaskState],
         prerequisites: Dict[str, Tuple[ScheduledTask, ...]],
+        retained: Container[str] = (),
     ) -> None:
-        self.tasks = tasks
-        self.proxy = proxy
+        self.states = states
         self.prerequisites = prerequisites
+        self.retained = retained
         self.execution_time = {}
         self.elapsed_time = {}
         self.raise_exception = {}
         self.return_value = {}
+        self.exiting = []
 
-    def free(self, index: int, task: ScheduledTask) -> None:
-        proxy = self.proxy.get(task.name)
+    def free(self, state: TaskState) -> bool:
+        if state.released or not state.initialized:
+            return False
+        proxy = state.proxy
+        task = state.task
         if (
             proxy.get('finish') and
-            self.has_shared_memory(task) and
+            task.name not in self.retained and
             self.prerequisites_been_initialized(task)
         ):
             self.execution_time[task.name] = proxy.get('execution_time')
@@ -49,43 +56,29 @@ class SharedMemoryHandler:
                 self.raise_exception[task.name] = proxy.get('raise_exception')
             elif task.continual:
                 self.return_value[task.name] = proxy.get('return_value')
-            self.tasks[index] = ScheduledTask(
-                executor=task.executor.__class__.__base__,
-                name=task.name,
-                target=task.target,
-                args=(),
-                kwargs={},
-                dependencies=task.dependencies,
-                priority=task.priority,
-                processes=task.processes,
-                threads=task.threads,
-                system_processor=task.system_processor,
-                system_memory=task.system_memory,
-                graphics_processor=task.graphics_processor,
-                graphics_memory=task.graphics_memory,
-                continual=task.continual,
-                initialized=task.initialized,
-            )
-            del self.proxy[task.name]['execution_time']
-            del self.proxy[task.name]['elapsed_time']
-            del self.proxy[task.name]['raise_exception']
-            del self.proxy[task.name]['return_value']
-
-    def has_shared_memory(self, task: ScheduledTask) -> bool:
-        proxy = self.proxy.get(task.name)
-        return (
-            'execution_time' in proxy or
-            'elapsed_time' in proxy or
-            'raise_exception' in proxy or
-            'return_value' in proxy
-        )
+            # Workers may still be exiting once their task has finished, and
+            # are joined before the task scheduler returns.
+            if isinstance(state.executor, Process) and (
+                state.executor.is_alive()
+            ):
+                self.exiting = [
+                    executor for executor in self.exiting
+                    if executor.is_alive()
+                ]
+                self.exiting.append(state.executor)
+            state.executor = None
+            state.released = True
+            del proxy['execution_time']
+            del proxy['elapsed_time']
+            del proxy['raise_exception']
+            del proxy['return_value']
+            return True
+        return False
 
     def prerequisites_been_initialized(self, task: ScheduledTask) -> bool:
-        task_prerequisites = self.prerequisites.get(task.name)
-        tasks = tuple(task for task in task_prerequisites)
         return all(
-            task.initialized for task in self.tasks
-            if task in tasks
+            self.states[prerequisite.name].initialized
+            for prerequisite in self.prerequisites.get(task.name)
         )
 
     def sort(self):
@@ -113,3 +106,8 @@ class SharedMemoryHandler:
                 key=lambda item: self.execution_time.get(item[0]),
             ),
         )
+
+    def join(self) -> None:
+        for executor in self.exiting:
+            executor.join()
+        self.exiting.clear()
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+from bisect import insort
+from math import ceil
+from multiprocessing import Process
+from time import monotonic
+from typing import TYPE_CHECKING
+
+from parallelism.config import SPECULATION_MULTIPLIER, SPECULATION_SAMPLES
+from parallelism.core.task_attempt import TaskAttempt
+from parallelism.logger import get_logger
+
+if TYPE_CHECKING:
+    from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+    from parallelism.core.runtime_estimate import RuntimeEstimate
+    from parallelism.core.scheduled_task import ScheduledTask
+    from parallelism.core.task_state import TaskState
+
+__all__ = ('SpeculationHandler',)
+
+
+class SpeculationHandler:
+    RESULTS = (
+        'elapsed_time',
+        'raise_exception',
+        'return_value',
+        'complete',
+        'result_bytes',
+        'trace',
+        'profile',
+        'peak_memory',
+    )
+
+    __slots__ = (
+        'states',
+        'copies',
+        'percentile',
+        'estimates',
+        'consumers',
+        'enabled',
+        'dispatches',
+        'siblings',
+        'winners',
+        'attempts',
+    )
+
+    def __init__(
+        self,
+        states: Dict[str, TaskState],
+        copies: Dict[str, TaskState],
+        percentile: Optional[Union[int, float]],
+        estimates: Dict[str, RuntimeEstimate],
+        consumers: Dict[str, List[ScheduledTask]],
+    ) -> None:
+        self.states = states
+        self.copies = copies
+        self.percentile = percentile
+        self.estimates = estimates
+        self.consumers = consumers
+        self.enabled = percentile is not None
+        self.dispatches = {}
+        self.siblings = {}
+        self.winners = set()
+        self.attempts = {}
+
+    def eligible(self, task: ScheduledTask) -> bool:
+        # Threads cannot be stopped, so only processes are raced, and tasks
+        # exchanging streams would see their items twice.
+        return bool(
+            self.enabled and
+            task.idempotent and
+            issubclass(task.executor, Process) and not
+            task.depends_on_streams and not
+            task.depends_on_gathered_streams and
+            task.name not in self.consumers
+        )
+
+    def dispatched(
+        self,
+        state: TaskState,
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any],
+    ) -> None:
+        if self.eligible(state.task):
+            self.dispatches[state.task.name] = (
+                monotonic(),
+                state.proxy.get('execution_time'),
+                args,
+                kwargs,
+            )
+
+    def collected(
+        self,
+        task: ScheduledTask,
+        elapsed_time: Optional[float],
+        failed: bool,
+    ) -> None:
+        if not self.enabled:
+            return
+        dispatch = self.dispatches.pop(task.name, None)
+        copy = self.copies.pop(task.name, None)
+        if elapsed_time is not None and not failed:
+            insort(
+                self.siblings.setdefault(task.reformat_target, []),
+                elapsed_time,
+            )
+        if copy is None:
+            return
+        self.stop(copy)
+        won = task.name in self.winners
+        self.attempts[task.name] = (
+            TaskAttempt(
+                attempt=0,
+                execution_time=dispatch[1],
+                elapsed_time=None if won else elapsed_time,
+                winner=not won,
+            ),
+            TaskAttempt(
+                attempt=1,
+                execution_time=copy.proxy.get('execution_time'),
+                elapsed_time=copy.proxy.get('elapsed_time'),
+                winner=won,
+            ),
+        )
+        pattern = '{!r} has been resolved by its {} attempt'
+        get_logger().info(msg=pattern.format(
+            task.name,
+            'speculative' if won else 'original',
+        ))
+
+    def threshold(self, task: ScheduledTask) -> Optional[float]:
+        siblings = self.siblings.get(task.reformat_target, ())
+        if len(siblings) >= SPECULATION_SAMPLES:
+            rank = ceil(self.percentile / 100 * len(siblings))
+            return siblings[max(rank, 1) - 1] * SPECULATION_MULTIPLIER
+        estimate = self.estimates.get(task.name)
+        if estimate is None or estimate.elapsed_time is None:
+            return None
+        return estimate.elapsed_time * SPECULATION_MULTIPLIER
+
+    def stragglers(self) -> Iterator[Tuple[TaskState, float, Tuple, Dict]]:
+        if not self.enabled:
+            return
+        now = monotonic()
+        for name, (start, _, args, kwargs) in tuple(self.dispatches.items()):
+            state = self.states[name]
+            if name in self.copies or not state.active:
+                continue
+            threshold = self.threshold(state.task)
+            if threshold is not None and now - start > threshold:
+                yield state, threshold, args, kwargs
+
+    def launched(self, copy: TaskState, threshold: float) -> None:
+        self.copies[copy.task.name] = copy
+        pattern = (
+            '{!r} has been running for longer than {:.2f} seconds, '
+            'a speculative copy has been launched'
+        )
+        get_logger().warning(msg=pattern.format(copy.task.name, threshold))
+
+    def resolve(self) -> None:
+        # A copy completing first stops the original and hands over its
+        # results, the original is then collected as if it had completed.
+        # Failing copies are left alone until the original finishes.
+        for name, copy in self.copies.items():
+            original = self.states[name]
+            if name in self.winners or not copy.finished_with('complete'):
+                continue
+            self.stop(original)
+            if original.proxy.get('finish'):
+                continue
+            for key in self.RESULTS:
+                if key in copy.proxy:
+                    original.proxy[key] = copy.proxy.get(key)
+            original.proxy['finish'] = True
+            self.winners.add(name)
+
+    @staticmethod
+    def stop(state: TaskState) -> None:
+        executor = state.executor
+        if executor is not None and executor.is_alive():
+            executor.terminate()
+            executor.join()
+
+    def result(self) -> Dict[str, Tuple[TaskAttempt, ...]]:
+        return self.attempts
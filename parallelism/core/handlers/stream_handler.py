@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from queue import Full
+from typing import TYPE_CHECKING
+
+from parallelism.config import STREAM_BUFFER
+from parallelism.core.stream_reader import StreamReader
+
+if TYPE_CHECKING:
+    from multiprocessing.managers import SyncManager
+    from queue import Queue
+    from typing import Dict, Iterable, Optional, Tuple
+
+    from parallelism.core.scheduled_task import ScheduledTask
+    from parallelism.core.task_state import TaskState
+
+__all__ = ('StreamHandler',)
+
+
+class StreamHandler:
+    __slots__ = ('states', 'manager', 'consumers', 'queues', 'closed')
+
+    def __init__(
+        self,
+        tasks: Iterable[ScheduledTask],
+        states: Dict[str, TaskState],
+        manager: SyncManager,
+    ) -> None:
+        self.states = states
+        self.manager = manager
+        self.consumers = {}
+        self.queues = {}
+        self.closed = None
+        self.extend(tasks)
+
+    def extend(self, tasks: Iterable[ScheduledTask]) -> None:
+        for task in tasks:
+            for producer in task.depends_on_streams:
+                self.consumers.setdefault(producer.name, []).append(task)
+
+    def queue(self, producer: str, consumer: str) -> Queue:
+        key = (producer, consumer)
+        if key not in self.queues:
+            self.queues[key] = self.manager.Queue(STREAM_BUFFER)
+        return self.queues[key]
+
+    def writers(
+        self,
+        task: ScheduledTask,
+    ) -> Optional[Tuple[Tuple[str, Queue], ...]]:
+        consumers = self.consumers.get(task.name)
+        if not consumers:
+            return None
+        if self.closed is None:
+            self.closed = self.manager.dict()
+        return tuple(
+            (consumer.name, self.queue(task.name, consumer.name))
+            for consumer in consumers
+            if not self.states[consumer.name].finished
+        )
+
+    def readers(self, task: ScheduledTask) -> Dict[str, StreamReader]:
+        return {
+            producer.name: StreamReader(
+                name=producer.name,
+                queue=self.queue(producer.name, task.name),
+                proxy=self.states[producer.name].proxy,
+            )
+            for producer in task.depends_on_streams
+        }
+
+    def close(self, task: ScheduledTask) -> None:
+        # Producers stop writing to consumers that have finished or have
+        # been canceled, instead of blocking on their full queues.
+        for producer in task.depends_on_streams:
+            key = (producer.name, task.name)
+            if self.closed is not None:
+                self.closed[key] = True
+            self.queues.pop(key, None)
+
+    def interrupt(self, task: ScheduledTask) -> None:
+        # Producers stopped by the task scheduler can not write their last
+        # message, so it is written for them. Consumers of a full queue see
+        # their producer finished once they have drained it.
+        for consumer in self.consumers.get(task.name, ()):
+            queue = self.queues.get((task.name, consumer.name))
+            if queue is None:
+                continue
+            try:
+                queue.put_nowait(('error', None))
+            except Full:
+                pass
@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+from json import dump
+from os import getpid
+from threading import get_ident
+from time import monotonic
+from typing import TYPE_CHECKING
+
+from parallelism.core.handlers.dependency_handler import DependencyHandler
+from parallelism.core.trace_event import TraceEvent
+
+if TYPE_CHECKING:
+    from multiprocessing.managers import DictProxy
+    from typing import Any, Dict, Iterable, List, Literal, Optional, Tuple
+
+    from parallelism.core.scheduled_task import ScheduledTask
+
+__all__ = ('TraceHandler',)
+
+
+class TraceHandler:
+    __slots__ = (
+        'tasks',
+        'proxy',
+        'enabled',
+        'origin',
+        'events',
+        'reasons',
+        'dependencies',
+    )
+
+    def __init__(
+        self,
+        tasks: List[ScheduledTask],
+        proxy: DictProxy,
+        enabled: bool,
+    ) -> None:
+        self.tasks = tasks
+        self.proxy = proxy
+        self.enabled = enabled
+        self.origin = monotonic()
+        self.events = {}
+        self.reasons = {}
+        self.dependencies = {}
+
+    def record(
+        self,
+        task: ScheduledTask,
+        event: str,
+        reason: Optional[str] = None,
+        timestamp: float = None,
+        process: int = None,
+        thread: int = None,
+    ) -> None:
+        self.events.setdefault(task.name, []).append(
+            TraceEvent(
+                event=event,
+                timestamp=monotonic() if timestamp is None else timestamp,
+                process=getpid() if process is None else process,
+                thread=get_ident() if thread is None else thread,
+                reason=reason,
+            ),
+        )
+
+    def submitted(self, tasks: Iterable[ScheduledTask]) -> None:
+        if not self.enabled:
+            return
+        for task in tasks:
+            self.dependencies[task.name] = tuple(
+                dependency.name
+                for dependency in DependencyHandler.depends_on(task)
+            )
+            self.record(task, 'submitted')
+
+    def waiting(
+        self,
+        task: ScheduledTask,
+        reason: Literal['dependency', 'resource', 'worker', 'gather'],
+    ) -> None:
+        if not self.enabled or self.reasons.get(task.name) == reason:
+            return
+        self.reasons[task.name] = reason
+        self.record(task, 'waiting', reason=reason)
+
+    def dispatched(self, task: ScheduledTask) -> None:
+        if not self.enabled:
+            return
+        self.record(task, 'dispatched')
+
+    def canceled(
+        self,
+        task: ScheduledTask,
+        reason: Literal['dependency', 'resource', 'worker', 'gather'],
+    ) -> None:
+        if not self.enabled:
+            return
+        self.record(task, 'canceled', reason=reason)
+
+    def skipped(self, task: ScheduledTask, reason: str) -> None:
+        if not self.enabled:
+            return
+        self.record(task, 'skipped', reason=reason)
+
+    def collected(self, task: ScheduledTask) -> None:
+        if not self.enabled:
+            return
+        trace = self.proxy.get(task.name).get('trace')
+        if trace is not None:
+            process, thread, start, finish = trace
+            self.record(task, 'started', None, start, process, thread)
+            self.record(task, 'finished', None, finish, process, thread)
+        self.record(task, 'collected')
+
+    def ready(self) -> None:
+        finished = {}
+        canceled = {}
+        for name, events in self.events.items():
+            for event in events:
+                if event.event in ('finished', 'canceled', 'skipped'):
+                    finished[name] = event
+                if event.event in ('canceled', 'skipped'):
+                    canceled[name] = event
+        for task in self.tasks:
+            if task.name not in self.events:
+                continue
+            submitted = self.events.get(task.name)[0]
+            blocker = None
+            timestamp = submitted.timestamp
+            for dependency in self.dependencies.get(task.name):
+                event = finished.get(dependency)
+                if event is not None and event.timestamp > timestamp:
+                    blocker = dependency
+                    timestamp = event.timestamp
+            event = canceled.get(task.name)
+            if event is not None and event.timestamp < timestamp:
+                continue
+            self.record(
+                task=task,
+                event='ready',
+                reason=blocker,
+                timestamp=timestamp,
+                process=submitted.process,
+                thread=submitted.thread,
+            )
+
+    def result(self, order: Dict[str, Any]) -> Dict[str, Tuple[TraceEvent]]:
+        if not self.enabled:
+            return {}
+        self.ready()
+        trace = {
+            name: tuple(sorted(events, key=lambda event: event.timestamp))
+            for name, events in self.events.items()
+        }
+        # Skipped tasks are never executed, so they are placed last.
+        return dict(
+            sorted(
+                trace.items(),
+                key=lambda item: (item[0] not in order, order.get(item[0], 0)),
+            ),
+        )
+
+    def export(self, path: str, trace: Dict[str, Tuple[TraceEvent]]) -> None:
+        events = []
+        for name, records in trace.items():
+            timeline = {}
+            for record in records:
+                timeline.setdefault(record.event, record)
+                events.append({
+                    'name': record.event,
+                    'cat': name,
+                    'ph': 'i',
+                    's': 't',
+                    'ts': self.microseconds(record.timestamp),
+                    'pid': record.process,
+                    'tid': record.thread,
+                    'args': {'task': name, 'reason': record.reason},
+                })
+            spans = (
+                ('queue', 'submitted', 'dispatched'),
+                ('queue', 'submitted', 'canceled'),
+                ('queue', 'submitted', 'skipped'),
+                ('dispatch', 'ready', 'dispatched'),
+                ('run', 'started', 'finished'),
+            )
+            for span, begin, end in spans:
+                if begin in timeline and end in timeline:
+                    first = timeline.get(begin)
+                    last = timeline.get(end)
+                    lane = last if span == 'run' else first
+                    events.append({
+                        'name': name,
+                        'cat': span,
+                        'ph': 'X',
+                        'ts': self.microseconds(first.timestamp),
+                        'dur': self.microseconds(
+                            last.timestamp,
+                            first.timestamp,
+                        ),
+                        'pid': lane.process,
+                        'tid': lane.thread,
+                        'args': {'task': name, 'reason': last.reason},
+                    })
+        with open(path, 'w') as file:
+            dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, file)
+
+    def microseconds(self, timestamp: float, origin: float = None) -> float:
+        if origin is None:
+            origin = self.origin
+        return (timestamp - origin) * 1e+6
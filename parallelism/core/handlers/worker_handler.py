@@ -5,70 +5,84 @@ from threading import Thread
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
-    from multiprocessing.managers import DictProxy
-    from typing import List, Tuple
+    from typing import Dict, Tuple
 
     from parallelism.core.scheduled_task import ScheduledTask
+    from parallelism.core.task_state import TaskState
 
 __all__ = ('WorkerHandler',)
 
 
 class WorkerHandler:
-    __slots__ = ('tasks', 'proxy', 'processes', 'threads')
+    __slots__ = (
+        'states',
+        'copies',
+        'processes',
+        'threads',
+        'maximum_processes',
+        'maximum_threads',
+    )
 
     def __init__(
         self,
-        tasks: List[ScheduledTask],
-        proxy: DictProxy,
+        states: Dict[str, TaskState],
         processes: int,
         threads: int,
+        copies: Dict[str, TaskState] = None,
     ) -> None:
-        self.tasks = tasks
-        self.proxy = proxy
+        self.states = states
+        self.copies = copies if copies is not None else {}
         self.processes = processes
         self.threads = threads
+        self.maximum_processes = processes
+        self.maximum_threads = threads
 
     @property
     def active_tasks(self) -> Tuple[ScheduledTask, ...]:
+        # Speculative copies occupy workers and resources like their
+        # originals.
         return tuple(
-            task for task in self.tasks
-            if (
-                task.initialized and
-                self.proxy.get(task.name).get('start') and not
-                self.proxy.get(task.name).get('finish')
-            )
+            state.task for state in self.states.values()
+            if state.active
+        ) + tuple(
+            state.task for state in self.copies.values()
+            if state.active
         )
 
     @property
     def active_processes(self) -> int:
         return sum(
-            task.processes + (1 if isinstance(task.executor, Process) else 0)
+            task.processes + (1 if issubclass(task.executor, Process) else 0)
             for task in self.active_tasks
         )
 
     @property
     def active_threads(self) -> int:
         return sum(
-            task.threads + 1 if isinstance(task.executor, Thread) else 0
+            task.threads + 1 if issubclass(task.executor, Thread) else 0
             for task in self.active_tasks
         )
 
     def enough_workers(self, task: ScheduledTask) -> bool:
         return bool(
-            task.executor.__base__ == Process and
-            task.processes < self.processes
+            issubclass(task.executor, Process) and
+            task.processes < self.maximum_processes
         ) or bool(
-            task.executor.__base__ == Thread and
-            task.processes < self.processes and
-            task.threads < self.threads
+            issubclass(task.executor, Thread) and
+            task.processes < self.maximum_processes and
+            task.threads < self.maximum_threads
         )
 
     def available_worker(self, task: ScheduledTask) -> bool:
+        if not self.active_tasks:
+            # Limits lowered by the concurrency controller never stall a
+            # task that fits within the maximum limits.
+            return self.enough_workers(task)
         return bool(
-            task.executor.__base__ == Process and
+            issubclass(task.executor, Process) and
             self.active_processes + task.processes < self.processes
         ) or bool(
-            task.executor.__base__ == Thread and
+            issubclass(task.executor, Thread) and
             self.active_processes + task.processes < self.processes and
             self.active_threads + task.threads < self.threads
         )
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from cProfile import Profile
+from pstats import Stats
+from typing import TYPE_CHECKING
+
+from parallelism.core.hooks.task_hook import TaskHook
+
+if TYPE_CHECKING:
+    from typing import Dict, Optional, Tuple
+
+__all__ = ('CProfileHook',)
+
+
+class CProfileHook(TaskHook):
+    name = 'cprofile'
+
+    def before_call(self, name: str) -> Profile:
+        profile = Profile()
+        profile.enable()
+        return profile
+
+    def after_call(self, name: str, state: Profile) -> Dict[Tuple, Tuple]:
+        state.disable()
+        state.create_stats()
+        return state.stats
+
+    def report(
+        self,
+        profiles: Dict[str, Dict[Tuple, Tuple]],
+    ) -> Optional[Stats]:
+        stats = None
+        for profile in profiles.values():
+            if stats is None:
+                stats = Stats(_Statistics(profile))
+            else:
+                stats.add(_Statistics(profile))
+        return stats
+
+
+class _Statistics:
+    __slots__ = ('stats',)
+
+    def __init__(self, stats: Dict[Tuple, Tuple]) -> None:
+        self.stats = dict(stats)
+
+    def create_stats(self) -> None:
+        pass
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing import Any, Dict, Optional
+
+__all__ = ('TaskHook',)
+
+
+class TaskHook:
+    name: Optional[str] = None
+
+    def before_dispatch(self, name: str) -> None:
+        pass
+
+    def before_call(self, name: str) -> Any:
+        pass
+
+    def after_call(self, name: str, state: Any) -> Any:
+        pass
+
+    def on_result_collected(self, name: str, profile: Any) -> Any:
+        return profile
+
+    def report(self, profiles: Dict[str, Any]) -> Any:
+        pass
+
+    def overrides(self, stage: str) -> bool:
+        return getattr(type(self), stage) is not getattr(TaskHook, stage)
+
+    @property
+    def label(self) -> str:
+        return self.name or self.__class__.__name__
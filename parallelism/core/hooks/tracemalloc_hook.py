@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import tracemalloc
+from typing import TYPE_CHECKING
+
+from parallelism.core.hooks.task_hook import TaskHook
+
+if TYPE_CHECKING:
+    from typing import Any, Dict
+
+__all__ = ('TracemallocHook',)
+
+
+class TracemallocHook(TaskHook):
+    name = 'tracemalloc'
+
+    def __init__(self, limit: int = 10, key_type: str = 'lineno') -> None:
+        self.limit = limit
+        self.key_type = key_type
+
+    def before_call(self, name: str) -> bool:
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        if hasattr(tracemalloc, 'reset_peak'):
+            tracemalloc.reset_peak()
+        return started
+
+    def after_call(self, name: str, state: bool) -> Dict[str, Any]:
+        current, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot()
+        if state:
+            tracemalloc.stop()
+        statistics = snapshot.statistics(self.key_type)[:self.limit]
+        return {
+            'current': current,
+            'peak': peak,
+            'statistics': [
+                (str(statistic.traceback), statistic.size, statistic.count)
+                for statistic in statistics
+            ],
+        }
+
+    def report(self, profiles: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        statistics = {}
+        for profile in profiles.values():
+            for traceback, size, count in profile.get('statistics'):
+                total_size, total_count = statistics.get(traceback, (0, 0))
+                total_size += size
+                total_count += count
+                statistics[traceback] = (total_size, total_count)
+        top = sorted(
+            ((key, *value) for key, value in statistics.items()),
+            key=lambda item: item[1],
+            reverse=True,
+        )
+        return {
+            'peak': max(
+                (profile.get('peak') for profile in profiles.values()),
+                default=0,
+            ),
+            'statistics': top[:self.limit],
+        }
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+from threading import Lock
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing import Dict, Literal, Tuple, Union
+
+__all__ = ('MetricsRegistry',)
+
+
+class MetricsRegistry:
+    __slots__ = ('lock', 'metrics', 'descriptions')
+
+    def __init__(self) -> None:
+        self.lock = Lock()
+        self.metrics = {}
+        self.descriptions = {}
+
+    def describe(
+        self,
+        name: str,
+        kind: Literal['counter', 'gauge', 'histogram'],
+        description: str,
+        buckets: Tuple[float, ...] = (),
+    ) -> None:
+        self.descriptions[name] = (kind, description, buckets)
+        self.metrics[name] = {}
+
+    def set(self, name: str, value: Union[int, float], **labels: str) -> None:
+        with self.lock:
+            self.metrics[name][self.key(labels)] = value
+
+    def increment(
+        self,
+        name: str,
+        value: Union[int, float] = 1,
+        **labels: str,
+    ) -> None:
+        key = self.key(labels)
+        with self.lock:
+            self.metrics[name][key] = self.metrics[name].get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        key = self.key(labels)
+        buckets = self.descriptions[name][2]
+        with self.lock:
+            counts, total = self.metrics[name].get(
+                key,
+                ([0] * (len(buckets) + 1), 0.0),
+            )
+            counts = list(counts)
+            counts[bisect_left(buckets, value)] += 1
+            self.metrics[name][key] = (counts, total + value)
+
+    def render(self) -> str:
+        lines = []
+        with self.lock:
+            metrics = {
+                name: dict(values)
+                for name, values in self.metrics.items()
+            }
+        for name, values in metrics.items():
+            kind, description, buckets = self.descriptions[name]
+            lines.append(f'# HELP {name} {description}')
+            lines.append(f'# TYPE {name} {kind}')
+            for key, value in values.items():
+                if kind != 'histogram':
+                    lines.append(f'{name}{self.labels(key)} {value!r}')
+                    continue
+                counts, total = value
+                cumulative = 0
+                for bucket, count in zip(buckets + ('+Inf',), counts):
+                    cumulative += count
+                    labels = self.labels(key + (('le', str(bucket)),))
+                    lines.append(f'{name}_bucket{labels} {cumulative!r}')
+                lines.append(f'{name}_sum{self.labels(key)} {total!r}')
+                lines.append(f'{name}_count{self.labels(key)} {cumulative!r}')
+        return '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def key(labels: Dict[str, str]) -> Tuple[Tuple[str, str], ...]:
+        return tuple(sorted(labels.items()))
+
+    @staticmethod
+    def labels(key: Tuple[Tuple[str, str], ...]) -> str:
+        if not key:
+            return ''
+        labels = ','.join(
+            '{}="{}"'.format(
+                name,
+                str(value).replace('\\', '\\\\').replace('"', '\\"'),
+            )
+            for name, value in key
+        )
+        return f'{{{labels}}}'
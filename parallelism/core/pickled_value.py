@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from pickle import loads
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing import Any, Callable, Tuple
+
+__all__ = ('PickledValue',)
+
+
+class PickledValue:
+    __slots__ = ('payload',)
+
+    def __init__(self, payload: bytes) -> None:
+        self.payload = payload
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(size={len(self.payload)!r})'
+
+    def __reduce__(self) -> Tuple[Callable[..., Any], Tuple[bytes]]:
+        # The value is pickled once, and its payload is embedded as is in
+        # the message sent to the manager, which loads it back.
+        return loads, (self.payload,)
@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+from typing import NamedTuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing import Any, Dict
+
+__all__ = ('ProfileReport',)
+
+
+class ProfileReport(NamedTuple):
+    tasks: Dict[str, Any]
+    merged: Any
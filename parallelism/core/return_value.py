@@ -1,9 +1,10 @@
 from __future__ import annotations
 
+from copyreg import pickle
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
-    from typing import Any
+    from typing import Any, Callable, List, Tuple
 
     from parallelism.core.scheduled_task import ScheduledTask
 
@@ -38,3 +39,24 @@ class ReturnValue:
         class_name = getattr(self, ':__class__').__name__
         task = getattr(self, ':task')
         return f'{class_name}(task={task!r})'
+
+    @classmethod
+    def restore(
+        cls,
+        task: ScheduledTask,
+        transformations: List[Tuple[str, Any]],
+    ) -> ReturnValue:
+        return_value = cls(task=task)
+        getattr(return_value, ':transformations').extend(transformations)
+        return return_value
+
+    @staticmethod
+    def reduce(return_value: ReturnValue) -> Tuple[Callable[..., Any], ...]:
+        # Pickle looks `__reduce_ex__` up on the instance, which would only
+        # record another transformation, so reduction is registered by type.
+        task = getattr(return_value, ':task')
+        transformations = getattr(return_value, ':transformations')
+        return ReturnValue.restore, (task, list(transformations))
+
+
+pickle(ReturnValue, ReturnValue.reduce)
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from typing import NamedTuple, TYPE_CHECKING
+
+from parallelism.config import HISTORY_DEVIATIONS
+
+if TYPE_CHECKING:
+    from typing import Optional
+
+__all__ = ('RuntimeEstimate',)
+
+
+class RuntimeEstimate(NamedTuple):
+    samples: int
+    elapsed_time: Optional[float]
+    deviation: Optional[float]
+    peak_memory: Optional[int]
+    failure_rate: float
+
+    @property
+    def timeout(self) -> Optional[float]:
+        if self.elapsed_time is None:
+            return None
+        return self.elapsed_time + HISTORY_DEVIATIONS * self.deviation
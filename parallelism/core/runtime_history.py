@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+import sqlite3
+from contextlib import closing, contextmanager
+from hashlib import sha1
+from heapq import heapify, heappop, heappush
+from math import sqrt
+from multiprocessing import Process
+from os import cpu_count
+from time import time
+from types import CodeType
+from typing import TYPE_CHECKING
+
+from parallelism.config import (
+    HISTORY_BATCH,
+    HISTORY_LOCK_TIMEOUT,
+    HISTORY_WINDOW,
+)
+from parallelism.core.handlers.dependency_handler import DependencyHandler
+from parallelism.core.runtime_estimate import RuntimeEstimate
+
+if TYPE_CHECKING:
+    from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+    from parallelism.core.scheduled_task import ScheduledTask
+
+__all__ = ('RuntimeHistory',)
+
+
+class RuntimeHistory:
+    __slots__ = ('path',)
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with self.connection() as connection:
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS runs ('
+                'id INTEGER PRIMARY KEY, '
+                'name TEXT NOT NULL, '
+                'fingerprint TEXT NOT NULL, '
+                'outcome TEXT NOT NULL, '
+                'elapsed_time REAL, '
+                'peak_memory INTEGER, '
+                'recorded REAL NOT NULL)',
+            )
+            connection.execute(
+                'CREATE INDEX IF NOT EXISTS runs_key '
+                'ON runs (name, fingerprint)',
+            )
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(path={self.path!r})'
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        with closing(sqlite3.connect(
+            self.path,
+            timeout=HISTORY_LOCK_TIMEOUT,
+        )) as connection:
+            with connection:
+                yield connection
+
+    @staticmethod
+    def fingerprint(task: ScheduledTask) -> str:
+        digest = sha1(task.reformat_target.encode())
+        code = getattr(task.target, '__code__', None)
+        if code is not None:
+            RuntimeHistory.update(digest, code)
+        return digest.hexdigest()
+
+    @staticmethod
+    def update(digest: Any, code: CodeType) -> None:
+        # Nested functions, lambdas and comprehensions are code objects among
+        # the constants, whose representation holds their address.
+        digest.update(code.co_code)
+        digest.update(repr(code.co_names).encode())
+        for constant in code.co_consts:
+            if isinstance(constant, CodeType):
+                RuntimeHistory.update(digest, constant)
+            else:
+                digest.update(RuntimeHistory.constant(constant).encode())
+
+    @staticmethod
+    def constant(value: Any) -> str:
+        # Frozen sets of strings are iterated in an order that changes with
+        # the hash seed of each interpreter.
+        if isinstance(value, frozenset):
+            return 'frozenset({!r})'.format(
+                sorted(map(RuntimeHistory.constant, value)),
+            )
+        if isinstance(value, tuple):
+            return '({})'.format(
+                ', '.join(map(RuntimeHistory.constant, value)),
+            )
+        return repr(value)
+
+    def record(
+        self,
+        records: Iterable[
+            Tuple[str, str, str, Optional[float], Optional[int]]
+        ],
+    ) -> None:
+        """
+        Appends the outcomes of a run, as tuples of the task name, the
+        target fingerprint, the outcome (`'completed'`, `'failed'` or
+        `'canceled'`), the elapsed time and the peak memory. Only the latest
+        runs of each task are kept, and only for its latest fingerprint.
+        """
+        recorded = time()
+        records = [(*record, recorded) for record in records]
+        if not records:
+            return
+        with self.connection() as connection:
+            connection.executemany(
+                'INSERT INTO runs '
+                '(name, fingerprint, outcome, elapsed_time, peak_memory, '
+                'recorded) VALUES (?, ?, ?, ?, ?, ?)',
+                records,
+            )
+            connection.executemany(
+                'DELETE FROM runs WHERE name = ? AND fingerprint != ?',
+                {record[:2] for record in records},
+            )
+            connection.execute(
+                'DELETE FROM runs WHERE id IN ('
+                'SELECT id FROM ('
+                'SELECT id, ROW_NUMBER() OVER ('
+                'PARTITION BY name, fingerprint ORDER BY id DESC'
+                ') AS position FROM runs'
+                ') WHERE position > ?)',
+                (HISTORY_WINDOW,),
+            )
+
+    def estimates(
+        self,
+        tasks: Iterable[ScheduledTask],
+    ) -> Dict[str, RuntimeEstimate]:
+        """
+        Returns the rolling estimates of the tasks that have been recorded
+        with the same target fingerprint, keyed by task name.
+        """
+        keys = {task.name: self.fingerprint(task) for task in tasks}
+        names = tuple(keys)
+        rows = {}
+        with self.connection() as connection:
+            # The names are bound in batches, below the limit of SQLite on
+            # the number of parameters of a statement.
+            for index in range(0, len(names), HISTORY_BATCH):
+                batch = names[index:index + HISTORY_BATCH]
+                for name, fingerprint, outcome, elapsed_time, peak_memory in (
+                    connection.execute(
+                        'SELECT name, fingerprint, outcome, elapsed_time, '
+                        'peak_memory FROM runs WHERE name IN ({}) '
+                        'ORDER BY id'.format(', '.join('?' * len(batch))),
+                        batch,
+                    )
+                ):
+                    if keys[name] == fingerprint:
+                        rows.setdefault(name, []).append(
+                            (outcome, elapsed_time, peak_memory),
+                        )
+        estimates = {}
+        for name, samples in rows.items():
+            durations = [
+                elapsed_time for outcome, elapsed_time, _ in samples
+                if outcome == 'completed' and elapsed_time is not None
+            ]
+            memories = [
+                peak_memory for *_, peak_memory in samples
+                if peak_memory is not None
+            ]
+            mean = deviation = None
+            if durations:
+                mean = sum(durations) / len(durations)
+                deviation = sqrt(
+                    sum((value - mean) ** 2 for value in durations) /
+                    len(durations),
+                )
+            estimates[name] = RuntimeEstimate(
+                samples=len(samples),
+                elapsed_time=mean,
+                deviation=deviation,
+                peak_memory=max(memories, default=None),
+                failure_rate=sum(
+                    outcome == 'failed' for outcome, *_ in samples
+                ) / len(samples),
+            )
+        return estimates
+
+    def makespan(
+        self,
+        tasks: Tuple[ScheduledTask, ...],
+        processes: int = None,
+        threads: int = None,
+    ) -> float:
+        """
+        Predicts the makespan of the tasks, in seconds, by list scheduling
+        their estimated elapsed times on the given workers in priority and
+        dependency order. Tasks without estimates count as instantaneous,
+        and resource limits are not taken into account.
+        """
+        if processes is None:
+            processes = cpu_count() or 1
+        if threads is None:
+            threads = cpu_count() or 1
+        estimates = self.estimates(tasks)
+        workers = {Process: [0.0] * processes, None: [0.0] * threads}
+        positions = {task.name: index for index, task in enumerate(tasks)}
+        dependents = {task.name: [] for task in tasks}
+        remaining = {}
+        for task in tasks:
+            prerequisites = DependencyHandler.depends_on(task)
+            remaining[task.name] = len(prerequisites)
+            for prerequisite in prerequisites:
+                dependents[prerequisite.name].append(task)
+        ready = [
+            (task.priority, index, task)
+            for index, task in enumerate(tasks)
+            if not remaining[task.name]
+        ]
+        heapify(ready)
+        finish = {}
+        while ready:
+            _, index, task = heappop(ready)
+            start = max(
+                (
+                    finish.get(prerequisite.name, 0.0)
+                    for prerequisite in DependencyHandler.depends_on(task)
+                ),
+                default=0.0,
+            )
+            estimate = estimates.get(task.name)
+            duration = 0.0
+            if estimate is not None and estimate.elapsed_time is not None:
+                duration = estimate.elapsed_time
+            pool = workers[
+                Process if issubclass(task.executor, Process) else None
+            ]
+            if not pool:
+                # Tasks lacking workers are canceled right away.
+                duration = 0.0
+            else:
+                start = max(start, heappop(pool))
+                heappush(pool, start + duration)
+            finish[task.name] = start + duration
+            for dependent in dependents[task.name]:
+                remaining[dependent.name] -= 1
+                if not remaining[dependent.name]:
+                    heappush(ready, (
+                        dependent.priority,
+                        positions[dependent.name],
+                        dependent,
+                    ))
+        return max(finish.values(), default=0.0)
@@ -2,22 +2,27 @@ from __future__ import annotations
 
 from typing import NamedTuple, TYPE_CHECKING
 
-from parallelism.core.executors.process_executor import ProcessExecutor
-from parallelism.core.executors.thread_executor import ThreadExecutor
+from parallelism.core.gather_value import GatherValue
 from parallelism.core.return_value import ReturnValue
+from parallelism.core.stream_value import StreamValue
 
 if TYPE_CHECKING:
-    from typing import Any, Callable, Dict, Tuple, Type, Union
+    from typing import Any, Callable, Dict, Optional, Tuple, Type, Union
+
+    from parallelism.core.executors.interpreter_executor import (
+        InterpreterExecutor,
+    )
+    from parallelism.core.executors.process_executor import ProcessExecutor
+    from parallelism.core.executors.thread_executor import ThreadExecutor
 
 __all__ = ('ScheduledTask',)
 
 
 class ScheduledTask(NamedTuple):
     executor: Union[
-        ProcessExecutor,
-        ThreadExecutor,
         Type[ProcessExecutor],
         Type[ThreadExecutor],
+        Type[InterpreterExecutor],
     ]
     name: str
     target: Callable[..., Any]
@@ -27,12 +32,15 @@ class ScheduledTask(NamedTuple):
     priority: Union[int, float]
     processes: int
     threads: int
+    cpus: int
     system_processor: Union[int, float]
     system_memory: Union[int, float]
     graphics_processor: Union[int, float]
     graphics_memory: Union[int, float]
+    resources: Dict[str, Union[int, float]]
     continual: bool
-    initialized: bool
+    idempotent: bool
+    condition: Optional[ReturnValue]
 
     def __hash__(self) -> int:
         return hash(self.name)
@@ -51,21 +59,22 @@ class ScheduledTask(NamedTuple):
             'priority={!r}'.format(self.priority),
             'processes={!r}'.format(self.processes),
             'threads={!r}'.format(self.threads),
+            'cpus={!r}'.format(self.cpus),
             'system_processor={!r}'.format(self.system_processor),
             'system_memory={!r}'.format(self.system_memory),
             'graphics_processor={!r}'.format(self.graphics_processor),
             'graphics_memory={!r}'.format(self.graphics_memory),
+            'resources={!r}'.format(self.resources),
             'continual={!r}'.format(self.continual),
+            'idempotent={!r}'.format(self.idempotent),
+            'condition={!r}'.format(self.reformat_condition),
         )
         parameters = ', '.join(parameters)
         return f'{self.__class__.__name__}({parameters})'
 
     @property
     def reformat_executor(self) -> str:
-        executor = self.executor
-        if isinstance(self.executor, (ProcessExecutor, ThreadExecutor)):
-            executor = executor.__class__
-        return executor.__base__.__name__
+        return self.executor.__base__.__name__
 
     @property
     def reformat_target(self) -> str:
@@ -74,6 +83,12 @@ class ScheduledTask(NamedTuple):
         qualified_name = getattr(target, '__qualname__', repr(target))
         return f'{module}.{qualified_name}'
 
+    @property
+    def reformat_condition(self) -> Optional[str]:
+        if self.condition is None:
+            return None
+        return getattr(self.condition, ':task').name
+
     @property
     def amount_of_args(self) -> int:
         return len(self.args)
@@ -100,6 +115,63 @@ class ScheduledTask(NamedTuple):
                     tasks[task] = None
         return tuple(tasks.keys())
 
+    @property
+    def depends_on_condition(self) -> Tuple[ScheduledTask, ...]:
+        if self.condition is None:
+            return ()
+        return (getattr(self.condition, ':task'),)
+
+    @property
+    def depends_on_gathers(self) -> Tuple[ScheduledTask, ...]:
+        tasks = {}
+        for parameter in list(self.args) + list(self.kwargs.values()):
+            if (
+                not isinstance(parameter, ReturnValue) and
+                isinstance(parameter, GatherValue)
+            ):
+                for task in parameter.tasks:
+                    tasks.setdefault(task, None)
+        return tuple(tasks.keys())
+
+    @property
+    def depends_on_gathered_streams(self) -> Tuple[ScheduledTask, ...]:
+        # Tasks gathered without a reduction are streamed to this task,
+        # unless it also waits for their completion otherwise.
+        tasks = {}
+        waited = set(
+            self.depends_on_dependencies +
+            self.depends_on_parameters +
+            self.depends_on_condition
+        )
+        for parameter in list(self.args) + list(self.kwargs.values()):
+            if (
+                not isinstance(parameter, ReturnValue) and
+                isinstance(parameter, GatherValue)
+            ):
+                if parameter.reduce is not None:
+                    waited.update(parameter.tasks)
+                    continue
+                for task in parameter.tasks:
+                    tasks.setdefault(task, None)
+        return tuple(task for task in tasks if task not in waited)
+
+    @property
+    def depends_on_streams(self) -> Tuple[ScheduledTask, ...]:
+        tasks = {}
+        for parameter in list(self.args) + list(self.kwargs.values()):
+            # `isinstance` falls back to `__class__`, which a return value
+            # would record as another transformation.
+            if (
+                not isinstance(parameter, ReturnValue) and
+                isinstance(parameter, StreamValue)
+            ):
+                tasks.setdefault(parameter.task, None)
+        return tuple(tasks.keys())
+
     @property
     def return_value(self) -> ReturnValue:
         return ReturnValue(task=self)
+
+    @property
+    def stream(self) -> StreamValue:
+        return StreamValue(task=self)
@@ -4,9 +4,13 @@ from typing import NamedTuple, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from datetime import datetime
-    from typing import Any, Dict
+    from typing import Any, Dict, Tuple
 
+    from parallelism.core.concurrency_report import ConcurrencyReport
+    from parallelism.core.profile_report import ProfileReport
     from parallelism.core.raise_exception import RaiseException
+    from parallelism.core.task_attempt import TaskAttempt
+    from parallelism.core.trace_event import TraceEvent
 
 __all__ = ('SchedulerResult',)
 
@@ -16,3 +20,9 @@ class SchedulerResult(NamedTuple):
     elapsed_time: Dict[str, float]
     raise_exception: Dict[str, RaiseException]
     return_value: Dict[str, Any]
+    trace: Dict[str, Tuple[TraceEvent, ...]]
+    profile: Dict[str, ProfileReport]
+    concurrency: ConcurrencyReport
+    attempts: Dict[str, Tuple[TaskAttempt, ...]]
+    aliases: Dict[str, str]
+    skipped: Dict[str, str]
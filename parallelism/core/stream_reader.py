@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from queue import Empty
+from typing import TYPE_CHECKING
+
+from parallelism.config import STREAM_TIMEOUT
+from parallelism.core.exceptions.dependency_error import DependencyError
+from parallelism.core.task_cancellation import CURRENT_CANCELLATION
+
+if TYPE_CHECKING:
+    from multiprocessing.managers import DictProxy
+    from queue import Queue
+    from typing import Any, Iterator, Optional
+
+__all__ = ('StreamReader',)
+
+
+class StreamReader:
+    __slots__ = ('name', 'queue', 'proxy', 'exhausted')
+
+    def __init__(
+        self,
+        name: str,
+        queue: Queue,
+        proxy: Optional[DictProxy] = None,
+    ) -> None:
+        self.name = name
+        self.queue = queue
+        self.proxy = proxy
+        self.exhausted = False
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(task={self.name!r})'
+
+    def __iter__(self) -> Iterator[Any]:
+        while not self.exhausted:
+            try:
+                kind, item = self.queue.get(timeout=STREAM_TIMEOUT)
+            except Empty:
+                if not self.interrupted():
+                    continue
+                # The last message of a producer is written before it is
+                # seen as finished, so it is looked for once more.
+                try:
+                    kind, item = self.queue.get_nowait()
+                except Empty:
+                    kind, item = 'error', None
+            if kind == 'item':
+                yield item
+                continue
+            self.exhausted = True
+            if kind == 'error':
+                # Gathered streams name the task that did not complete.
+                name = self.name if item is None else item
+                raise DependencyError(
+                    message='{!r} stream has been interrupted'.format(name),
+                    tasks=(name,),
+                )
+
+    def interrupted(self) -> bool:
+        # Producers dying abruptly never write their last message, and the
+        # consumer may be canceled while waiting for the next one.
+        cancellation = CURRENT_CANCELLATION.get()
+        if cancellation is not None and cancellation.requested:
+            return True
+        return self.proxy is not None and bool(self.proxy.get('finish'))
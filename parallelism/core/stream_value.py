@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from parallelism.core.scheduled_task import ScheduledTask
+
+__all__ = ('StreamValue',)
+
+
+class StreamValue:
+    __slots__ = ('task',)
+
+    def __init__(self, task: ScheduledTask) -> None:
+        self.task = task
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(task={self.task!r})'
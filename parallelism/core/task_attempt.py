@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+from typing import NamedTuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from datetime import datetime
+    from typing import Optional
+
+__all__ = ('TaskAttempt',)
+
+
+class TaskAttempt(NamedTuple):
+    attempt: int
+    execution_time: datetime
+    elapsed_time: Optional[float]
+    winner: bool
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from contextvars import ContextVar
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from multiprocessing.managers import DictProxy
+    from typing import Optional
+
+__all__ = ('TaskCancellation', 'CURRENT_CANCELLATION')
+
+
+class TaskCancellation:
+    __slots__ = ('name', 'proxy')
+
+    def __init__(self, name: str, proxy: DictProxy) -> None:
+        self.name = name
+        self.proxy = proxy
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(task={self.name!r})'
+
+    @property
+    def requested(self) -> bool:
+        return bool(self.proxy.get('cancel'))
+
+
+CURRENT_CANCELLATION: ContextVar[Optional[TaskCancellation]] = ContextVar(
+    'CURRENT_CANCELLATION',
+    default=None,
+)
@@ -1,20 +1,66 @@
 from __future__ import annotations
 
-from multiprocessing import Manager, Process
+import os
+from multiprocessing import Manager, Process, Queue
 from threading import Thread
 from typing import TYPE_CHECKING
 
+from parallelism.config import LOGGING_FORMAT, LOGGING_LEVEL
+from parallelism.core.exceptions.dependency_error import DependencyError
+from parallelism.core.exceptions.worker_exit_error import WorkerExitError
+from parallelism.core.executors.interpreter_executor import (
+    InterpreterExecutor,
+)
+from parallelism.core.handlers.affinity_handler import AffinityHandler
+from parallelism.core.handlers.chain_handler import ChainHandler
+from parallelism.core.handlers.concurrency_handler import ConcurrencyHandler
+from parallelism.core.handlers.deduplication_handler import (
+    DeduplicationHandler,
+)
 from parallelism.core.handlers.dependency_handler import DependencyHandler
 from parallelism.core.handlers.function_handler import FunctionHandler
+from parallelism.core.handlers.fusion_handler import FusionHandler
+from parallelism.core.handlers.gather_handler import GatherHandler
+from parallelism.core.handlers.history_handler import HistoryHandler
+from parallelism.core.handlers.interpreter_handler import InterpreterHandler
+from parallelism.core.handlers.hook_handler import HookHandler
+from parallelism.core.handlers.journal_handler import JournalHandler
+from parallelism.core.handlers.metrics_handler import MetricsHandler
 from parallelism.core.handlers.parameters_handler import ParametersHandler
+from parallelism.core.handlers.projection_handler import ProjectionHandler
 from parallelism.core.handlers.resource_handler import ResourceHandler
 from parallelism.core.handlers.shared_memory_handler import SharedMemoryHandler
+from parallelism.core.handlers.speculation_handler import SpeculationHandler
+from parallelism.core.handlers.stream_handler import StreamHandler
+from parallelism.core.handlers.trace_handler import TraceHandler
 from parallelism.core.handlers.worker_handler import WorkerHandler
-from parallelism.core.scheduled_task import ScheduledTask
+from parallelism.core.raise_exception import RaiseException
 from parallelism.core.scheduler_result import SchedulerResult
+from parallelism.core.task_state import TaskState
+from parallelism.logger import (
+    get_logger,
+    initialize_logger,
+    start_listener,
+    stop_listener,
+)
 
 if TYPE_CHECKING:
-    from typing import Literal, Tuple, Union
+    from typing import (
+        Any,
+        Callable,
+        Dict,
+        Literal,
+        Optional,
+        Tuple,
+        Union,
+    )
+
+    from multiprocessing.managers import DictProxy, ListProxy
+
+    from parallelism.api_reference import Scheduler
+    from parallelism.core.runtime_history import RuntimeHistory
+    from parallelism.core.scheduled_task import ScheduledTask
+    from parallelism.core.hooks.task_hook import TaskHook
 
 __all__ = ('TaskScheduler',)
 
@@ -22,6 +68,7 @@ __all__ = ('TaskScheduler',)
 class TaskScheduler:
     __slots__ = (
         'tasks',
+        'states',
         'returns',
         'processes',
         'threads',
@@ -29,12 +76,48 @@ class TaskScheduler:
         'system_memory',
         'graphics_processor',
         'graphics_memory',
+        'resources',
+        'memory_limit',
+        'memory_requeue',
+        'admission',
+        'concurrency',
+        'pinning',
+        'history',
+        'speculation',
+        'fusion',
+        'deduplicate',
+        'resume',
+        'fail_fast',
+        'trace',
+        'hooks',
+        'metrics',
+        'session',
         'manager',
         'proxy',
+        'submissions',
+        'failures',
+        'requeues',
+        'aborted',
+        'queue',
+        'level',
         'worker_handler',
+        'concurrency_handler',
         'resource_handler',
+        'affinity_handler',
         'dependency_handler',
         'shared_memory_handler',
+        'stream_handler',
+        'gather_handler',
+        'projection_handler',
+        'trace_handler',
+        'hook_handler',
+        'metrics_handler',
+        'history_handler',
+        'journal_handler',
+        'speculation_handler',
+        'interpreter_handler',
+        'fusion_handler',
+        'deduplication_handler',
     )
 
     def __init__(
@@ -46,107 +129,711 @@ class TaskScheduler:
         system_memory: Union[int, float],
         graphics_processor: Union[int, float],
         graphics_memory: Union[int, float],
+        resources: Dict[str, Union[int, float]],
+        memory_limit: bool,
+        memory_requeue: Optional[Union[int, float]],
+        admission: Literal[
+            'first_fit',
+            'backfill',
+            'dominant_resource',
+            'best_fit',
+        ],
+        concurrency: Literal['fixed', 'adaptive'],
+        pinning: Literal['compact', 'spread'],
+        history: Optional[RuntimeHistory],
+        speculation: Optional[Union[int, float]],
+        fusion: bool,
+        deduplicate: bool,
+        resume: Optional[str],
+        fail_fast: Union[bool, Literal['subgraph']],
+        trace: Union[bool, str],
+        hooks: Tuple[TaskHook, ...],
+        metrics: Optional[Union[int, Callable[[str], Any]]],
+        session: Optional[Scheduler] = None,
     ) -> None:
         self.tasks = sorted(tasks, key=lambda task: task.priority)
+        self.states = {task.name: TaskState(task) for task in self.tasks}
         self.processes = processes
         self.threads = threads
         self.system_processor = system_processor
         self.system_memory = system_memory
         self.graphics_processor = graphics_processor
         self.graphics_memory = graphics_memory
+        self.resources = resources
+        self.memory_limit = memory_limit
+        self.memory_requeue = memory_requeue
+        self.admission = admission
+        self.concurrency = concurrency
+        self.pinning = pinning
+        self.history = history
+        self.speculation = speculation
+        self.fusion = fusion
+        self.deduplicate = deduplicate
+        self.resume = resume
+        self.fail_fast = fail_fast
+        self.trace = trace
+        self.hooks = hooks
+        self.metrics = metrics
+        self.session = session
         self.manager = None
         self.proxy = None
+        self.submissions = None
+        self.failures = None
+        self.requeues = None
+        self.aborted = {}
+        self.queue = None
+        self.level = None
         self.worker_handler = None
+        self.concurrency_handler = None
         self.resource_handler = None
+        self.affinity_handler = None
         self.dependency_handler = None
         self.shared_memory_handler = None
+        self.stream_handler = None
+        self.gather_handler = None
+        self.projection_handler = None
+        self.trace_handler = None
+        self.hook_handler = None
+        self.metrics_handler = None
+        self.history_handler = None
+        self.journal_handler = None
+        self.speculation_handler = None
+        self.interpreter_handler = None
+        self.fusion_handler = None
+        self.deduplication_handler = None
 
     @property
     def finished(self) -> bool:
-        return all(
-            task.initialized and
-            self.proxy.get(task.name).get('finish')
-            for task in self.tasks
-        )
+        return all(state.finished for state in self.states.values())
 
     def execute(self) -> SchedulerResult:
-        self.manager = Manager()
+        if self.session is not None:
+            self.queue = self.session.queue
+            self.manager = self.session.manager
+            try:
+                return self.run()
+            finally:
+                self.close()
+        initialize_logger(formatter=LOGGING_FORMAT, level=LOGGING_LEVEL)
+        self.queue = Queue()
+        listener, handlers = start_listener(self.queue)
+        # The logger handlers are swapped for the queue until the listener
+        # stops, so it is stopped whatever happens during the run.
+        try:
+            self.manager = Manager()
+            try:
+                return self.run()
+            finally:
+                self.close()
+                self.manager.shutdown()
+        finally:
+            stop_listener(listener, handlers)
+
+    def close(self) -> None:
+        if self.metrics_handler is not None:
+            self.metrics_handler.close()
+        if self.interpreter_handler is not None:
+            self.interpreter_handler.close()
+        if self.journal_handler is not None:
+            self.journal_handler.close()
+        if self.gather_handler is not None:
+            self.gather_handler.shutdown()
+
+    def run(self) -> SchedulerResult:
+        self.level = get_logger().getEffectiveLevel()
         self.proxy = self.manager.dict()
+        self.submissions = self.manager.list()
+        if self.fail_fast:
+            self.failures = self.manager.list()
+        if self.memory_requeue is not None:
+            self.requeues = self.manager.list()
+        self.deduplication_handler = DeduplicationHandler(
+            enabled=self.deduplicate,
+        )
+        if self.deduplication_handler.enabled:
+            self.tasks = list(
+                self.deduplication_handler.deduplicate(self.tasks),
+            )
+            self.states = {task.name: TaskState(task) for task in self.tasks}
+        copies = {}
         self.worker_handler = WorkerHandler(
-            tasks=self.tasks,
-            proxy=self.proxy,
+            states=self.states,
             processes=self.processes,
             threads=self.threads,
+            copies=copies,
+        )
+        self.concurrency_handler = ConcurrencyHandler(
+            worker_handler=self.worker_handler,
+            enabled=self.concurrency == 'adaptive',
         )
         self.resource_handler = ResourceHandler(
-            tasks=self.tasks,
-            proxy=self.proxy,
+            states=self.states,
             system_processor=self.system_processor,
             system_memory=self.system_memory,
             graphics_processor=self.graphics_processor,
             graphics_memory=self.graphics_memory,
+            pools=self.resources,
+            strategy=self.admission,
+            copies=copies,
+        )
+        self.affinity_handler = AffinityHandler(
+            states=self.states,
+            strategy=self.pinning,
         )
         self.dependency_handler = DependencyHandler(
+            tasks=self.tasks,
+            states=self.states,
+        )
+        self.gather_handler = GatherHandler(
+            tasks=self.tasks,
+            states=self.states,
+            manager=self.manager,
+        )
+        self.projection_handler = ProjectionHandler(
             tasks=self.tasks,
             proxy=self.proxy,
         )
         self.shared_memory_handler = SharedMemoryHandler(
+            states=self.states,
+            prerequisites=self.dependency_handler.prerequisites,
+            retained=self.gather_handler.retained,
+        )
+        self.stream_handler = StreamHandler(
+            tasks=self.tasks,
+            states=self.states,
+            manager=self.manager,
+        )
+        self.trace_handler = TraceHandler(
             tasks=self.tasks,
             proxy=self.proxy,
-            prerequisites=self.dependency_handler.prerequisites,
+            enabled=bool(self.trace),
         )
-        for index, task in enumerate(self.tasks):
-            if not self.worker_handler.enough_workers(task):
-                self.proxy[task.name] = self.manager.dict()
-                task = self.initialize(task, blocked='worker')
-                self.tasks[index] = task
-            if not self.resource_handler.enough_resources(task):
-                self.proxy[task.name] = self.manager.dict()
-                task = self.initialize(task, blocked='resource')
-                self.tasks[index] = task
-        while not self.finished:
-            for index, task in enumerate(self.tasks):
-                if task.initialized:
-                    self.shared_memory_handler.free(index, task)
+        self.trace_handler.submitted(self.tasks)
+        self.hook_handler = HookHandler(hooks=self.hooks, proxy=self.proxy)
+        self.metrics_handler = MetricsHandler(
+            tasks=self.tasks,
+            proxy=self.proxy,
+            metrics=self.metrics,
+            processes=self.processes,
+            threads=self.threads,
+            resources={
+                'system_processor': self.system_processor,
+                'system_memory': self.system_memory,
+                'graphics_processor': self.graphics_processor,
+                'graphics_memory': self.graphics_memory,
+            },
+            pools=self.resources,
+        )
+        self.metrics_handler.start()
+        self.history_handler = HistoryHandler(
+            tasks=self.tasks,
+            proxy=self.proxy,
+            history=self.history,
+        )
+        self.history_handler.order(self.tasks)
+        self.speculation_handler = SpeculationHandler(
+            states=self.states,
+            copies=copies,
+            percentile=self.speculation,
+            estimates=self.history_handler.estimates,
+            consumers=self.stream_handler.consumers,
+        )
+        self.journal_handler = JournalHandler(
+            path=self.resume,
+            proxy=self.proxy,
+        )
+        self.interpreter_handler = InterpreterHandler()
+        for state in self.states.values():
+            if not self.restore(state):
+                self.admit(state)
+        self.fusion_handler = FusionHandler(
+            tasks=self.tasks,
+            states=self.states,
+            enabled=self.fusion,
+        )
+        if self.journal_handler.restored:
+            pattern = '{!r} tasks have been restored from {!r}'
+            get_logger().info(msg=pattern.format(
+                len(self.journal_handler.restored),
+                self.resume,
+            ))
+        while not self.finished or self.extend():
+            self.extend()
+            self.requeue()
+            self.reap()
+            self.abort()
+            self.metrics_handler.update()
+            self.concurrency_handler.update()
+            self.gather_handler.update()
+            self.resource_handler.update()
+            self.speculate()
+            for task in self.resource_handler.order(self.tasks):
+                state = self.states[task.name]
+                if state.initialized:
+                    self.journal_handler.finished(state)
+                    self.gather_handler.collect(state)
+                    if self.shared_memory_handler.free(state):
+                        self.collected(task)
+                    continue
+                skipping = self.dependency_handler.skipping_task(task)
+                if skipping is not None:
+                    self.skip(task, reason=skipping)
+                    continue
+                if self.gather_handler.throttled(task):
+                    self.trace_handler.waiting(task, reason='gather')
                     continue
                 if not self.resource_handler.enough_resources(task):
+                    if (
+                        self.admission == 'backfill' and not
+                        self.dependency_handler.is_blocked(task, 'finish')
+                    ):
+                        self.resource_handler.reserve(task)
+                    self.trace_handler.waiting(task, reason='resource')
+                    continue
+                if not self.affinity_handler.enough_cores(task):
+                    self.trace_handler.waiting(task, reason='resource')
                     continue
-                if not self.worker_handler.available_worker(task):
+                if not (
+                    self.worker_handler.available_worker(task) or
+                    self.gather_handler.awaited(task)
+                ):
+                    self.trace_handler.waiting(task, reason='worker')
+                    self.concurrency_handler.waiting(task)
                     continue
                 if self.dependency_handler.is_blocked(task, status='finish'):
+                    self.trace_handler.waiting(task, reason='dependency')
                     continue
+                # The condition may have completed after it was checked
+                # above, so it is checked again before the task is started.
+                if task.condition is not None:
+                    skipping = self.dependency_handler.skipping_task(task)
+                    if skipping is not None:
+                        self.skip(task, reason=skipping)
+                        continue
                 if self.dependency_handler.is_blocked(task, status='complete'):
-                    self.proxy[task.name] = self.manager.dict()
-                    task = self.initialize(task, blocked='dependency')
-                    self.tasks[index] = task
+                    self.initialize(state, blocked='dependency')
+                    continue
+                if self.gather_handler.reducing(task):
+                    self.trace_handler.waiting(task, reason='dependency')
                     continue
-                self.proxy[task.name] = self.manager.dict()
-                task = self.initialize(task)
-                self.tasks[index] = task
-                task.executor.start()
+                failed = self.gather_handler.failed(task)
+                if failed is not None:
+                    self.initialize(state, blocked='failure', failed=failed)
+                    continue
+                self.initialize(state)
+                self.trace_handler.dispatched(task)
+                self.hook_handler.before_dispatch(task)
+                self.metrics_handler.dispatched(task)
+                state.executor.start()
+                self.metrics_handler.started(task)
+                self.resource_handler.dispatched(
+                    task,
+                    members=self.fusion_handler.members(task),
+                )
                 break
-        for index, task in enumerate(self.tasks):
-            self.shared_memory_handler.free(index, task)
-        self.manager.shutdown()
+        for state in self.states.values():
+            self.journal_handler.finished(state)
+            self.gather_handler.collect(state)
+            if self.shared_memory_handler.free(state):
+                self.collected(state.task)
+        self.shared_memory_handler.join()
+        self.metrics_handler.stop()
+        self.interpreter_handler.close()
+        self.history_handler.result()
+        self.journal_handler.close()
+        aliases = self.deduplication_handler.result(
+            self.shared_memory_handler.execution_time,
+            self.shared_memory_handler.elapsed_time,
+            self.shared_memory_handler.raise_exception,
+            self.shared_memory_handler.return_value,
+        )
         self.shared_memory_handler.sort()
+        trace = self.trace_handler.result(
+            order=self.shared_memory_handler.execution_time,
+        )
+        if isinstance(self.trace, str):
+            self.trace_handler.export(path=self.trace, trace=trace)
+        profile = self.hook_handler.result(
+            order=self.shared_memory_handler.execution_time,
+        )
         return SchedulerResult(
             self.shared_memory_handler.execution_time,
             self.shared_memory_handler.elapsed_time,
             self.shared_memory_handler.raise_exception,
             self.shared_memory_handler.return_value,
+            trace,
+            profile,
+            self.concurrency_handler.result(),
+            self.speculation_handler.result(),
+            aliases,
+            self.dependency_handler.skipped,
+        )
+
+    def admit(self, state: TaskState) -> None:
+        if not self.worker_handler.enough_workers(state.task):
+            self.initialize(state, blocked='worker')
+        if not (
+            self.resource_handler.within_limits(state.task) and
+            self.affinity_handler.within_limits(state.task)
+        ):
+            self.initialize(state, blocked='resource')
+
+    def extend(self) -> bool:
+        # Tasks submitted from running tasks are appended to the shared list
+        # before the submitting task finishes, so they are always drained
+        # before the task graph is considered finished.
+        if not len(self.submissions):
+            return False
+        while len(self.submissions):
+            name, tasks = self.submissions.pop(0)
+            tasks = tuple(map(self.deduplication_handler.rewrite, tasks))
+            if not self.acceptable(name, tasks):
+                continue
+            tasks = self.deduplication_handler.deduplicate(
+                tasks,
+                released={
+                    state.task.name
+                    for state in self.states.values()
+                    if state.released
+                },
+            )
+            self.dependency_handler.extend(tasks)
+            self.stream_handler.extend(tasks)
+            self.gather_handler.extend(tasks)
+            self.projection_handler.extend(tasks)
+            self.trace_handler.submitted(tasks)
+            self.metrics_handler.submitted(tasks)
+            self.history_handler.submitted(tasks)
+            key = self.history_handler.key
+            for task in tasks:
+                index = len(self.tasks)
+                while index and key(self.tasks[index - 1]) > key(task):
+                    index -= 1
+                self.tasks.insert(index, task)
+                state = TaskState(task)
+                self.states[task.name] = state
+                if self.restore(state):
+                    continue
+                if name in self.aborted:
+                    failed = self.aborted[name]
+                    self.aborted[task.name] = failed
+                    self.initialize(state, blocked='failure', failed=failed)
+                    continue
+                self.admit(state)
+        self.resource_handler.invalidate()
+        return True
+
+    def requeue(self) -> None:
+        if self.requeues is None or not len(self.requeues):
+            return
+        while len(self.requeues):
+            name = self.requeues.pop(0)
+            state = self.states[name]
+            task = state.task
+            state.executor.join()
+            system_memory = min(
+                task.system_memory * self.memory_requeue,
+                self.system_memory,
+            )
+            if (
+                system_memory <= task.system_memory or
+                task.depends_on_streams or
+                task.depends_on_gathered_streams or
+                task.name in self.stream_handler.consumers or
+                task.name in self.speculation_handler.copies or
+                task.name in self.aborted
+            ):
+                state.proxy['finish'] = True
+                if self.failures is not None and name not in self.aborted:
+                    self.failures.append(name)
+                continue
+            # The task waits for the larger reservation to be available, as
+            # if it had just been submitted.
+            requeued = task._replace(system_memory=system_memory)
+            self.tasks[self.tasks.index(task)] = requeued
+            self.states[name] = TaskState(requeued)
+            self.resource_handler.invalidate()
+            pattern = (
+                '{!r} has exceeded its memory limit, it is requeued with '
+                '{!r}% RAM'
+            )
+            get_logger().warning(msg=pattern.format(name, system_memory))
+
+    def limit(self, task: ScheduledTask) -> Optional[int]:
+        if not (
+            self.memory_limit and
+            task.system_memory and
+            issubclass(task.executor, Process)
+        ):
+            return None
+        try:
+            total = os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+        except (AttributeError, ValueError, OSError):
+            return None
+        return int(total * task.system_memory / 100)
+
+    def speculate(self) -> None:
+        self.speculation_handler.resolve()
+        for state, threshold, args, kwargs in (
+            self.speculation_handler.stragglers()
+        ):
+            task = state.task
+            if not (
+                self.worker_handler.available_worker(task) and
+                self.resource_handler.enough_resources(task)
+            ):
+                continue
+            copy = TaskState(task)
+            copy.proxy = self.manager.dict()
+            function_handler = FunctionHandler(
+                name=task.name,
+                target=task.target,
+                proxy=copy.proxy,
+                blocker=None,
+                trace=self.trace_handler.enabled,
+                hooks=self.hook_handler.call_hooks,
+                metrics=self.metrics_handler.enabled,
+                queue=self.queue,
+                level=self.level,
+                memory=self.history_handler.enabled,
+                memory_limit=self.limit(task),
+            )
+            copy.executor = task.executor(
+                proxy=copy.proxy,
+                target=function_handler,
+                name=task.name,
+                args=args,
+                kwargs=kwargs,
+            )
+            copy.initialized = True
+            copy.executor.start()
+            self.speculation_handler.launched(copy, threshold)
+            self.resource_handler.dispatched(task, speculative=True)
+
+    def reap(self) -> None:
+        # Processes killed by a signal or exiting abruptly never report that
+        # they finished, so their dependents and stream consumers would wait
+        # for them forever.
+        for state in self.states.values():
+            task = state.task
+            if (
+                state.released or not
+                state.initialized or not
+                issubclass(task.executor, Process) or
+                state.executor is None or
+                state.executor.exitcode in (None, 0) or
+                state.proxy.get('finish') or
+                task.name in (self.requeues or ())
+            ):
+                continue
+            exitcode = state.executor.exitcode
+            exception = WorkerExitError(
+                message='{!r} has exited unexpectedly'.format(task.name),
+                exitcode=exitcode,
+            )
+            state.proxy['raise_exception'] = RaiseException(exception)
+            state.proxy['finish'] = True
+            self.stream_handler.interrupt(task)
+            if self.failures is not None:
+                self.failures.append(task.name)
+            pattern = '{!r} has exited unexpectedly with exit code {!r}'
+            get_logger().error(msg=pattern.format(task.name, exitcode))
+
+    def abort(self) -> None:
+        if self.failures is None or not len(self.failures):
+            return
+        while len(self.failures):
+            name = self.failures.pop(0)
+            if name in self.aborted:
+                continue
+            if self.fail_fast == 'subgraph':
+                names = self.dependency_handler.connected_tasks(
+                    self.states[name].task,
+                )
+            else:
+                names = set(self.states)
+            self.aborted.update(dict.fromkeys(names, name))
+            for other in names:
+                if other != name:
+                    self.cancel(self.states[other], failed=name)
+
+    def skip(self, task: ScheduledTask, reason: str) -> None:
+        skipped = self.dependency_handler.skip(task, reason=reason)
+        for other in skipped:
+            self.resource_handler.release(other)
+            self.projection_handler.release(other)
+            self.stream_handler.close(other)
+            self.gather_handler.close(other)
+            self.trace_handler.skipped(other, reason=reason)
+            self.metrics_handler.skipped(other)
+        if reason in self.dependency_handler.skipped:
+            pattern = '{!r} is being skipped, due to task {!r}'
+        else:
+            pattern = (
+                '{!r} is being skipped, as its condition on {!r} is false'
+            )
+        message = pattern.format(task.name, reason)
+        if len(skipped) > 1:
+            message += ', along with {!r} dependent tasks'.format(
+                len(skipped) - 1,
+            )
+        get_logger().info(msg=message)
+
+    def cancel(self, state: TaskState, failed: str) -> None:
+        task = state.task
+        if state.finished:
+            return
+        if not state.initialized:
+            self.initialize(state, blocked='failure', failed=failed)
+        elif issubclass(task.executor, Process) and (
+            state.executor.is_alive() or
+            task.name in self.fusion_handler.heads
+        ):
+            state.executor.terminate()
+            state.executor.join()
+            if state.proxy.get('finish'):
+                return
+            exception = DependencyError(
+                message='{!r} has been terminated'.format(task.name),
+                tasks=(failed,),
+            )
+            state.proxy['raise_exception'] = RaiseException(exception)
+            state.proxy['finish'] = True
+            # Consumers running as threads can not be terminated, so they
+            # are woken up by the end of the stream.
+            self.stream_handler.interrupt(task)
+            pattern = '{!r} has been terminated, due to task {!r}'
+            get_logger().warning(msg=pattern.format(task.name, failed))
+        else:
+            # Threads cannot be stopped, so they are asked to return early
+            # through `task_canceled`.
+            state.proxy['cancel'] = True
+
+    def acceptable(self, name: str, tasks: Tuple[ScheduledTask, ...]) -> bool:
+        known = self.states
+        names = {task.name for task in tasks}
+        message = None
+        for task in tasks:
+            if (
+                task.name in known or
+                task.name in self.deduplication_handler.aliases
+            ):
+                pattern = '{!r} submitted task {!r}, which already exists'
+                message = pattern.format(name, task.name)
+                break
+            for dependency in DependencyHandler.depends_on(task):
+                if dependency.name in names:
+                    continue
+                if dependency.name not in known:
+                    pattern = (
+                        '{!r} submitted task {!r}, depending on unknown '
+                        'task {!r}'
+                    )
+                    message = pattern.format(name, task.name, dependency.name)
+                    break
+                if (
+                    dependency in task.depends_on_streams and
+                    known[dependency.name].initialized
+                ):
+                    pattern = (
+                        '{!r} submitted task {!r}, depending on the stream '
+                        'of {!r}, which has already started'
+                    )
+                    message = pattern.format(name, task.name, dependency.name)
+                    break
+                if (
+                    dependency in (
+                        task.depends_on_parameters +
+                        task.depends_on_gathers
+                    ) and
+                    known[dependency.name].released and not
+                    known[dependency.name].skipped
+                ):
+                    pattern = (
+                        '{!r} submitted task {!r}, depending on the return '
+                        'value of {!r}, which has already been released'
+                    )
+                    message = pattern.format(name, task.name, dependency.name)
+                    break
+            if message:
+                break
+        if not message and not DependencyHandler.directed_acyclic_graph(
+            tasks,
+            known=known,
+        ):
+            pattern = '{!r} submitted tasks whose dependencies contain cycles'
+            message = pattern.format(name)
+        if message:
+            get_logger().error(msg=f'{message}, the submission is ignored')
+            return False
+        return True
+
+    def restore(self, state: TaskState) -> bool:
+        values = self.journal_handler.restore(state.task)
+        if values is None:
+            return False
+        partial_proxy = self.manager.dict(values)
+        self.proxy[state.task.name] = partial_proxy
+        state.proxy = partial_proxy
+        state.initialized = True
+        self.projection_handler.release(state.task)
+        self.metrics_handler.restored(state.task)
+        return True
+
+    def collected(self, task: ScheduledTask) -> None:
+        failed = task.name in self.shared_memory_handler.raise_exception
+        self.stream_handler.close(task)
+        self.gather_handler.close(task)
+        self.trace_handler.collected(task)
+        if task.name in self.journal_handler.restored:
+            return
+        self.hook_handler.collected(task)
+        if task.name in self.fusion_handler.heads:
+            self.metrics_handler.fused(task, failed=failed)
+        else:
+            self.metrics_handler.collected(task, failed=failed)
+        elapsed_time = self.shared_memory_handler.elapsed_time.get(task.name)
+        self.journal_handler.collected(
+            task,
+            execution_time=self.shared_memory_handler.execution_time.get(
+                task.name,
+            ),
+            elapsed_time=elapsed_time,
+            failed=failed,
+        )
+        self.concurrency_handler.collected(task, elapsed_time=elapsed_time)
+        self.speculation_handler.collected(
+            task,
+            elapsed_time=elapsed_time,
+            failed=failed,
+        )
+        self.history_handler.collected(
+            task,
+            elapsed_time=elapsed_time,
+            failed=failed,
         )
 
     def initialize(
         self,
-        task: ScheduledTask,
-        blocked: Literal['dependency', 'resource', 'worker'] = None,
-    ) -> ScheduledTask:
+        state: TaskState,
+        blocked: Literal['dependency', 'resource', 'worker', 'failure'] = None,
+        failed: Optional[str] = None,
+    ) -> None:
+        task = state.task
+        self.resource_handler.release(task)
         full_proxy = self.proxy
-        partial_proxy = self.proxy.get(task.name)
+        partial_proxy = self.manager.dict()
+        full_proxy[task.name] = partial_proxy
         blocker = None
+        if blocked:
+            self.stream_handler.close(task)
+            self.trace_handler.canceled(task, reason=blocked)
+            self.metrics_handler.canceled(task)
         if blocked == 'dependency':
             tasks = self.dependency_handler.blocking_tasks(task)
             blocker = {'reason': blocked, 'tasks': tasks}
+        if blocked == 'failure':
+            blocker = {'reason': 'dependency', 'tasks': (failed,)}
         if blocked == 'resource':
             sp = abs(min(0, self.system_processor - task.system_processor))
             sm = abs(min(0, self.system_memory - task.system_memory))
@@ -158,14 +845,18 @@ class TaskScheduler:
                 'system_memory': sm,
                 'graphics_processor': gp,
                 'graphics_memory': gm,
+                'resources': {
+                    **self.resource_handler.lacking_pools(task),
+                    **self.affinity_handler.lacking_cores(task),
+                },
             }
         if blocked == 'worker':
             processes = 0
             threads = 0
-            if task.executor.__base__ == Process:
+            if issubclass(task.executor, Process):
                 processes = abs(min(0, self.processes - (task.processes + 1)))
                 threads = abs(min(0, self.threads))
-            if task.executor.__base__ == Thread:
+            if issubclass(task.executor, Thread):
                 processes = abs(min(0, self.processes - task.processes))
                 threads = abs(min(0, self.threads - (task.threads + 1)))
             blocker = {
@@ -173,39 +864,102 @@ class TaskScheduler:
                 'processes': processes,
                 'threads': threads,
             }
-        function_handler = FunctionHandler(
-            name=task.name,
-            target=task.target,
+        fused = not blocked and task.name in self.fusion_handler.chains
+        function_handler = self.function_handler(
+            task,
             proxy=partial_proxy,
             blocker=blocker,
+            affinity=None if blocked else self.affinity_handler.assign(task),
+            requeues=None if fused else self.requeues,
         )
+        target = function_handler
+        if fused:
+            target = self.fuse(function_handler)
         if blocked:
             args = task.args
             kwargs = task.kwargs
         else:
-            parameters_handler = ParametersHandler(proxy=full_proxy)
+            parameters_handler = ParametersHandler(
+                proxy=full_proxy,
+                streams=self.stream_handler.readers(task),
+                gathers=self.gather_handler.resolve(task),
+                projections=self.projection_handler,
+                shared=(
+                    issubclass(task.executor, Thread) and
+                    task.executor is not InterpreterExecutor
+                ),
+            )
             args = parameters_handler.args(*task.args)
             kwargs = parameters_handler.kwargs(**task.kwargs)
-        return ScheduledTask(
-            executor=task.executor(
+        state.executor = task.executor(
+            proxy=partial_proxy,
+            target=target,
+            name=task.name,
+            args=args,
+            kwargs=kwargs,
+        )
+        state.proxy = partial_proxy
+        state.initialized = True
+        self.projection_handler.release(task)
+        for member in self.fusion_handler.members(task) if fused else ():
+            self.states[member.name].executor = state.executor
+            self.projection_handler.release(member)
+        if not blocked:
+            self.speculation_handler.dispatched(state, args, kwargs)
+
+    def fuse(self, function_handler: FunctionHandler) -> ChainHandler:
+        # Every member of the chain is initialized along with its head and
+        # started by its predecessor, in the worker of the head.
+        task = self.states[function_handler.name].task
+        cores = function_handler.affinity
+        members = []
+        previous = function_handler
+        for member in self.fusion_handler.members(task):
+            state = self.states[member.name]
+            partial_proxy = self.manager.dict()
+            self.proxy[member.name] = partial_proxy
+            self.resource_handler.release(member)
+            self.affinity_handler.share(member, cores)
+            handler = self.function_handler(
+                member,
                 proxy=partial_proxy,
-                target=function_handler,
-                name=task.name,
-                args=args,
-                kwargs=kwargs,
-            ),
+                affinity=cores,
+            )
+            previous.successor = partial_proxy
+            members.append((handler, member.args, member.kwargs))
+            state.proxy = partial_proxy
+            state.initialized = True
+            previous = handler
+        return ChainHandler(function_handler, tuple(members))
+
+    def function_handler(
+        self,
+        task: ScheduledTask,
+        proxy: DictProxy,
+        blocker: Optional[Dict[str, Any]] = None,
+        affinity: Optional[Tuple[int, ...]] = None,
+        requeues: Optional[ListProxy] = None,
+    ) -> FunctionHandler:
+        return FunctionHandler(
             name=task.name,
-            target=task.target,
-            args=task.args,
-            kwargs=task.kwargs,
-            dependencies=task.dependencies,
-            priority=task.priority,
-            processes=task.processes,
-            threads=task.threads,
-            system_processor=task.system_processor,
-            system_memory=task.system_memory,
-            graphics_processor=task.graphics_processor,
-            graphics_memory=task.graphics_memory,
-            continual=task.continual,
-            initialized=True,
+            target=self.interpreter_handler.target(task),
+            proxy=proxy,
+            blocker=blocker,
+            trace=self.trace_handler.enabled,
+            hooks=self.hook_handler.call_hooks,
+            metrics=self.metrics_handler.enabled,
+            queue=self.queue,
+            level=self.level,
+            submissions=self.submissions,
+            memory=bool(
+                self.history_handler.enabled and
+                issubclass(task.executor, Process)
+            ),
+            journal=None if blocker else self.journal_handler.filename(task),
+            streams=None if blocker else self.stream_handler.writers(task),
+            closed=self.stream_handler.closed,
+            failures=self.failures,
+            affinity=affinity,
+            memory_limit=self.limit(task),
+            requeues=requeues,
         )
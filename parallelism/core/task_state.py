@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from parallelism.core.scheduled_task import ScheduledTask
+
+__all__ = ('TaskState',)
+
+
+class TaskState:
+    __slots__ = (
+        'task',
+        'executor',
+        'proxy',
+        'initialized',
+        'released',
+        'skipped',
+    )
+
+    def __init__(self, task: ScheduledTask) -> None:
+        self.task = task
+        self.executor = None
+        self.proxy = None
+        self.initialized = False
+        self.released = False
+        self.skipped = False
+
+    def __repr__(self) -> str:
+        name = self.task.name
+        initialized = self.initialized
+        released = self.released
+        return (
+            f'{self.__class__.__name__}(task={name!r}, '
+            f'initialized={initialized!r}, released={released!r})'
+        )
+
+    @property
+    def active(self) -> bool:
+        return bool(
+            self.initialized and not
+            self.released and
+            self.proxy.get('start') and not
+            self.proxy.get('finish')
+        )
+
+    @property
+    def finished(self) -> bool:
+        return self.released or bool(
+            self.initialized and
+            self.proxy.get('finish')
+        )
+
+    def finished_with(self, status: str) -> bool:
+        return bool(
+            self.initialized and not
+            self.skipped and
+            self.proxy.get(status)
+        )
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from contextvars import ContextVar
+from typing import TYPE_CHECKING
+
+from parallelism.core.scheduled_task import ScheduledTask
+
+if TYPE_CHECKING:
+    from multiprocessing.managers import ListProxy
+    from typing import Optional
+
+__all__ = ('TaskSubmitter', 'CURRENT_SUBMITTER')
+
+
+class TaskSubmitter:
+    __slots__ = ('name', 'submissions', 'submitted')
+
+    def __init__(self, name: str, submissions: ListProxy) -> None:
+        self.name = name
+        self.submissions = submissions
+        self.submitted = False
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(task={self.name!r})'
+
+    def submit(self, *tasks: ScheduledTask) -> None:
+        """
+        Submits new tasks into the running task scheduler.
+        The tasks may depend on each other, on the submitting task and on any
+        task already known to the task scheduler. They are appended to the
+        task graph before the submitting task finishes, and are sent through
+        shared memory, so their targets and arguments should be picklable.
+
+        Parameters
+        ----------
+        *tasks : ScheduledTask
+            | Instances of ScheduledTask to be scheduled.
+        """
+        if not all(isinstance(task, ScheduledTask) for task in tasks):
+            pattern = 'The {!r} parameter should only contain {!r}'
+            raise TypeError(pattern.format('tasks', 'ScheduledTask'))
+        if not len({task.name for task in tasks}) == len(tasks):
+            pattern = 'Each {!r} in parameter {!r} should be unique'
+            raise TypeError(pattern.format('name', 'tasks'))
+        if tasks:
+            self.submissions.append((self.name, tasks))
+            self.submitted = True
+
+
+CURRENT_SUBMITTER: ContextVar[Optional[TaskSubmitter]] = ContextVar(
+    'CURRENT_SUBMITTER',
+    default=None,
+)
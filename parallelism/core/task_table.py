@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+from array import array
+from itertools import chain, repeat
+from operator import lt, sub
+from typing import TYPE_CHECKING
+
+from parallelism.core.executors.interpreter_executor import (
+    InterpreterExecutor,
+)
+from parallelism.core.executors.process_executor import ProcessExecutor
+from parallelism.core.executors.thread_executor import ThreadExecutor
+from parallelism.core.scheduled_task import ScheduledTask
+
+if TYPE_CHECKING:
+    from typing import (
+        Any,
+        Callable,
+        Dict,
+        Iterator,
+        List,
+        Optional,
+        Tuple,
+        Union,
+    )
+
+__all__ = ('TaskTable',)
+
+
+class TaskTable:
+    EXECUTORS = (ProcessExecutor, ThreadExecutor, InterpreterExecutor)
+
+    __slots__ = (
+        'names',
+        'executors',
+        'targets',
+        'args',
+        'kwargs',
+        'offsets',
+        'edges',
+        'order',
+        'priority',
+        'processes',
+        'threads',
+        'cpus',
+        'system_processor',
+        'system_memory',
+        'graphics_processor',
+        'graphics_memory',
+        'resources',
+        'continual',
+        'idempotent',
+        'materialized',
+    )
+
+    def __init__(
+        self,
+        names: Tuple[str, ...],
+        executors: array,
+        targets: List[Callable[..., Any]],
+        args: Optional[List[Tuple[Any, ...]]],
+        kwargs: Optional[List[Dict[str, Any]]],
+        offsets: array,
+        edges: array,
+        order: array,
+        priority: array,
+        processes: array,
+        threads: array,
+        cpus: array,
+        system_processor: array,
+        system_memory: array,
+        graphics_processor: array,
+        graphics_memory: array,
+        resources: Optional[List[Dict[str, Union[int, float]]]],
+        continual: array,
+        idempotent: array,
+    ) -> None:
+        self.names = names
+        self.executors = executors
+        self.targets = targets
+        self.args = args
+        self.kwargs = kwargs
+        self.offsets = offsets
+        self.edges = edges
+        self.order = order
+        self.priority = priority
+        self.processes = processes
+        self.threads = threads
+        self.cpus = cpus
+        self.system_processor = system_processor
+        self.system_memory = system_memory
+        self.graphics_processor = graphics_processor
+        self.graphics_memory = graphics_memory
+        self.resources = resources
+        self.continual = continual
+        self.idempotent = idempotent
+        self.materialized = None
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __iter__(self) -> Iterator[ScheduledTask]:
+        return iter(self.materialize())
+
+    def __getitem__(self, index: int) -> ScheduledTask:
+        return self.materialize()[index]
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(tasks={len(self)!r})'
+
+    def dependencies(self, index: int) -> array:
+        return self.edges[self.offsets[index]:self.offsets[index + 1]]
+
+    def materialize(self) -> Tuple[ScheduledTask, ...]:
+        if self.materialized is not None:
+            return self.materialized
+        tasks = [None] * len(self.names)
+        for index in self.order:
+            # Fields are passed by keyword, so that the table keeps matching
+            # `ScheduledTask` whatever the order of its fields.
+            tasks[index] = ScheduledTask(
+                executor=self.EXECUTORS[self.executors[index]],
+                name=self.names[index],
+                target=self.targets[index],
+                args=() if self.args is None else self.args[index],
+                kwargs={} if self.kwargs is None else self.kwargs[index],
+                dependencies=tuple(
+                    map(tasks.__getitem__, self.dependencies(index)),
+                ),
+                priority=self.priority[index],
+                processes=self.processes[index],
+                threads=self.threads[index],
+                cpus=self.cpus[index],
+                system_processor=self.system_processor[index],
+                system_memory=self.system_memory[index],
+                graphics_processor=self.graphics_processor[index],
+                graphics_memory=self.graphics_memory[index],
+                resources=(
+                    {} if self.resources is None else self.resources[index]
+                ),
+                continual=bool(self.continual[index]),
+                idempotent=bool(self.idempotent[index]),
+                condition=None,
+            )
+        self.materialized = tuple(tasks)
+        return self.materialized
+
+    @staticmethod
+    def topological_order(offsets: array, edges: array) -> Optional[array]:
+        size = len(offsets) - 1
+        if all(map(
+            lt,
+            edges,
+            chain.from_iterable(map(
+                repeat,
+                range(size),
+                map(sub, offsets[1:], offsets[:-1]),
+            )),
+        )):
+            return array('L', range(size))
+        dependents = [[] for _ in range(size)]
+        remaining = array('L', map(sub, offsets[1:], offsets[:-1]))
+        for index in range(size):
+            for position in range(offsets[index], offsets[index + 1]):
+                dependents[edges[position]].append(index)
+        order = array('L', (
+            index for index in range(size) if not remaining[index]
+        ))
+        position = 0
+        while position < len(order):
+            for dependent in dependents[order[position]]:
+                remaining[dependent] -= 1
+                if not remaining[dependent]:
+                    order.append(dependent)
+            position += 1
+        if len(order) != size:
+            return None
+        return order
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from typing import NamedTuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing import Literal, Optional
+
+__all__ = ('TraceEvent',)
+
+
+class TraceEvent(NamedTuple):
+    event: Literal[
+        'submitted',
+        'ready',
+        'waiting',
+        'dispatched',
+        'started',
+        'finished',
+        'canceled',
+        'skipped',
+        'collected',
+    ]
+    timestamp: float
+    process: int
+    thread: int
+    reason: Optional[str] = None
+
+    def __repr__(self) -> str:
+        if self.reason is None:
+            return f'{self.event}@{self.timestamp!r}'
+        return f'{self.event}({self.reason})@{self.timestamp!r}'
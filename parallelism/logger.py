@@ -1,8 +1,20 @@
 from __future__ import annotations
 
-from logging import getLogger, Formatter, StreamHandler
+from logging import getLogger, Formatter, NOTSET, StreamHandler
+from logging.handlers import QueueHandler, QueueListener
+from typing import TYPE_CHECKING
 
-__all__ = ('get_logger', 'initialize_logger')
+if TYPE_CHECKING:
+    from multiprocessing.queues import Queue
+    from typing import List, Tuple
+
+__all__ = (
+    'get_logger',
+    'initialize_logger',
+    'initialize_worker_logger',
+    'start_listener',
+    'stop_listener',
+)
 
 
 def get_logger():
@@ -10,9 +22,34 @@ def get_logger():
 
 
 def initialize_logger(formatter: str, level: int) -> None:
-    formatter = Formatter(fmt=formatter)
-    stream_handler = StreamHandler()
-    stream_handler.setFormatter(fmt=formatter)
     logger = get_logger()
+    if logger.level == NOTSET:
+        logger.setLevel(level=level)
+    if not logger.handlers:
+        formatter = Formatter(fmt=formatter)
+        stream_handler = StreamHandler()
+        stream_handler.setFormatter(fmt=formatter)
+        logger.addHandler(hdlr=stream_handler)
+
+
+def initialize_worker_logger(queue: Queue, level: int) -> None:
+    logger = get_logger()
+    for handler in logger.handlers:
+        if isinstance(handler, QueueHandler) and handler.queue is queue:
+            return
+    logger.handlers = [QueueHandler(queue)]
     logger.setLevel(level=level)
-    logger.addHandler(hdlr=stream_handler)
+
+
+def start_listener(queue: Queue) -> Tuple[QueueListener, List]:
+    logger = get_logger()
+    handlers = list(logger.handlers)
+    listener = QueueListener(queue, *handlers, respect_handler_level=True)
+    logger.handlers = [QueueHandler(queue)]
+    listener.start()
+    return listener, handlers
+
+
+def stop_listener(listener: QueueListener, handlers: List) -> None:
+    listener.stop()
+    get_logger().handlers = handlers